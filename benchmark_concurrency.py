@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+資料庫多行程壓力測試
+N 個寫入行程持續作答、M 個讀取行程持續計算統計，共用同一個資料庫檔，
+回報吞吐量、取得寫入鎖的等待時間百分位數與失敗次數
+"""
+
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 將 src 目錄加入 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from database import VocabularyDatabase
+from quiz_engine import QuizEngine
+
+
+def seed_database(db_path: str, words: int, wal: bool):
+    """建立含合成單字的測試資料庫"""
+    db = VocabularyDatabase(db_path, wal=wal)
+    db.initialize_schema()
+    with db.batch():
+        for i in range(words):
+            db.insert_vocabulary(f"word{i:05d}", "", "n", f"翻譯{i}", i % 6 + 1)
+    db.close()
+
+
+def writer(db_path: str, wal: bool, busy_timeout: float, words: int, deadline: float, results):
+    """寫入行程：隨機作答並記錄每次取得寫入鎖的等待時間"""
+    engine = QuizEngine(db_path, busy_timeout=busy_timeout, wal=wal)
+
+    waits, errors = [], 0
+    while time.time() < deadline:
+        try:
+            engine.submit_binary_answer(
+                vocabulary_id=random.randint(1, words),
+                know=random.random() < 0.7,
+                is_new_word=True,
+            )
+            waits.append(engine.db.last_lock_wait)
+        except sqlite3.OperationalError:
+            errors += 1
+    results.put(("writer", len(waits), errors, waits, engine.db.busy_retries))
+    engine.close()
+
+
+def reader(db_path: str, wal: bool, busy_timeout: float, deadline: float, results):
+    """讀取行程：反覆計算學習統計並記錄延遲"""
+    db = VocabularyDatabase(db_path, busy_timeout=busy_timeout, wal=wal)
+    db.connect()
+
+    latencies, errors = [], 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            db.get_learning_statistics()
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            errors += 1
+    results.put(("reader", len(latencies), errors, latencies, 0))
+    db.close()
+
+
+def percentile(values: list, p: float) -> float:
+    """計算百分位數（毫秒）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def main():
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="資料庫多行程壓力測試")
+    parser.add_argument("--writers", type=int, default=4, help="寫入行程數")
+    parser.add_argument("--readers", type=int, default=4, help="讀取行程數")
+    parser.add_argument("--duration", type=float, default=10.0, help="測試秒數")
+    parser.add_argument("--words", type=int, default=7000, help="合成單字數")
+    parser.add_argument("--busy-timeout", type=float, default=5.0, help="等待鎖的秒數")
+    parser.add_argument("--no-wal", action="store_true", help="改用 rollback journal 模式比較")
+    parser.add_argument("--db", help="資料庫路徑（預設建立暫存資料庫）")
+    args = parser.parse_args()
+
+    wal = not args.no_wal
+    db_path = args.db or str(Path(tempfile.mkdtemp(prefix="vocaboost-conc-")) / "bench.db")
+    if not args.db:
+        seed_database(db_path, args.words, wal)
+
+    results = multiprocessing.Queue()
+    deadline = time.time() + args.duration
+    processes = [
+        multiprocessing.Process(
+            target=writer, args=(db_path, wal, args.busy_timeout, args.words, deadline, results)
+        )
+        for _ in range(args.writers)
+    ] + [
+        multiprocessing.Process(
+            target=reader, args=(db_path, wal, args.busy_timeout, deadline, results)
+        )
+        for _ in range(args.readers)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    writes = [r for r in collected if r[0] == "writer"]
+    reads = [r for r in collected if r[0] == "reader"]
+    waits = [w for r in writes for w in r[3]]
+    latencies = [l for r in reads for l in r[3]]
+
+    print("=" * 60)
+    print(
+        f"模式：{'WAL' if wal else 'rollback journal'}，"
+        f"{args.writers} 寫入 / {args.readers} 讀取，{args.duration:.0f} 秒"
+    )
+    print("=" * 60)
+    print(
+        f"寫入：{sum(r[1] for r in writes) / args.duration:8.1f} 次/秒  "
+        f"失敗 {sum(r[2] for r in writes)}  重試 {sum(r[4] for r in writes)}"
+    )
+    print(
+        f"  鎖等待  p50 {percentile(waits, 50):7.2f} ms  p95 {percentile(waits, 95):7.2f} ms  "
+        f"p99 {percentile(waits, 99):7.2f} ms  max {percentile(waits, 100):7.2f} ms"
+    )
+    print(f"讀取：{sum(r[1] for r in reads) / args.duration:8.1f} 次/秒  失敗 {sum(r[2] for r in reads)}")
+    print(
+        f"  延遲    p50 {percentile(latencies, 50):7.2f} ms  p95 {percentile(latencies, 95):7.2f} ms  "
+        f"p99 {percentile(latencies, 99):7.2f} ms"
+    )
+
+    if wal:
+        db = VocabularyDatabase(db_path)
+        db.connect()
+        result = db.checkpoint("TRUNCATE")
+        db.close()
+        print(f"checkpoint：寫回 {result['checkpointed']}/{result['log_pages']} 頁，WAL 已清空")
+
+
+if __name__ == "__main__":
+    main()
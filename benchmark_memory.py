@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+查詢結果記憶體測試
+以 tracemalloc 比較兩種列表示方式在一次學習流程中的記憶體用量與配置區塊數：
+  dict   — 舊做法：sqlite3.Row 再轉 dict，歷史記錄複製 dict，錯題以 list 的 in 判斷
+  record — 目前做法：tuple 為底的 Record，歷史記錄直接保存，錯題以 ID 集合判斷
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 將 src 目錄加入 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from database import VocabularyDatabase, record_factory
+
+
+def seed_database(db_path: str, words: int):
+    """建立含合成單字的測試資料庫（約三成已學過且到期）"""
+    db = VocabularyDatabase(db_path)
+    db.initialize_schema()
+    with db.batch():
+        for i in range(words):
+            db.insert_vocabulary(f"word{i:05d}", f"wɝd{i}", "n", f"翻譯{i}；意思{i}", i % 6 + 1)
+        db.conn.execute("""
+            INSERT INTO learning_progress (vocabulary_id, review_count, next_review)
+            SELECT id, 1, 0 FROM vocabulary WHERE id % 3 = 0
+        """)
+    db.close()
+
+
+def run_session(db: VocabularyDatabase, style: str, answers: int, rng: random.Random):
+    """模擬一次學習流程：讀取各種單字列表，再逐題作答並維護歷史與錯題
+
+    Returns:
+        流程中保留的物件（讓 tracemalloc 量到仍存活的記憶體）
+    """
+    materialize = (lambda rows: [dict(row) for row in rows]) if style == "dict" else (lambda rows: rows)
+
+    lists = [materialize(db.get_words_by_level(level)) for level in range(1, 7)]
+    lists.append(materialize(db.get_words_for_review(None)))
+    words = materialize(db.get_new_words(None, answers))
+    lists.append(words)
+
+    history, wrong_words, wrong_ids = [], [], set()
+    for _ in range(3):  # 含錯題重測共作答三輪
+        for word in words:
+            if style == "dict":
+                history.append({"index": len(history), "word": word.copy()})
+            else:
+                history.append({"index": len(history), "word": word})
+            if rng.random() < 0.3:
+                if style == "dict":
+                    if word not in wrong_words:
+                        wrong_words.append(word)
+                elif word["id"] not in wrong_ids:
+                    wrong_ids.add(word["id"])
+                    wrong_words.append(word)
+    return lists, history, wrong_words
+
+
+def measure(db_path: str, style: str, answers: int, sessions: int) -> dict:
+    """執行多次流程，回傳平均記憶體、峰值、存活區塊數與耗時"""
+    db = VocabularyDatabase(db_path)
+    db.connect()
+    db.conn.row_factory = sqlite3.Row if style == "dict" else record_factory
+    db.cursor = db.conn.cursor()
+    rng = random.Random(0)
+
+    current, peak, blocks, elapsed = [], [], [], []
+    for _ in range(sessions):
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept = run_session(db, style, answers, rng)
+        elapsed.append(time.perf_counter() - start)
+        snapshot = tracemalloc.take_snapshot()
+        size, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        current.append(size)
+        peak.append(top)
+        blocks.append(sum(stat.count for stat in snapshot.statistics("filename")))
+        del kept
+    db.close()
+
+    return {
+        "current": sum(current) / sessions,
+        "peak": sum(peak) / sessions,
+        "blocks": sum(blocks) / sessions,
+        "elapsed": sum(elapsed) / sessions,
+    }
+
+
+def main():
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="查詢結果記憶體測試（tracemalloc）")
+    parser.add_argument("--words", type=int, default=7000, help="合成單字數")
+    parser.add_argument("--answers", type=int, default=50, help="每輪作答題數")
+    parser.add_argument("--sessions", type=int, default=5, help="重複次數（取平均）")
+    parser.add_argument("--db", help="資料庫路徑（只讀取，預設建立暫存資料庫）")
+    args = parser.parse_args()
+
+    db_path = args.db or str(Path(tempfile.mkdtemp(prefix="vocaboost-mem-")) / "bench.db")
+    if not args.db:
+        seed_database(db_path, args.words)
+
+    results = {style: measure(db_path, style, args.answers, args.sessions) for style in ("dict", "record")}
+
+    print("=" * 72)
+    print(f"{'列表示':<10}{'存活記憶體':>14}{'峰值':>14}{'存活區塊數':>14}{'耗時':>14}")
+    print("=" * 72)
+    for style, r in results.items():
+        print(
+            f"{style:<10}{r['current'] / 1024:>11.1f} KB{r['peak'] / 1024:>11.1f} KB"
+            f"{r['blocks']:>14.0f}{r['elapsed'] * 1000:>11.1f} ms"
+        )
+    before, after = results["dict"], results["record"]
+    print("-" * 72)
+    print(
+        f"record / dict：記憶體 {after['current'] / before['current']:.0%}，"
+        f"峰值 {after['peak'] / before['peak']:.0%}，區塊數 {after['blocks'] / before['blocks']:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+學習伺服器壓力測試
+以多個 keep-alive 客戶端同時發送出題、作答、統計請求，
+回報每秒請求數與延遲百分位數
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 將 src 目錄加入 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from database import VocabularyDatabase
+from study_server import StudyServer
+
+
+class HTTPClient:
+    """最小的 keep-alive JSON HTTP 客戶端"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data)
+
+    async def close(self):
+        self.writer.close()
+
+
+def seed_database(db_path: str, words: int):
+    """建立含合成單字的測試資料庫"""
+    db = VocabularyDatabase(db_path)
+    db.initialize_schema()
+    with db.batch():
+        for i in range(words):
+            db.insert_vocabulary(f"word{i:05d}", "", "n", f"翻譯{i}", i % 6 + 1)
+    db.close()
+
+
+async def client_loop(client: HTTPClient, deadline: float, latencies: dict, word_ids: list):
+    """單一客戶端：反覆取卡、作答、偶爾查詢統計"""
+    while time.perf_counter() < deadline:
+        roll = random.random()
+        if roll < 0.45:
+            name, method, path, payload = "cards", "GET", "/api/study/cards?mode=new&limit=20", None
+        elif roll < 0.9:
+            name, method, path = "answer", "POST", "/api/study/answer"
+            payload = {
+                "vocabulary_id": random.choice(word_ids),
+                "know": random.random() < 0.7,
+                "is_new_word": True,
+            }
+        else:
+            name, method, path, payload = "stats", "GET", "/api/study/stats", None
+
+        start = time.perf_counter()
+        status, _ = await client.request(method, path, payload)
+        latencies.setdefault(name, []).append(time.perf_counter() - start)
+        if status != 200:
+            latencies.setdefault("errors", []).append(status)
+
+
+def percentile(values: list, p: float) -> float:
+    """計算百分位數（毫秒）"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+async def run_benchmark(args):
+    """執行壓力測試並輸出報告"""
+    server = None
+    host, port = args.host, args.port
+    if args.url is None:
+        tmpdir = tempfile.mkdtemp(prefix="vocaboost-bench-")
+        db_path = str(Path(tmpdir) / "bench.db")
+        seed_database(db_path, args.words)
+        server = StudyServer(db_path, pool_size=args.pool_size)
+        await server.start("127.0.0.1", 0)
+        host, port = "127.0.0.1", server.http.port
+        print(f"✓ 本機伺服器已啟動（{args.words} 個合成單字，連線池 {args.pool_size}）")
+    else:
+        host, _, port = args.url.replace("http://", "").partition(":")
+        port = int(port or 80)
+
+    clients = [HTTPClient(host, port) for _ in range(args.concurrency)]
+    for client in clients:
+        await client.connect()
+
+    latencies = {}
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(client_loop(c, deadline, latencies, list(range(1, args.words + 1))) for c in clients)
+    )
+    elapsed = time.perf_counter() - started
+
+    for client in clients:
+        await client.close()
+
+    errors = latencies.pop("errors", [])
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n並行客戶端：{args.concurrency}，測試時間：{elapsed:.1f} 秒")
+    print(f"總請求數：{total}（錯誤 {len(errors)}）")
+    print(f"吞吐量：{total / elapsed:,.0f} req/s")
+    print(f"\n{'端點':<8}{'次數':>8}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for name, values in sorted(latencies.items()):
+        print(f"{name:<8}{len(values):>8}{percentile(values, 50):>10.2f}{percentile(values, 99):>10.2f}")
+    everything = [v for values in latencies.values() for v in values]
+    print(f"{'all':<8}{len(everything):>8}{percentile(everything, 50):>10.2f}{percentile(everything, 99):>10.2f}")
+
+    if server:
+        print(f"\n寫入合併：{server.writer.answers} 筆作答 / {server.writer.batches} 次 commit")
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="學習伺服器壓力測試")
+    parser.add_argument("--url", help="測試既有伺服器（例如 http://127.0.0.1:8787），省略則啟動本機伺服器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--concurrency", type=int, default=32, help="並行客戶端數")
+    parser.add_argument("--duration", type=float, default=10.0, help="測試秒數")
+    parser.add_argument("--words", type=int, default=2000, help="合成單字數（僅本機伺服器）")
+    parser.add_argument("--pool-size", type=int, default=4, help="讀取連線數（僅本機伺服器）")
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
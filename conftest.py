@@ -0,0 +1,45 @@
+"""
+pytest 共用設定
+將 src 加入匯入路徑，並提供已匯入少量單字的暫存資料庫
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 將 src 目錄加入 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from database import VocabularyDatabase, open_database
+
+WORDS = [
+    ("apple", "ˈæpl", "n", "蘋果", 1),
+    ("book", "bʊk", "n", "書", 1),
+    ("cat", "kæt", "n", "貓", 1),
+    ("dog", "dɔg", "n", "狗", 1),
+    ("arm (1)", "ɑrm", "n", "手臂", 2),
+    ("arm (2)", "ɑrm", "v", "武裝", 2),
+    ("beautiful", "ˈbjutəfəl", "adj", "美麗的", 2),
+    ("courage", "ˈkɝɪdʒ", "n", "勇氣", 3),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    """已建立結構並匯入 WORDS 的暫存資料庫路徑"""
+    path = str(tmp_path / "vocabulary.db")
+    db = VocabularyDatabase(path)
+    db.initialize_schema()
+    for word in WORDS:
+        db.insert_vocabulary(*word)
+    db.close()
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    """db_path 的資料庫連線（單檔模式，不掛載單字庫）"""
+    database = open_database(db_path, catalogue_path=None)
+    yield database
+    database.close()
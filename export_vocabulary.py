@@ -4,15 +4,24 @@
 用於前端 React 應用
 """
 
-import sqlite3
+import sys
 import json
 from pathlib import Path
 
+sys.path.insert(0, 'src')
 
-def export_vocabulary_to_json():
-    """從 SQLite 資料庫導出所有單字到 JSON"""
+from database import DEFAULT_CATALOGUE_PATH, MissingVocabularyError, open_database
 
-    db_path = Path("data/vocabulary.db")
+
+def export_vocabulary_to_json(
+    db_path: str = "data/vocabulary.db", catalogue_path: str = DEFAULT_CATALOGUE_PATH
+):
+    """從 SQLite 資料庫導出所有單字到 JSON
+
+    經由 open_database 開啟，拆分過的資料庫會從唯讀單字庫讀取單字
+    """
+
+    db_path = Path(db_path)
     output_path = Path("vocaboost-web/frontend/src/data/vocabulary.json")
 
     if not db_path.exists():
@@ -20,9 +29,12 @@ def export_vocabulary_to_json():
         return
 
     # 連接資料庫
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    try:
+        db = open_database(str(db_path), catalogue_path=catalogue_path)
+    except MissingVocabularyError as e:
+        print(f"錯誤：{e}")
+        return
+    cursor = db.conn.cursor()
 
     # 查詢所有單字
     cursor.execute("""
@@ -43,7 +55,7 @@ def export_vocabulary_to_json():
             "level": row["level"]
         })
 
-    conn.close()
+    db.close()
 
     # 建立輸出目錄
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 7000 單字學習 TUI 應用程式
-主程式進入點
+主程式進入點（帶子命令時改執行命令列工具，不載入 TUI）
 """
 
 import sys
@@ -10,10 +10,15 @@ from pathlib import Path
 # 將 src 目錄加入 Python 路徑
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from tui.app import run
-
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import main
+        main()
+        sys.exit(0)
+
+    from tui.app import run
+
     try:
         run()
     except KeyboardInterrupt:
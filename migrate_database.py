@@ -109,6 +109,26 @@ def migrate_database(db_path: str = "data/vocabulary.db"):
         conn.close()
 
 
+def upgrade_schema(db_path: str = "data/vocabulary.db"):
+    """套用 VocabularyDatabase 的後續結構升級（PRAGMA user_version）"""
+    from database import SCHEMA_VERSION, open_database
+
+    from frequency_rank import DEFAULT_FREQUENCY_LIST, apply_frequency_ranks
+
+    db = open_database(db_path)  # 連線時自動套用尚未執行的升級
+    try:
+        # 依頻率表重新排名（包含之後新增、只有暫定排名的單字）；
+        # 已拆分的資料庫單字庫唯讀，排名在拆分前已完成
+        if DEFAULT_FREQUENCY_LIST.exists() and not db.catalogue_attached:
+            result = apply_frequency_ranks(db)
+            print(f"✓ 已更新 {result['total']} 個單字的頻率排名")
+    finally:
+        db.close()
+    print(f"✓ 資料庫結構版本：v{SCHEMA_VERSION}")
+
+
 if __name__ == "__main__":
     success = migrate_database()
+    if success:
+        upgrade_schema()
     sys.exit(0 if success else 1)
@@ -0,0 +1,143 @@
+"""
+答案比對
+每個正確答案預先編譯成比對器（正規化後的關鍵詞集合、英文拼字變體），
+並以 LRU 快取重複使用，逐字輸入時每次比對只需數微秒
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+from frequency_rank import headword
+
+# 中文翻譯的分隔符號（NFKC 後全形標點會變成半形，這裡列出剩下的中文標點）
+_SEPARATORS = re.compile(r"[,;/、，；。\s]+")
+# 括號與引號只影響顯示，比對時移除
+_BRACKETS = re.compile(r"[()\[\]{}<>「」『』〈〉《》【】\"'`]")
+_SPACES = re.compile(r"\s+")
+
+# 比對器快取數量（約為兩個級別的單字數）
+MATCHER_CACHE_SIZE = 4096
+
+
+def normalize(text: str) -> str:
+    """正規化答案：NFKC（全形轉半形）、轉小寫、合併空白"""
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def max_typos(word: str) -> int:
+    """英文拼字容許的錯字數：3 個字母以下不容錯，7 個以下 1 個，其餘 2 個"""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 7:
+        return 1
+    return 2
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> Optional[int]:
+    """計算編輯距離，超過 limit 時提早結束
+
+    只計算對角線 ±limit 的帶狀區域，任一列的最小值超過 limit 即停止。
+
+    Returns:
+        編輯距離；超過 limit 時回傳 None
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+
+    over = limit + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        lo = max(1, i - limit)
+        hi = min(len(b), i + limit)
+        row_min = current[0]
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return None
+        previous = current
+
+    distance = previous[len(b)]
+    return distance if distance <= limit else None
+
+
+class AnswerMatcher:
+    """單一正確答案的預編譯比對器
+
+    direction 為 "en2zh"（看英文答中文）時，答案包含任一關鍵詞即正確；
+    為 "zh2en"（看中文答英文）時，答案需與任一拼字變體的編輯距離在容許範圍內。
+    """
+
+    __slots__ = ("direction", "keywords", "variants", "limit")
+
+    def __init__(self, correct_answer: str, direction: str):
+        self.direction = direction
+        if direction == "zh2en":
+            # "arm (1)" → "arm"；"Miss/miss" → {"miss"}
+            self.variants: FrozenSet[str] = frozenset(
+                normalize(v) for v in headword(correct_answer).split("/") if v.strip()
+            )
+            self.keywords: FrozenSet[str] = frozenset()
+            self.limit = max(max_typos(v) for v in self.variants) if self.variants else 0
+        else:
+            cleaned = _BRACKETS.sub("", normalize(correct_answer))
+            keywords = {k for k in _SEPARATORS.split(cleaned) if k}
+            keywords.add(cleaned.strip())
+            keywords.discard("")
+            self.keywords = frozenset(keywords)
+            self.variants = frozenset()
+            self.limit = 0
+
+    def distance(self, user_answer: str) -> Optional[int]:
+        """答案與正確答案的差距
+
+        Returns:
+            0 表示完全正確，正數為拼字錯誤數（在容許範圍內），None 表示錯誤
+        """
+        answer = normalize(user_answer)
+        if not answer:
+            return None
+
+        if self.direction != "zh2en":
+            answer = _BRACKETS.sub("", answer)
+            return 0 if any(keyword in answer for keyword in self.keywords) else None
+
+        if answer in self.variants:
+            return 0
+        best = None
+        for variant in self.variants:
+            d = bounded_levenshtein(answer, variant, min(self.limit, max_typos(variant)))
+            if d is not None and (best is None or d < best):
+                best = d
+        return best
+
+    def check(self, user_answer: str) -> bool:
+        """答案是否正確（含容許的拼字錯誤）"""
+        return self.distance(user_answer) is not None
+
+
+def direction_of(question_type: str) -> str:
+    """由題型取得作答方向（"zh2en"、"mc_zh2en"、"typed_zh2en" 皆為 zh2en）"""
+    return "zh2en" if question_type.endswith("zh2en") else "en2zh"
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def get_matcher(correct_answer: str, direction: str) -> AnswerMatcher:
+    """取得（或編譯並快取）正確答案的比對器"""
+    return AnswerMatcher(correct_answer, direction)
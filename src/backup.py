@@ -0,0 +1,288 @@
+"""
+資料庫備份與還原
+使用 sqlite3 線上備份 API 分段複製，不會長時間阻擋正在使用的 TUI；
+備份經完整性檢查後以 gzip 壓縮保存，並依數量輪替
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_BACKUP_DIR = "data/backups"
+DEFAULT_KEEP = 7
+PAGES_PER_STEP = 256  # 每一步複製的頁數，步與步之間釋放讀取鎖
+STEP_SLEEP = 0.005  # 每步之間的休息秒數，讓其他連線有機會寫入
+CHUNK_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """備份或還原失敗"""
+
+
+def _integrity_check(path: Path):
+    """對資料庫檔執行 PRAGMA integrity_check
+
+    Raises:
+        BackupError: 檢查未通過
+    """
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != "ok":
+        raise BackupError(f"integrity check failed: {result}")
+
+
+def _manifest_path(archive: Path) -> Path:
+    return archive.with_name(archive.name + ".json")
+
+
+def _mb_per_second(size: int, seconds: float) -> float:
+    return size / (1024 * 1024) / max(seconds, 1e-9)
+
+
+def _check_keep(keep: int):
+    """保留份數至少要 1，否則輪替會刪掉剛建立的備份
+
+    Raises:
+        BackupError: keep 小於 1
+    """
+    if keep < 1:
+        raise BackupError(f"keep must be at least 1: {keep}")
+
+
+def positive_int(value: str) -> int:
+    """argparse 的 type：正整數"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def create_backup(
+    db_path: str = "data/vocabulary.db",
+    backup_dir: str = DEFAULT_BACKUP_DIR,
+    keep: int = DEFAULT_KEEP,
+    pages: int = PAGES_PER_STEP,
+) -> Dict:
+    """建立一份一致的壓縮備份
+
+    Args:
+        db_path: 來源資料庫
+        backup_dir: 備份目錄
+        keep: 保留的備份數量（較舊的會被刪除）
+        pages: 每一步複製的頁數
+
+    Returns:
+        備份資訊（路徑、大小、雜湊、耗時、MB/s）
+
+    Raises:
+        BackupError: 資料庫不存在、keep 小於 1 或完整性檢查未通過
+    """
+    _check_keep(keep)
+    source_path = Path(db_path)
+    if not source_path.exists():
+        raise BackupError(f"database not found: {source_path}")
+
+    directory = Path(backup_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    temp_path = directory / f".{source_path.stem}-{stamp}.db.tmp"
+    archive = directory / f"{source_path.stem}-{stamp}.db.gz"
+
+    # 1. 線上備份到暫存檔
+    started = time.perf_counter()
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target, pages=pages, sleep=STEP_SLEEP)
+    finally:
+        target.close()
+        source.close()
+    copy_seconds = time.perf_counter() - started
+
+    try:
+        # 2. 完整性檢查
+        _integrity_check(temp_path)
+
+        # 3. 壓縮並計算雜湊
+        digest = hashlib.sha256()
+        raw_size = 0
+        with open(temp_path, "rb") as src, gzip.open(archive, "wb", compresslevel=6) as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                raw_size += len(chunk)
+                dst.write(chunk)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    total_seconds = time.perf_counter() - started
+    info = {
+        "archive": str(archive),
+        "source": str(source_path),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "sha256": digest.hexdigest(),
+        "size": raw_size,
+        "compressed_size": archive.stat().st_size,
+        "copy_seconds": round(copy_seconds, 4),
+        "total_seconds": round(total_seconds, 4),
+        "copy_mb_per_second": round(_mb_per_second(raw_size, copy_seconds), 2),
+        "mb_per_second": round(_mb_per_second(raw_size, total_seconds), 2),
+    }
+    _manifest_path(archive).write_text(json.dumps(info, indent=2), encoding="utf-8")
+
+    # 4. 輪替
+    info["removed"] = [str(p) for p in rotate_backups(backup_dir, source_path.stem, keep)]
+    return info
+
+
+def list_backups(backup_dir: str = DEFAULT_BACKUP_DIR, stem: str = "vocabulary") -> List[Path]:
+    """列出備份檔（新到舊）"""
+    directory = Path(backup_dir)
+    if not directory.exists():
+        return []
+    return sorted(directory.glob(f"{stem}-*.db.gz"), reverse=True)
+
+
+def rotate_backups(backup_dir: str, stem: str, keep: int) -> List[Path]:
+    """只保留最新的 keep 份備份
+
+    Returns:
+        被刪除的備份檔
+
+    Raises:
+        BackupError: keep 小於 1
+    """
+    _check_keep(keep)
+    removed = list_backups(backup_dir, stem)[keep:]
+    for archive in removed:
+        archive.unlink(missing_ok=True)
+        _manifest_path(archive).unlink(missing_ok=True)
+    return removed
+
+
+def verify_backup(archive: str) -> Dict:
+    """以 manifest 中的 SHA-256 驗證備份檔
+
+    Raises:
+        BackupError: 缺少 manifest、檔案損毀或雜湊不符
+    """
+    archive_path = Path(archive)
+    manifest_path = _manifest_path(archive_path)
+    if not manifest_path.exists():
+        raise BackupError(f"manifest not found: {manifest_path}")
+    info = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    digest = hashlib.sha256()
+    try:
+        with gzip.open(archive_path, "rb") as src:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except (OSError, EOFError) as e:
+        raise BackupError(f"corrupted archive: {e}")
+
+    if digest.hexdigest() != info["sha256"]:
+        raise BackupError("checksum mismatch")
+    return info
+
+
+def restore_backup(archive: str, db_path: str = "data/vocabulary.db") -> Dict:
+    """從備份還原資料庫
+
+    先解壓到暫存檔並驗證雜湊與完整性，再以備份 API 一次寫回目標資料庫，
+    目標檔在還原過程中保持一致，其他連線只會看到還原前或還原後的內容。
+
+    Returns:
+        還原資訊（大小、耗時、MB/s）
+    """
+    info = verify_backup(archive)
+    target_path = Path(db_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target_path.with_name(f".{target_path.name}.restore.tmp")
+
+    started = time.perf_counter()
+    try:
+        with gzip.open(archive, "rb") as src, open(temp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        _integrity_check(temp_path)
+
+        source = sqlite3.connect(temp_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)  # pages=-1：單一步驟完成
+        finally:
+            target.close()
+            source.close()
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    seconds = time.perf_counter() - started
+    return {
+        "archive": str(archive),
+        "target": str(target_path),
+        "size": info["size"],
+        "seconds": round(seconds, 4),
+        "mb_per_second": round(_mb_per_second(info["size"], seconds), 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="資料庫備份與還原")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--dir", default=DEFAULT_BACKUP_DIR, help="備份目錄")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create_cmd = sub.add_parser("create", help="建立備份")
+    create_cmd.add_argument("--keep", type=positive_int, default=DEFAULT_KEEP, help="保留份數")
+    sub.add_parser("list", help="列出備份")
+    verify_cmd = sub.add_parser("verify", help="驗證備份")
+    verify_cmd.add_argument("archive", nargs="?", help="備份檔（預設最新一份）")
+    restore_cmd = sub.add_parser("restore", help="還原備份")
+    restore_cmd.add_argument("archive", nargs="?", help="備份檔（預設最新一份）")
+
+    args = parser.parse_args(argv)
+    stem = Path(args.db).stem
+
+    try:
+        if args.command == "create":
+            info = create_backup(args.db, args.dir, keep=args.keep)
+            print(f"✓ 備份完成：{info['archive']}")
+            print(
+                f"  {info['size'] / 1024 / 1024:.2f} MB → {info['compressed_size'] / 1024 / 1024:.2f} MB，"
+                f"複製 {info['copy_mb_per_second']} MB/s，整體 {info['mb_per_second']} MB/s"
+            )
+            for path in info["removed"]:
+                print(f"  輪替刪除：{path}")
+        elif args.command == "list":
+            for archive in list_backups(args.dir, stem):
+                print(f"  {archive.name}  {archive.stat().st_size / 1024:.1f} KB")
+        else:
+            archive = args.archive
+            if archive is None:
+                backups = list_backups(args.dir, stem)
+                if not backups:
+                    raise BackupError("no backups found")
+                archive = str(backups[0])
+            if args.command == "verify":
+                verify_backup(archive)
+                print(f"✓ 備份完整：{archive}")
+            else:
+                info = restore_backup(archive, args.db)
+                print(f"✓ 已還原 {archive} → {info['target']}（{info['mb_per_second']} MB/s）")
+    except BackupError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
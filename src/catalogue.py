@@ -0,0 +1,178 @@
+"""
+唯讀單字庫
+將靜態的 vocabulary 表拆成獨立的唯讀資料庫檔，
+使用者資料庫只保留學習進度；開啟時以 immutable=1 掛載單字庫
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from database import DEFAULT_CATALOGUE_PATH, SCHEMA_VERSION, VocabularyDatabase
+
+
+class CatalogueError(Exception):
+    """單字庫建置或拆分失敗"""
+
+
+def build_catalogue(source_path: str, catalogue_path: str = DEFAULT_CATALOGUE_PATH) -> Dict:
+    """從單檔資料庫建置唯讀單字庫
+
+    先寫到暫存檔再改名取代，已開啟舊單字庫的連線不受影響。
+
+    Args:
+        source_path: 含 vocabulary 表的資料庫（會先升級到最新結構）
+        catalogue_path: 輸出的單字庫路徑
+
+    Returns:
+        {"words": 單字數, "size": 檔案大小}
+    """
+    source = VocabularyDatabase(source_path)
+    source.connect()
+    try:
+        if not source._has_local_vocabulary():
+            raise CatalogueError(f"{source_path} has no vocabulary table")
+        schema = source.conn.execute("""
+            SELECT sql FROM sqlite_master
+            WHERE tbl_name = 'vocabulary' AND type IN ('table', 'index') AND sql IS NOT NULL
+            ORDER BY type = 'index'
+        """).fetchall()
+    finally:
+        source.close()
+
+    target = Path(catalogue_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".{target.name}.tmp")
+    temp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        for (sql,) in schema:
+            conn.execute(sql)
+        conn.execute(
+            "ATTACH DATABASE ? AS source",
+            (f"{Path(source_path).resolve().as_uri()}?mode=ro",),
+        )
+        conn.execute("INSERT INTO vocabulary SELECT * FROM source.vocabulary ORDER BY id")
+        conn.commit()
+        conn.execute("DETACH DATABASE source")
+        words = conn.execute("SELECT COUNT(*) FROM vocabulary").fetchone()[0]
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(temp_path, target)
+    return {"words": words, "size": target.stat().st_size}
+
+
+def split_database(
+    db_path: str, catalogue_path: str = DEFAULT_CATALOGUE_PATH, force: bool = False
+) -> Dict:
+    """將單檔資料庫拆成唯讀單字庫與只含學習進度的使用者資料庫
+
+    拆分後單字唯讀（insert_vocabulary、frequency_rank.py 都無法再修改），
+    仍有單字沒有頻率排名時拒絕拆分，除非 force。
+
+    Args:
+        db_path: 單檔資料庫（拆分後改為使用者資料庫）
+        catalogue_path: 輸出的單字庫路徑
+        force: 即使仍有未排名的單字也拆分
+
+    Returns:
+        {"words", "catalogue_size", "before_size", "after_size"}
+
+    Raises:
+        CatalogueError: 資料庫沒有 vocabulary 表、仍有未排名的單字或拆分後驗證失敗
+    """
+    before_size = Path(db_path).stat().st_size
+    if not force:
+        unranked = _count_unranked(db_path)
+        if unranked:
+            raise CatalogueError(
+                f"{unranked} words have no frequency_rank; run frequency_rank.py first "
+                "(the catalogue is read-only after splitting) or pass --force"
+            )
+    built = build_catalogue(db_path, catalogue_path)
+
+    db = VocabularyDatabase(db_path)
+    db.connect()
+    try:
+        with db.batch():
+            # 參照 vocabulary 的觸發器改由掛載後的 TEMP 觸發器提供；
+            # vocabulary 上的觸發器與索引隨表一起刪除
+            db.conn.execute("DROP TRIGGER IF EXISTS trg_unlearned_progress_delete")
+            db.conn.execute("DROP TABLE vocabulary")
+            db.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'vocabulary'")
+        db.checkpoint("TRUNCATE")
+        db.conn.execute("VACUUM")
+    finally:
+        db.close()
+
+    # 驗證掛載後單字數一致
+    db = VocabularyDatabase(db_path, catalogue_path=catalogue_path)
+    db.connect()
+    try:
+        if not db.catalogue_attached:
+            raise CatalogueError("catalogue was not attached after split")
+        words = db.conn.execute("SELECT COUNT(*) FROM vocabulary").fetchone()[0]
+    finally:
+        db.close()
+    if words != built["words"]:
+        raise CatalogueError(f"word count mismatch: {words} != {built['words']}")
+
+    return {
+        "words": words,
+        "catalogue_size": built["size"],
+        "before_size": before_size,
+        "after_size": Path(db_path).stat().st_size,
+    }
+
+
+def _count_unranked(db_path: str) -> int:
+    """單檔資料庫中沒有頻率排名的單字數"""
+    db = VocabularyDatabase(db_path)
+    db.connect()
+    try:
+        if not db._has_local_vocabulary():
+            raise CatalogueError(f"{db_path} has no vocabulary table")
+        return db.conn.execute(
+            "SELECT COUNT(*) FROM vocabulary WHERE frequency_rank IS NULL"
+        ).fetchone()[0]
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="唯讀單字庫建置與拆分")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--catalogue", default=DEFAULT_CATALOGUE_PATH, help="單字庫路徑")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="從單檔資料庫建置單字庫（資料庫保持不變）")
+    split_cmd = sub.add_parser("split", help="建置單字庫並將資料庫改為只含學習進度")
+    split_cmd.add_argument("--force", action="store_true", help="仍有未排名的單字時也拆分")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "build":
+            info = build_catalogue(args.db, args.catalogue)
+            print(f"✓ 單字庫建置完成：{args.catalogue}（{info['words']} 個單字，{info['size'] / 1024:.1f} KB）")
+        else:
+            info = split_database(args.db, args.catalogue, force=args.force)
+            print(f"✓ 拆分完成：{info['words']} 個單字移至 {args.catalogue}")
+            print(
+                f"  使用者資料庫 {info['before_size'] / 1024:.1f} KB → {info['after_size'] / 1024:.1f} KB，"
+                f"單字庫 {info['catalogue_size'] / 1024:.1f} KB"
+            )
+            print("⚠️  單字庫為唯讀：之後無法再新增單字或重新計算頻率排名")
+    except CatalogueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
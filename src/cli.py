@@ -0,0 +1,292 @@
+"""
+命令列工具
+不啟動 TUI 的非互動子命令：查詢到期數、統計、匯出、備份與批次作答。
+只在需要時才載入其他模組（查詢類命令只用到 database），適合放在 shell 提示字元或狀態列
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import day_number
+from database import (
+    DEFAULT_CATALOGUE_PATH,
+    MissingVocabularyError,
+    VocabularyDatabase,
+    open_database,
+)
+
+DEFAULT_DB_PATH = "data/vocabulary.db"
+
+# 批次作答中代表「會」/「不會」的寫法
+KNOW_ANSWERS = {"1", "y", "yes", "know", "會"}
+DONT_KNOW_ANSWERS = {"0", "n", "no", "dont", "不會"}
+
+
+def _positive_int(value: str) -> int:
+    """argparse 的 type：正整數（與 backup.positive_int 相同，避免查詢類命令載入 backup）"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def _require_database(db_path: str):
+    """資料庫不存在時結束程式（不建立空資料庫）"""
+    if not Path(db_path).exists():
+        print(f"❌ 找不到資料庫：{db_path}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _open_database(args) -> VocabularyDatabase:
+    """開啟既有的資料庫（拆分過的資料庫會掛載 --catalogue 指定的單字庫）"""
+    _require_database(args.db)
+    return open_database(args.db, catalogue_path=args.catalogue)
+
+
+def _parse_answer(line: str):
+    """解析一行批次作答：單字或 ID、會/不會、作答毫秒數（可省略）
+
+    有 Tab 時以 Tab 分欄（單字含空白時使用），否則以空白分欄。
+
+    Returns:
+        (單字或 ID, 是否會, 毫秒數或 None)，無法解析時回傳 None
+    """
+    fields = line.split("\t") if "\t" in line else line.split()
+    if len(fields) not in (2, 3):
+        return None
+    answer = fields[1].strip().lower()
+    if answer not in KNOW_ANSWERS and answer not in DONT_KNOW_ANSWERS:
+        return None
+    try:
+        response_ms = int(fields[2]) if len(fields) == 3 else None
+    except ValueError:
+        return None
+    return fields[0].strip(), answer in KNOW_ANSWERS, response_ms
+
+
+def cmd_due(args):
+    """今天到期的單字數"""
+    db = _open_database(args)
+    try:
+        print(db.count_due_words())
+    finally:
+        db.close()
+
+
+def cmd_stats(args):
+    """學習統計"""
+    db = _open_database(args)
+    try:
+        stats = db.get_learning_statistics()
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+    today = stats["today"]
+    accuracy = round(today["correct_count"] * 100 / today["total_count"]) if today["total_count"] else 0
+    print(f"已學習：{stats['learned_words']} / {stats['total_words']}")
+    print(f"待複習：{stats['due_words']}")
+    print(f"今日：新學 {today['new_words']}，複習 {today['reviewed_words']}，正確率 {accuracy}%")
+    print(f"連續學習：{stats['streak_days']} 天")
+    print(f"收藏：{stats['favorite_words']}，難記單字：{stats['leech_words']}")
+
+
+def cmd_export(args):
+    """匯出學習進度（JSON 或二進位快照）"""
+    db = _open_database(args)
+    try:
+        if args.format == "snapshot":
+            from snapshot import export_progress
+
+            if args.path in (None, "-"):
+                print("❌ 快照格式需要指定輸出檔案", file=sys.stderr)
+                sys.exit(1)
+            with open(args.path, "wb") as f:
+                count = export_progress(db, f)
+            print(f"✓ 匯出 {count} 筆學習進度：{args.path}")
+            return
+
+        rows = db.conn.execute("""
+            SELECT v.word, v.level, lp.ease_factor, lp.interval_days, lp.next_review,
+                   lp.review_count, lp.correct_count, lp.lapse_count,
+                   lp.is_favorite, lp.is_suspended
+            FROM learning_progress lp
+            JOIN vocabulary v ON v.id = lp.vocabulary_id
+            ORDER BY v.level, v.word
+        """).fetchall()
+        progress = []
+        for row in rows:
+            item = dict(row)
+            item["next_review"] = day_number.to_iso(item["next_review"])
+            progress.append(item)
+    finally:
+        db.close()
+
+    text = json.dumps(progress, ensure_ascii=False, indent=2)
+    if args.path in (None, "-"):
+        print(text)
+    else:
+        Path(args.path).write_text(text + "\n", encoding="utf-8")
+        print(f"✓ 匯出 {len(progress)} 筆學習進度：{args.path}")
+
+
+def cmd_backup(args):
+    """建立壓縮備份"""
+    from backup import DEFAULT_BACKUP_DIR, DEFAULT_KEEP, BackupError, create_backup
+
+    try:
+        info = create_backup(
+            args.db,
+            args.dir or DEFAULT_BACKUP_DIR,
+            keep=DEFAULT_KEEP if args.keep is None else args.keep,
+        )
+    except BackupError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ 備份完成：{info['archive']}")
+
+
+def cmd_study(args):
+    """列出今日計畫的單字，或以 --batch 從標準輸入讀取作答"""
+    db = _open_database(args)
+    try:
+        if args.batch:
+            _study_batch(db)
+            return
+
+        today = day_number.today()
+        if not db.has_daily_plan(today):
+            # 建立計畫需要複習佇列與新單字選取，只有這時才載入 QuizEngine
+            from quiz_engine import QuizEngine
+
+            engine = QuizEngine(args.db, catalogue_path=args.catalogue)
+            try:
+                engine.get_daily_plan()
+            finally:
+                engine.close()
+        for word in db.get_daily_plan(today, args.limit):
+            print(f"{word['id']}\t{word['word']}\t{word['translation']}")
+    finally:
+        db.close()
+
+
+def _study_batch(db: VocabularyDatabase):
+    """從標準輸入讀取作答並寫入（與 QuizEngine.submit_binary_answer 相同的排程與統計）
+
+    只用到 database 與 srs_algorithm，不載入出題相關的模組。
+    """
+    from srs_algorithm import MAX_RESPONSE_MS, SM2Algorithm
+
+    sm2 = SM2Algorithm()
+    today = day_number.today()
+    answered = correct = skipped = 0
+    study_ms = 0  # 尚未累計到 study_time_seconds 的毫秒數
+    # 所有作答在同一個交易內寫入
+    with db.batch():
+        for number, line in enumerate(sys.stdin, 1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            parsed = _parse_answer(line.rstrip("\n"))
+            if parsed is None:
+                print(f"⚠️  第 {number} 行格式錯誤，略過：{line.strip()}", file=sys.stderr)
+                skipped += 1
+                continue
+            key, know, response_ms = parsed
+            if key.isdigit():
+                vocabulary_id = int(key) if db.has_word(int(key)) else None
+            else:
+                vocabulary_id = db.find_word_id(key)
+            if vocabulary_id is None:
+                print(f"⚠️  第 {number} 行找不到單字，略過：{key}", file=sys.stderr)
+                skipped += 1
+                continue
+
+            progress = db.get_progress(vocabulary_id)
+            if response_ms is not None:
+                response_ms = min(response_ms, MAX_RESPONSE_MS)
+            ease_factor, interval_days, next_review = sm2.calculate_binary(
+                know=know,
+                current_ease_factor=progress["ease_factor"] if progress else 2.5,
+                current_interval_days=progress["interval_days"] if progress else 0,
+                review_count=progress["review_count"] if progress else 0,
+                response_ms=response_ms,
+            )
+            db.update_progress(
+                vocabulary_id=vocabulary_id,
+                ease_factor=ease_factor,
+                interval_days=interval_days,
+                next_review=next_review,
+                is_correct=know,
+                response_ms=response_ms,
+            )
+            db.mark_plan_done(today, vocabulary_id)
+
+            study_seconds, study_ms = divmod(study_ms + (response_ms or 0), 1000)
+            if progress is None:
+                db.record_study_session(
+                    new_words=1, correct=1 if know else 0, total=1, study_seconds=study_seconds
+                )
+            else:
+                db.record_study_session(
+                    reviewed_words=1, correct=1 if know else 0, total=1, study_seconds=study_seconds
+                )
+            answered += 1
+            correct += know
+    print(f"✓ 已記錄 {answered} 題作答（會 {correct} 題），略過 {skipped} 行")
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(prog="vocaboost", description="VocaBoost 命令列工具")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="資料庫路徑")
+    parser.add_argument(
+        "--catalogue", default=DEFAULT_CATALOGUE_PATH, help="唯讀單字庫路徑（拆分過的資料庫使用）"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    due_cmd = sub.add_parser("due", help="今天到期的單字數")
+    due_cmd.set_defaults(func=cmd_due)
+
+    stats_cmd = sub.add_parser("stats", help="學習統計")
+    stats_cmd.add_argument("--json", action="store_true", help="以 JSON 輸出")
+    stats_cmd.set_defaults(func=cmd_stats)
+
+    export_cmd = sub.add_parser("export", help="匯出學習進度")
+    export_cmd.add_argument("path", nargs="?", help="輸出檔案（預設或 - 為標準輸出）")
+    export_cmd.add_argument("--format", choices=("json", "snapshot"), default="json", help="輸出格式")
+    export_cmd.set_defaults(func=cmd_export)
+
+    backup_cmd = sub.add_parser("backup", help="建立資料庫備份")
+    backup_cmd.add_argument("--dir", help="備份目錄（預設 data/backups）")
+    backup_cmd.add_argument("--keep", type=_positive_int, help="保留份數（預設 7）")
+    backup_cmd.set_defaults(func=cmd_backup)
+
+    study_cmd = sub.add_parser("study", help="列出今日計畫的單字或批次作答")
+    study_cmd.add_argument(
+        "--batch",
+        action="store_true",
+        help="從標準輸入讀取作答，每行：單字或 ID、會(1/y)或不會(0/n)、作答毫秒數（可省略）",
+    )
+    study_cmd.add_argument("--limit", type=int, default=20, help="列出的單字數")
+    study_cmd.set_defaults(func=cmd_study)
+
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except MissingVocabularyError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # 輸出接到 head 等提早關閉的程式時安靜結束
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,54 +3,513 @@
 處理 SQLite 資料庫的建立、連接和基本操作
 """
 
+import copy
+import functools
+import heapq
+import keyword
+import random
 import sqlite3
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from operator import itemgetter
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+import day_number
+from lemma_key import lemma_key
+from phonetic_key import phonetic_key
+
+# 資料庫結構版本（存於 PRAGMA user_version），新增升級步驟時遞增
+SCHEMA_VERSION = 13
+
+# 尚未計算頻率排名的單字在新單字順序中的排名（排在所有已排名單字之後）
+UNRANKED = 1_000_000_000
+
+# 目前時間（Unix 毫秒），供觸發器與同步記錄使用
+NOW_MS_SQL = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+# 多個行程同時存取時的鎖等待設定
+DEFAULT_BUSY_TIMEOUT = 5.0  # 單次等待寫入鎖的秒數（SQLite busy handler）
+WRITE_RETRIES = 5  # busy handler 逾時後再重試取得寫入鎖的次數
+RETRY_BASE_DELAY = 0.05  # 第一次重試前的等待秒數，之後加倍
+RETRY_MAX_DELAY = 1.0
+WAL_AUTOCHECKPOINT = 1000  # WAL 超過此頁數時自動 checkpoint
+
+# 唯讀單字庫（與使用者進度分開的 vocabulary 資料庫檔）
+DEFAULT_CATALOGUE_PATH = "data/catalogue.db"
+CATALOGUE_SCHEMA = "catalogue"  # ATTACH 時使用的資料庫名稱
+CATALOGUE_MMAP_SIZE = 256 * 1024 * 1024  # 單字庫以 mmap 讀取的上限位元組數
+
+# 遺忘（由會變成不會）達此次數的單字視為難以記住的 leech
+LEECH_THRESHOLD = 8
+
+# 單字成為 leech 時的處理方式："suspend"（暫停複習）或 "favorite"（加入收藏）
+DEFAULT_LEECH_ACTION = "suspend"
+
+# 學習統計彙總表：表名 → (主鍵欄位, 由 study_sessions.date 計算主鍵的 SQL)
+# 1970-01-01 為星期四，date - (date + 3) % 7 即為該週星期一的日序數
+STUDY_ROLLUPS = {
+    "study_weekly": ("week_start", "{row}.date - ({row}.date + 3) % 7"),
+    "study_monthly": ("month", "strftime('%Y-%m', {row}.date * 86400, 'unixepoch')"),
+}
+
+# 查詢結果快取的項目數上限（LRU）
+QUERY_CACHE_SIZE = 256
+
+
+def is_lapse(progress: Optional[Any], is_correct: bool) -> bool:
+    """答錯是否算一次遺忘（由會變成不會）
+
+    間隔超過一天（至少答對過）的單字答錯才算，連續答錯不重複計算。
+
+    Args:
+        progress: 作答前的學習進度（None 表示第一次學習）
+        is_correct: 是否答對
+    """
+    return bool(progress) and not is_correct and (progress["interval_days"] or 0) > 1
+
+
+class ReadOnlyVocabularyError(Exception):
+    """單字資料唯讀（資料庫已拆分並掛載唯讀單字庫）"""
+
+
+class MissingVocabularyError(Exception):
+    """資料庫沒有 vocabulary 表，也沒有可掛載的單字庫"""
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """是否為鎖衝突（database is locked / busy）"""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class Record(tuple):
+    """查詢結果的一列
+
+    以 tuple 儲存欄位值（不像 dict 每列各有一份雜湊表），
+    可用屬性（row.word）、欄位名稱（row["word"]）或索引（row[0]）存取，
+    dict(row) 與 **row 也可使用。每組欄位會產生一個子類別，欄位名稱只存一份。
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """與 dict.get 相同"""
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def keys(self) -> Tuple[str, ...]:
+        """欄位名稱"""
+        return self._fields
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """(欄位名稱, 值)"""
+        return zip(self._fields, self)
+
+    def _asdict(self) -> Dict[str, Any]:
+        """轉成 dict（需要修改內容時使用）"""
+        return dict(zip(self._fields, self))
+
+    def _replace(self, **changes) -> "Record":
+        """回傳替換部分欄位後的新列"""
+        values = list(self)
+        for name, value in changes.items():
+            values[self._index[name]] = value
+        return type(self)(values)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+        return f"Record({fields})"
+
+
+@functools.lru_cache(maxsize=256)
+def _record_class(fields: Tuple[str, ...]) -> Type[Record]:
+    """取得（或建立）指定欄位組合的 Record 子類別"""
+    namespace: Dict[str, Any] = {
+        "__slots__": (),
+        "_fields": fields,
+        "_index": {name: i for i, name in enumerate(fields)},
+    }
+    for i, name in enumerate(fields):
+        # 與 tuple / Record 方法同名或不是合法識別字的欄位只能以 row["name"] 存取
+        if name.isidentifier() and not keyword.iskeyword(name) and not hasattr(Record, name):
+            namespace[name] = property(itemgetter(i))
+    return type("Record", (Record,), namespace)
+
+
+def make_record(fields: Sequence[str], values: Sequence) -> Record:
+    """以欄位名稱與值建立 Record（例如從檢查點還原查詢結果）"""
+    return _record_class(tuple(fields))(values)
+
+
+# row_factory 最近一次使用的 (cursor.description, Record 子類別)；
+# 同一次查詢的每一列共用同一個 description，不必每列重新查表
+_last_record_class: Tuple[Any, Optional[Type[Record]]] = (None, None)
+
+
+def record_factory(cursor: sqlite3.Cursor, row: tuple) -> Record:
+    """sqlite3 row_factory：將查詢結果轉為 Record"""
+    global _last_record_class
+    description, cls = _last_record_class
+    if description is not cursor.description:
+        description = cursor.description
+        cls = _record_class(tuple(column[0] for column in description))
+        _last_record_class = (description, cls)
+    return cls(row)
+
+
+def write_transaction(*tables: str) -> Callable:
+    """寫入方法裝飾器：整個方法在同一個寫入交易內執行
+
+    未在 batch() 內呼叫時自成一個交易（以 BEGIN IMMEDIATE 取得寫入鎖，
+    遇到鎖衝突會退避重試）；在 batch() 內呼叫時併入外層交易。
+    完成後遞增 tables（含觸發器連帶修改的表）的版本，讓相關的查詢快取失效。
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.batch():
+                changes_before = self.conn.total_changes
+                result = method(self, *args, **kwargs)
+                self._touch_tables(tables, changes_before)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def cached_read(*tables: str) -> Callable:
+    """讀取方法裝飾器：結果依（方法、參數、今天日序數）快取
+
+    方法的查詢語句由方法與參數唯一決定，快取鍵等同於語句加參數；
+    加入今天的日序數，讓依「今天」計算的結果跨日後重新查詢。
+    tables 任一表的版本改變時該項失效（見 VocabularyDatabase._cache_lookup）。
+    每次查詢仍會先執行一次 PRAGMA data_version 確認其他連線沒有寫入（_check_cache_token），
+    命中時省下的是原本的查詢與結果組裝。
+    回傳 list 時給呼叫端一份淺複本（元素是不可變的 Record），dict 則給深複本
+    （統計結果含巢狀的 dict），呼叫端修改結果不會影響快取內容。
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())), day_number.today())
+            found, result = self._cache_lookup(key)
+            if not found:
+                result = method(self, *args, **kwargs)
+                self._cache_store(key, tables, result)
+            if isinstance(result, list):
+                return list(result)
+            if isinstance(result, dict):
+                return copy.deepcopy(result)
+            return result
+
+        return wrapper
+
+    return decorator
 
 
 class VocabularyDatabase:
     """七千單字資料庫管理類別"""
 
-    def __init__(self, db_path: str = "data/vocabulary.db"):
+    def __init__(
+        self,
+        db_path: str = "data/vocabulary.db",
+        busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+        wal: bool = True,
+        catalogue_path: Optional[str] = None,
+        leech_action: str = DEFAULT_LEECH_ACTION,
+    ):
         """初始化資料庫連接
 
         Args:
             db_path: 資料庫檔案路徑
+            busy_timeout: 等待其他連線釋放鎖的秒數
+            wal: 是否使用 WAL 模式（讀取不會被寫入阻擋）
+            catalogue_path: 唯讀單字庫路徑；資料庫本身沒有 vocabulary 表且單字庫存在時掛載
+            leech_action: 單字成為 leech 時的處理方式（"suspend" 或 "favorite"）
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self.wal = wal
+        self.catalogue_path = Path(catalogue_path) if catalogue_path else None
+        self.catalogue_attached = False
+        self.leech_action = leech_action
         self.conn = None
         self.cursor = None
+        self._batch_depth = 0  # batch() 巢狀層數，大於 0 時延後 commit
+        self.last_lock_wait = 0.0  # 最近一次取得寫入鎖的等待秒數
+        self.busy_retries = 0  # 因鎖衝突而重試的次數
+        # 查詢快取：鍵 → (相依的表, 各表版本, 結果)，依使用順序排列（LRU）
+        self._query_cache: "OrderedDict[tuple, Tuple[tuple, tuple, Any]]" = OrderedDict()
+        self._table_versions: Dict[str, int] = {}
+        self._cache_token: Optional[Tuple[int, int]] = None  # (data_version, total_changes)
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def connect(self):
         """建立資料庫連接"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # 讓結果可以用欄位名稱存取
+        # isolation_level="IMMEDIATE"：隱含交易一開始就取得寫入鎖，
+        # 避免讀取中途升級為寫入時與其他行程互相等待而直接失敗
+        self.conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout, isolation_level="IMMEDIATE", uri=True
+        )
+        self.conn.row_factory = record_factory  # 讓結果可以用欄位名稱或屬性存取
         self.cursor = self.conn.cursor()
+        if self.wal:
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.execute(f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT}")
+        self._attach_catalogue()
+        self._upgrade_schema()
+        if self.catalogue_attached:
+            self._create_catalogue_triggers()
+
+    def _attach_catalogue(self):
+        """掛載唯讀單字庫
+
+        以 immutable=1 開啟（不加鎖、不檢查變更），並以 mmap 直接讀取頁面快取。
+        主資料庫沒有 vocabulary 表時，未加前綴的 vocabulary 會解析到單字庫，
+        既有查詢不需修改；資料庫本身已有 vocabulary 表（單檔模式）則不掛載。
+        """
+        self.catalogue_attached = False
+        if self.catalogue_path is None or not self.catalogue_path.exists():
+            return
+        if self._has_local_vocabulary():
+            return
+
+        uri = f"{self.catalogue_path.resolve().as_uri()}?immutable=1"
+        self.conn.execute(f"ATTACH DATABASE ? AS {CATALOGUE_SCHEMA}", (uri,))
+        self.conn.execute(f"PRAGMA {CATALOGUE_SCHEMA}.mmap_size = {CATALOGUE_MMAP_SIZE}")
+        self.catalogue_attached = True
+
+    def require_writable_vocabulary(self):
+        """確認可以修改單字資料
+
+        Raises:
+            ReadOnlyVocabularyError: 單字由唯讀單字庫提供
+        """
+        if self.catalogue_attached:
+            raise ReadOnlyVocabularyError(
+                f"vocabulary is provided by the read-only catalogue {self.catalogue_path}; "
+                "modify words before splitting the database"
+            )
+
+    def _has_local_vocabulary(self) -> bool:
+        """主資料庫是否有自己的 vocabulary 表"""
+        return (
+            self.conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'vocabulary'"
+            ).fetchone()
+            is not None
+        )
+
+    def _create_catalogue_triggers(self):
+        """建立參照單字庫的 TEMP 觸發器
+
+        一般觸發器只能參照同一個資料庫內的表，需要讀取單字庫的觸發器
+        改為每次連線時建立的 TEMP 觸發器。
+        """
+        has_tables = self.conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'learning_progress'"
+        ).fetchone()
+        if not has_tables:
+            return
+        self.conn.execute(f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS trg_unlearned_progress_delete
+            AFTER DELETE ON main.learning_progress
+            BEGIN
+                INSERT OR IGNORE INTO unlearned_words (vocabulary_id, level, sort_key)
+                SELECT id, level, COALESCE(frequency_rank, {UNRANKED})
+                FROM {CATALOGUE_SCHEMA}.vocabulary WHERE id = OLD.vocabulary_id;
+            END
+        """)
 
     def close(self):
         """關閉資料庫連接"""
         if self.conn:
             self.conn.close()
+        self.clear_cache()
+
+    # ========== 查詢快取 ==========
+
+    def _touch_tables(self, tables: Tuple[str, ...], changes_before: int):
+        """遞增表的版本（寫入方法完成後呼叫）
+
+        Args:
+            tables: 寫入方法修改的表
+            changes_before: 寫入方法執行前的 total_changes
+        """
+        for table in tables:
+            self._table_versions[table] = self._table_versions.get(table, 0) + 1
+        if self._cache_token is not None and self._cache_token[1] == changes_before:
+            # 這次的修改已反映在表版本上，不必整個快取失效；
+            # 之前若有未經寫入方法的修改，token 維持不符，下次讀取時清空快取
+            self._cache_token = (self._cache_token[0], self.conn.total_changes)
+
+    def _check_cache_token(self):
+        """其他連線提交了寫入（data_version 改變），或本連線有未經寫入方法的修改
+        （total_changes 改變，例如同步或遷移直接執行的 SQL）時清空快取"""
+        token = (self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes)
+        if token != self._cache_token:
+            self._query_cache.clear()
+            self._cache_token = token
+
+    def _cache_lookup(self, key: tuple) -> Tuple[bool, Any]:
+        """查詢快取，回傳 (是否命中, 結果)"""
+        self._check_cache_token()
+        entry = self._query_cache.get(key)
+        if entry is not None:
+            tables, versions, result = entry
+            if versions == tuple(self._table_versions.get(t, 0) for t in tables):
+                self._query_cache.move_to_end(key)
+                self.cache_hits += 1
+                return True, result
+            del self._query_cache[key]
+        self.cache_misses += 1
+        return False, None
+
+    def _cache_store(self, key: tuple, tables: Tuple[str, ...], result: Any):
+        """存入快取，超過上限時淘汰最久未使用的項目"""
+        versions = tuple(self._table_versions.get(t, 0) for t in tables)
+        self._query_cache[key] = (tables, versions, result)
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def clear_cache(self):
+        """清空查詢快取"""
+        self._query_cache.clear()
+        self._cache_token = None
+
+    def cache_info(self) -> Dict:
+        """查詢快取統計（調整 QUERY_CACHE_SIZE 用）
+
+        Returns:
+            {"hits", "misses", "hit_rate", "size", "max_size"}
+        """
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total, 3) if total else 0.0,
+            "size": len(self._query_cache),
+            "max_size": QUERY_CACHE_SIZE,
+        }
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Dict:
+        """將 WAL 內容寫回主資料庫檔
+
+        Args:
+            mode: PASSIVE（不等待讀取者）、FULL、RESTART 或 TRUNCATE（完成後清空 WAL 檔）
+
+        Returns:
+            {"busy": 是否因其他連線而未完成, "log_pages": WAL 頁數, "checkpointed": 已寫回頁數}
+        """
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"invalid checkpoint mode: {mode}")
+        busy, log_pages, checkpointed = self.conn.execute(
+            f"PRAGMA wal_checkpoint({mode})"
+        ).fetchone()
+        return {"busy": bool(busy), "log_pages": log_pages, "checkpointed": checkpointed}
+
+    def _begin_write(self):
+        """以 BEGIN IMMEDIATE 開始寫入交易
+
+        busy handler 逾時後以指數退避（含隨機抖動）重試，
+        最後一次仍失敗時拋出 sqlite3.OperationalError。
+        """
+        started = time.perf_counter()
+        delay = RETRY_BASE_DELAY
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == WRITE_RETRIES:
+                    raise
+                self.busy_retries += 1
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+        self.last_lock_wait = time.perf_counter() - started
+
+    @contextmanager
+    def batch(self) -> Iterator["VocabularyDatabase"]:
+        """將區塊內的多筆寫入合併為單一交易
+
+        區塊內呼叫的寫入方法不會各自 commit，離開區塊時統一 commit；
+        發生例外時整批 rollback。可巢狀使用，只有最外層會 commit。
+        最外層進入時即取得寫入鎖（見 _begin_write）。
+        """
+        if self._batch_depth == 0 and not self.conn.in_transaction:
+            self._begin_write()
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+                # 交易中讀到的未提交資料已不存在
+                self.clear_cache()
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.commit()
+
+    @contextmanager
+    def savepoint(self) -> Iterator["VocabularyDatabase"]:
+        """在目前的交易內建立儲存點（須在 batch() 區塊內使用）
+
+        區塊內發生例外時只復原區塊內的寫入，外層交易其他的寫入保留並照常 commit。
+        """
+        self.conn.execute("SAVEPOINT vb_savepoint")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK TO vb_savepoint")
+            self.conn.execute("RELEASE vb_savepoint")
+            # 區塊內讀到的資料已復原
+            self.clear_cache()
+            raise
+        else:
+            self.conn.execute("RELEASE vb_savepoint")
+
+    def _commit(self):
+        """提交交易（在 batch() 區塊內時延後到區塊結束）"""
+        if self._batch_depth == 0:
+            self.conn.commit()
 
     def initialize_schema(self):
         """建立資料庫結構"""
         self.connect()
 
-        # 主要單字表
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                phonetic TEXT,
-                part_of_speech TEXT,
-                translation TEXT NOT NULL,
-                level INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(word, part_of_speech, level)
-            )
-        """)
+        # 主要單字表（已掛載唯讀單字庫時由單字庫提供）
+        if not self.catalogue_attached:
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS vocabulary (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT NOT NULL,
+                    phonetic TEXT,
+                    part_of_speech TEXT,
+                    translation TEXT NOT NULL,
+                    level INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(word, part_of_speech, level)
+                )
+            """)
 
         # 學習進度表 (擴充 SM-2 演算法欄位)
         self.cursor.execute("""
@@ -84,13 +543,14 @@ class VocabularyDatabase:
         """)
 
         # 建立索引以加速查詢
-        self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_level ON vocabulary(level)
-        """)
+        if not self.catalogue_attached:
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_level ON vocabulary(level)
+            """)
 
-        self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_word ON vocabulary(word)
-        """)
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_word ON vocabulary(word)
+            """)
 
         self.cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_next_review ON learning_progress(next_review)
@@ -101,8 +561,524 @@ class VocabularyDatabase:
         """)
 
         self.conn.commit()
+        self._upgrade_schema()
+        if self.catalogue_attached:
+            self._create_catalogue_triggers()
         print(f"✓ 資料庫結構建立完成：{self.db_path}")
 
+    def _upgrade_schema(self):
+        """依 PRAGMA user_version 套用尚未執行的結構升級
+
+        所有升級步驟在同一個交易內執行，任一步失敗即整批 rollback。
+        尚未建立基本結構的資料庫會略過，由 initialize_schema 建立後再升級。
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        has_tables = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'learning_progress'"
+        ).fetchone()
+        if not has_tables:
+            return
+
+        upgrades = [
+            (1, self._upgrade_v1_change_tracking),
+            (2, self._upgrade_v2_day_numbers),
+            (3, self._upgrade_v3_daily_plan),
+            (4, self._upgrade_v4_unlearned_words),
+            (5, self._upgrade_v5_frequency_rank),
+            (6, self._upgrade_v6_phonetic_key),
+            (7, self._upgrade_v7_level_word_index),
+            (8, self._upgrade_v8_study_rollups),
+            (9, self._upgrade_v9_response_times),
+            (10, self._upgrade_v10_leeches),
+            (11, self._upgrade_v11_lemma_key),
+            (12, self._upgrade_v12_frequency_rank_index),
+            (13, self._upgrade_v13_due_index),
+        ]
+
+        # 取得寫入鎖後重新讀取版本，其他行程可能已先完成升級
+        self._begin_write()
+        try:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, upgrade in upgrades:
+                if version < target:
+                    upgrade()
+                    self.conn.execute(f"PRAGMA user_version = {target}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def _upgrade_v1_change_tracking(self):
+        """v1：學習進度與每日統計加入逐列的 version / updated_at
+
+        version 取自全域遞增的 change_version，由觸發器在每次寫入時自動指派，
+        同步時只需查詢 version 大於某值的列即可取得增量變更。
+        """
+        for table in ("learning_progress", "study_sessions"):
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN updated_at INTEGER")
+            self.conn.execute(
+                f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+        # 既有資料依序編上版本號
+        self.conn.execute("""
+            UPDATE learning_progress
+            SET version = id,
+                updated_at = CAST(strftime('%s', COALESCE(last_reviewed, 'now')) AS INTEGER) * 1000
+        """)
+        self.conn.execute("""
+            UPDATE study_sessions
+            SET version = id + (SELECT COALESCE(MAX(id), 0) FROM learning_progress),
+                updated_at = CAST(strftime('%s', date) AS INTEGER) * 1000
+        """)
+        self.conn.execute("""
+            INSERT OR REPLACE INTO sync_state (key, value)
+            SELECT 'change_version', MAX(
+                (SELECT COALESCE(MAX(version), 0) FROM learning_progress),
+                (SELECT COALESCE(MAX(version), 0) FROM study_sessions)
+            )
+        """)
+
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_progress_version ON learning_progress(version)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_version ON study_sessions(version)
+        """)
+
+        self._create_change_triggers()
+
+    def _upgrade_v2_day_numbers(self):
+        """v2：next_review 與 study_sessions.date 由 YYYY-MM-DD 字串改為日序數整數
+
+        只是表示法轉換，過程中暫時移除版本觸發器，不會產生新的同步版本號。
+        """
+        self._drop_change_triggers()
+        self.conn.execute("""
+            UPDATE learning_progress
+            SET next_review = CAST(julianday(next_review) - 2440587.5 AS INTEGER)
+            WHERE typeof(next_review) = 'text'
+        """)
+        self.conn.execute("""
+            UPDATE study_sessions
+            SET date = CAST(julianday(date) - 2440587.5 AS INTEGER)
+            WHERE typeof(date) = 'text'
+        """)
+        self._create_change_triggers()
+
+    def _upgrade_v3_daily_plan(self):
+        """v3：每日學習計畫表
+
+        每天第一次開始學習時寫入當天要學的複習與新單字（依出題順序），
+        之後開啟學習只需依 (plan_day, position) 讀取一段範圍。
+        計畫只存在本機，不參與同步。
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_plan (
+                plan_day INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                vocabulary_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (plan_day, position),
+                FOREIGN KEY (vocabulary_id) REFERENCES vocabulary(id)
+            )
+        """)
+        self.conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_plan_word ON daily_plan(plan_day, vocabulary_id)
+        """)
+
+    def _upgrade_v4_unlearned_words(self):
+        """v4：維護尚未學習的單字集合 unlearned_words
+
+        取代每次查詢新單字時對 learning_progress 的反向 JOIN：
+        單字一建立學習進度就由觸發器移出集合（刪除進度時放回），
+        新單字依 (level, sort_key, vocabulary_id) 索引分頁讀取，
+        成本與已學單字數量無關。
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS unlearned_words (
+                vocabulary_id INTEGER PRIMARY KEY,
+                level INTEGER NOT NULL,
+                sort_key TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_unlearned_order
+            ON unlearned_words(level, sort_key, vocabulary_id)
+        """)
+        self.conn.execute("""
+            INSERT OR IGNORE INTO unlearned_words (vocabulary_id, level, sort_key)
+            SELECT v.id, v.level, v.word FROM vocabulary v
+            WHERE NOT EXISTS (SELECT 1 FROM learning_progress lp WHERE lp.vocabulary_id = v.id)
+        """)
+        if self.catalogue_attached:
+            # 單字庫唯讀，不需要也無法在其上建立觸發器（v5 會重建）
+            return
+
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_insert
+            AFTER INSERT ON vocabulary
+            WHEN NOT EXISTS (SELECT 1 FROM learning_progress WHERE vocabulary_id = NEW.id)
+            BEGIN
+                INSERT OR REPLACE INTO unlearned_words (vocabulary_id, level, sort_key)
+                VALUES (NEW.id, NEW.level, NEW.word);
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_update
+            AFTER UPDATE OF word, level ON vocabulary
+            BEGIN
+                UPDATE unlearned_words SET level = NEW.level, sort_key = NEW.word
+                WHERE vocabulary_id = NEW.id;
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_delete
+            AFTER DELETE ON vocabulary
+            BEGIN
+                DELETE FROM unlearned_words WHERE vocabulary_id = OLD.id;
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_progress_insert
+            AFTER INSERT ON learning_progress
+            BEGIN
+                DELETE FROM unlearned_words WHERE vocabulary_id = NEW.vocabulary_id;
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_progress_delete
+            AFTER DELETE ON learning_progress
+            BEGIN
+                INSERT OR IGNORE INTO unlearned_words (vocabulary_id, level, sort_key)
+                SELECT id, level, word FROM vocabulary WHERE id = OLD.vocabulary_id;
+            END
+        """)
+
+    def _upgrade_v5_frequency_rank(self):
+        """v5：單字加入 frequency_rank，新單字改依使用頻率排序
+
+        排名由 frequency_rank.py 依內附的頻率表離線計算；升級時先依
+        (level, word) 給定初始排名，維持原本的字母順序。
+        unlearned_words 的 sort_key 改為頻率排名（整數）重建。
+        掛載單字庫時 vocabulary 由單字庫提供（建置時已是最新結構），只重建 unlearned_words。
+        """
+        if not self.catalogue_attached:
+            self.conn.execute("ALTER TABLE vocabulary ADD COLUMN frequency_rank INTEGER")
+            self.conn.execute("""
+                WITH ranked AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY level, word, id) AS rank
+                    FROM vocabulary
+                )
+                UPDATE vocabulary SET frequency_rank = ranked.rank
+                FROM ranked WHERE ranked.id = vocabulary.id
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_level_frequency ON vocabulary(level, frequency_rank)
+            """)
+
+        for name in (
+            "vocabulary_insert",
+            "vocabulary_update",
+            "vocabulary_delete",
+            "progress_insert",
+            "progress_delete",
+        ):
+            self.conn.execute(f"DROP TRIGGER IF EXISTS trg_unlearned_{name}")
+        self.conn.execute("DROP TABLE IF EXISTS unlearned_words")
+        self.conn.execute("""
+            CREATE TABLE unlearned_words (
+                vocabulary_id INTEGER PRIMARY KEY,
+                level INTEGER NOT NULL,
+                sort_key INTEGER NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_unlearned_order
+            ON unlearned_words(level, sort_key, vocabulary_id)
+        """)
+        self.conn.execute(f"""
+            INSERT INTO unlearned_words (vocabulary_id, level, sort_key)
+            SELECT v.id, v.level, COALESCE(v.frequency_rank, {UNRANKED}) FROM vocabulary v
+            WHERE NOT EXISTS (SELECT 1 FROM learning_progress lp WHERE lp.vocabulary_id = v.id)
+        """)
+        self._create_unlearned_triggers()
+
+    def _upgrade_v6_phonetic_key(self):
+        """v6：單字加入 phonetic_key（發音鍵），支援發音相近的搜尋
+
+        發音鍵由 phonetic_key.py 以 Python 計算；新單字在 insert_vocabulary 時一併寫入。
+        掛載單字庫時 vocabulary 由單字庫提供，需以最新結構重新建置單字庫。
+        """
+        if self.catalogue_attached:
+            return
+        self.conn.execute("ALTER TABLE vocabulary ADD COLUMN phonetic_key TEXT")
+        rows = self.conn.execute("SELECT id, word FROM vocabulary").fetchall()
+        self.conn.executemany(
+            "UPDATE vocabulary SET phonetic_key = ? WHERE id = ?",
+            [(phonetic_key(row["word"]), row["id"]) for row in rows],
+        )
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_phonetic_key ON vocabulary(phonetic_key)
+        """)
+
+    def _upgrade_v7_level_word_index(self):
+        """v7：單字加入 (level, word) 索引，收藏列表以 keyset 分頁時沿索引依序讀取
+
+        掛載單字庫時索引隨單字庫提供，需以最新結構重新建置單字庫。
+        """
+        if self.catalogue_attached:
+            return
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_level_word ON vocabulary(level, word)
+        """)
+
+    def _upgrade_v8_study_rollups(self):
+        """v8：每週與每月的學習統計彙總表 study_weekly、study_monthly
+
+        由 study_sessions 的觸發器以差值增量更新（record_study_session 與同步合併都會經過），
+        熱度圖與正確率趨勢只需讀取一年 53 週、12 個月的彙總列，不必掃描每日記錄。
+        week_start 為該週星期一的日序數，month 為 YYYY-MM。
+        """
+        for table, key in (("study_weekly", "week_start INTEGER"), ("study_monthly", "month TEXT")):
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {key} PRIMARY KEY,
+                    days_studied INTEGER NOT NULL DEFAULT 0,
+                    new_words INTEGER NOT NULL DEFAULT 0,
+                    reviewed_words INTEGER NOT NULL DEFAULT 0,
+                    correct_count INTEGER NOT NULL DEFAULT 0,
+                    total_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+        for table, (column, key) in STUDY_ROLLUPS.items():
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO {table}
+                ({column}, days_studied, new_words, reviewed_words, correct_count, total_count)
+                SELECT {key.format(row="s")}, COUNT(*), COALESCE(SUM(new_words), 0),
+                       COALESCE(SUM(reviewed_words), 0), COALESCE(SUM(correct_count), 0),
+                       COALESCE(SUM(total_count), 0)
+                FROM study_sessions s
+                GROUP BY 1
+            """)
+
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_session_insert
+            AFTER INSERT ON study_sessions
+            BEGIN
+                {self._rollup_upsert_sql("NEW", "+")}
+            END
+        """)
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_session_update
+            AFTER UPDATE OF date, new_words, reviewed_words, correct_count, total_count
+            ON study_sessions
+            BEGIN
+                {self._rollup_upsert_sql("OLD", "-")}
+                {self._rollup_upsert_sql("NEW", "+")}
+            END
+        """)
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_session_delete
+            AFTER DELETE ON study_sessions
+            BEGIN
+                {self._rollup_upsert_sql("OLD", "-")}
+            END
+        """)
+
+    def _upgrade_v9_response_times(self):
+        """v9：學習進度加入作答時間統計
+
+        response_ms_total / response_count 為有計時的作答總毫秒數與次數（平均即每張卡片的作答時間），
+        last_response_ms 為最近一次的作答毫秒數。每日的總學習時間記在 study_sessions.study_time_seconds。
+        """
+        self.conn.execute(
+            "ALTER TABLE learning_progress ADD COLUMN response_ms_total INTEGER NOT NULL DEFAULT 0"
+        )
+        self.conn.execute(
+            "ALTER TABLE learning_progress ADD COLUMN response_count INTEGER NOT NULL DEFAULT 0"
+        )
+        self.conn.execute("ALTER TABLE learning_progress ADD COLUMN last_response_ms INTEGER")
+
+    def _upgrade_v10_leeches(self):
+        """v10：學習進度加入 lapse_count（遺忘次數）與 is_suspended（暫停複習）
+
+        遺忘次數達 LEECH_THRESHOLD 的單字以部分索引標記，列出 leech 只需掃描索引。
+        已學過的單字無從得知過去的遺忘次數，一律從 0 開始計算。
+        """
+        self.conn.execute(
+            "ALTER TABLE learning_progress ADD COLUMN lapse_count INTEGER NOT NULL DEFAULT 0"
+        )
+        self.conn.execute(
+            "ALTER TABLE learning_progress ADD COLUMN is_suspended INTEGER NOT NULL DEFAULT 0"
+        )
+        self.conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_leech ON learning_progress(lapse_count)
+            WHERE lapse_count >= {LEECH_THRESHOLD}
+        """)
+
+    def _upgrade_v11_lemma_key(self):
+        """v11：單字加入 lemma_key（詞條鍵），同形異義字與不同詞性的詞條共用同一個鍵
+
+        詞條鍵由 lemma_key.py 在匯入時計算一次，排入每日計畫時只需比較鍵值。
+        掛載單字庫時 vocabulary 由單字庫提供，需以最新結構重新建置單字庫。
+        """
+        if self.catalogue_attached:
+            return
+        self.conn.execute("ALTER TABLE vocabulary ADD COLUMN lemma_key TEXT")
+        rows = self.conn.execute("SELECT id, word FROM vocabulary").fetchall()
+        self.conn.executemany(
+            "UPDATE vocabulary SET lemma_key = ? WHERE id = ?",
+            [(lemma_key(row["word"]), row["id"]) for row in rows],
+        )
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_lemma_key ON vocabulary(lemma_key)
+        """)
+
+    def _upgrade_v12_frequency_rank_index(self):
+        """v12：單字加入 frequency_rank 索引，新增單字時以索引取得目前最大排名
+
+        掛載單字庫時單字庫為唯讀，不會新增單字。
+        """
+        if self.catalogue_attached:
+            return
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_frequency_rank ON vocabulary(frequency_rank)
+        """)
+
+    def _upgrade_v13_due_index(self):
+        """v13：未暫停單字的 next_review 部分索引
+
+        到期數、複習清單與複習預測都只看未暫停的單字。索引欄位含 is_suspended，
+        查詢條件的欄位都在索引內（SQLite 不把部分索引的條件欄位視為已涵蓋），
+        計算到期數時只掃描索引、不回表。
+        """
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_due ON learning_progress(next_review, is_suspended)
+            WHERE is_suspended = 0
+        """)
+
+    @staticmethod
+    def _rollup_upsert_sql(row: str, sign: str) -> str:
+        """觸發器內把一列 study_sessions 加入（+）或扣除（-）週、月彙總的 SQL"""
+        statements = []
+        for table, (column, key) in STUDY_ROLLUPS.items():
+            statements.append(f"""
+                INSERT INTO {table}
+                ({column}, days_studied, new_words, reviewed_words, correct_count, total_count)
+                VALUES ({key.format(row=row)}, {sign}1, {sign}COALESCE({row}.new_words, 0),
+                        {sign}COALESCE({row}.reviewed_words, 0), {sign}COALESCE({row}.correct_count, 0),
+                        {sign}COALESCE({row}.total_count, 0))
+                ON CONFLICT({column}) DO UPDATE SET
+                    days_studied = days_studied + excluded.days_studied,
+                    new_words = new_words + excluded.new_words,
+                    reviewed_words = reviewed_words + excluded.reviewed_words,
+                    correct_count = correct_count + excluded.correct_count,
+                    total_count = total_count + excluded.total_count;
+            """)
+        return "".join(statements)
+
+    def _create_unlearned_triggers(self):
+        """建立維護 unlearned_words 的觸發器（sort_key 為頻率排名）
+
+        掛載單字庫時只建立不參照 vocabulary 的觸發器，
+        其餘由 _create_catalogue_triggers 以 TEMP 觸發器提供。
+        """
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_progress_insert
+            AFTER INSERT ON learning_progress
+            BEGIN
+                DELETE FROM unlearned_words WHERE vocabulary_id = NEW.vocabulary_id;
+            END
+        """)
+        if self.catalogue_attached:
+            return
+
+        sort_key = f"COALESCE(NEW.frequency_rank, {UNRANKED})"
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_insert
+            AFTER INSERT ON vocabulary
+            WHEN NOT EXISTS (SELECT 1 FROM learning_progress WHERE vocabulary_id = NEW.id)
+            BEGIN
+                INSERT OR REPLACE INTO unlearned_words (vocabulary_id, level, sort_key)
+                VALUES (NEW.id, NEW.level, {sort_key});
+            END
+        """)
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_update
+            AFTER UPDATE OF level, frequency_rank ON vocabulary
+            BEGIN
+                UPDATE unlearned_words SET level = NEW.level, sort_key = {sort_key}
+                WHERE vocabulary_id = NEW.id;
+            END
+        """)
+        self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_vocabulary_delete
+            AFTER DELETE ON vocabulary
+            BEGIN
+                DELETE FROM unlearned_words WHERE vocabulary_id = OLD.id;
+            END
+        """)
+        self.conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_unlearned_progress_delete
+            AFTER DELETE ON learning_progress
+            BEGIN
+                INSERT OR IGNORE INTO unlearned_words (vocabulary_id, level, sort_key)
+                SELECT id, level, COALESCE(frequency_rank, {UNRANKED})
+                FROM vocabulary WHERE id = OLD.vocabulary_id;
+            END
+        """)
+
+    def _create_change_triggers(self):
+        """建立寫入時指派新版本號的觸發器
+
+        明確寫入的 updated_at（例如套用遠端變更）會被保留
+        """
+        for table in ("learning_progress", "study_sessions"):
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_version
+                AFTER INSERT ON {table}
+                BEGIN
+                    UPDATE sync_state SET value = value + 1 WHERE key = 'change_version';
+                    UPDATE {table}
+                    SET version = (SELECT value FROM sync_state WHERE key = 'change_version'),
+                        updated_at = COALESCE(NEW.updated_at, {NOW_MS_SQL})
+                    WHERE id = NEW.id;
+                END
+            """)
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_update_version
+                AFTER UPDATE ON {table}
+                WHEN NEW.version = OLD.version
+                BEGIN
+                    UPDATE sync_state SET value = value + 1 WHERE key = 'change_version';
+                    UPDATE {table}
+                    SET version = (SELECT value FROM sync_state WHERE key = 'change_version'),
+                        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                                          THEN {NOW_MS_SQL} ELSE NEW.updated_at END
+                    WHERE id = NEW.id;
+                END
+            """)
+
+    def _drop_change_triggers(self):
+        """移除版本觸發器"""
+        for table in ("learning_progress", "study_sessions"):
+            self.conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_insert_version")
+            self.conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_update_version")
+
+    @write_transaction("vocabulary", "unlearned_words")
     def insert_vocabulary(
         self,
         word: str,
@@ -110,6 +1086,7 @@ class VocabularyDatabase:
         part_of_speech: str,
         translation: str,
         level: int,
+        frequency_rank: Optional[int] = None,
     ) -> Optional[int]:
         """插入單字資料
 
@@ -119,25 +1096,43 @@ class VocabularyDatabase:
             part_of_speech: 詞性
             translation: 中文翻譯
             level: 級別 (1-7)
+            frequency_rank: 頻率排名；None 時排在現有單字之後
+                （之後可用 frequency_rank.py 依頻率表重新排名）
 
         Returns:
             插入的 row id，若已存在則返回 None
+
+        Raises:
+            ReadOnlyVocabularyError: 單字由唯讀單字庫提供
         """
+        self.require_writable_vocabulary()
         try:
             self.cursor.execute(
                 """
-                INSERT INTO vocabulary (word, phonetic, part_of_speech, translation, level)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO vocabulary
+                (word, phonetic, part_of_speech, translation, level, phonetic_key, lemma_key,
+                 frequency_rank)
+                VALUES (?, ?, ?, ?, ?, ?, ?,
+                        COALESCE(?, (SELECT COALESCE(MAX(frequency_rank), 0) + 1 FROM vocabulary)))
             """,
-                (word, phonetic, part_of_speech, translation, level),
+                (
+                    word,
+                    phonetic,
+                    part_of_speech,
+                    translation,
+                    level,
+                    phonetic_key(word),
+                    lemma_key(word),
+                    frequency_rank,
+                ),
             )
-            self.conn.commit()
             return self.cursor.lastrowid
         except sqlite3.IntegrityError:
             # 單字已存在
             return None
 
-    def get_words_by_level(self, level: int) -> List[Dict]:
+    @cached_read("vocabulary")
+    def get_words_by_level(self, level: int) -> List[Record]:
         """取得指定級別的所有單字
 
         Args:
@@ -154,9 +1149,10 @@ class VocabularyDatabase:
             (level,),
         )
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
 
-    def search_word(self, keyword: str) -> List[Dict]:
+    @cached_read("vocabulary")
+    def search_word(self, keyword: str) -> List[Record]:
         """搜尋單字
 
         Args:
@@ -174,8 +1170,96 @@ class VocabularyDatabase:
             (f"%{keyword}%", f"%{keyword}%"),
         )
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
+
+    @cached_read("vocabulary")
+    def find_word_id(self, word: str) -> Optional[int]:
+        """以拼字找單字 ID（找不到完全相同的拼字時改用詞條鍵，"arm" 對應 "arm (1)"）
+
+        Args:
+            word: 單字拼字
+
+        Returns:
+            單字 ID，找不到則返回 None
+        """
+        row = self.conn.execute(
+            "SELECT id FROM vocabulary WHERE word = ? LIMIT 1", (word.strip(),)
+        ).fetchone()
+        if row is None:
+            row = self.conn.execute(
+                "SELECT id FROM vocabulary WHERE lemma_key = ? ORDER BY id LIMIT 1",
+                (lemma_key(word),),
+            ).fetchone()
+        return row[0] if row else None
+
+    @cached_read("vocabulary")
+    def has_word(self, vocabulary_id: int) -> bool:
+        """單字 ID 是否存在
+
+        Args:
+            vocabulary_id: 單字 ID
 
+        Returns:
+            存在返回 True
+        """
+        row = self.conn.execute(
+            "SELECT 1 FROM vocabulary WHERE id = ?", (vocabulary_id,)
+        ).fetchone()
+        return row is not None
+
+    def search_sound_alike(self, text: str, limit: int = 20) -> List[Record]:
+        """搜尋發音相近的單字（依聽到的拼法找單字）
+
+        以發音鍵的第一碼在 idx_phonetic_key 上做範圍查詢、長度相差一碼以內者為候選，
+        再依發音鍵相同、發音鍵與拼字的相似度、使用頻率排序。
+
+        Args:
+            text: 聽起來像的拼法
+            limit: 回傳數量上限
+
+        Returns:
+            單字列表（含 phonetic_key）
+        """
+        import difflib  # 只有發音搜尋用到，不拖慢命令列工具的啟動
+
+        key = phonetic_key(text)
+        if not key:
+            return []
+        prefix = key[:1]
+        rows = self.conn.execute(
+            f"""
+            SELECT *, COALESCE(frequency_rank, {UNRANKED}) AS rank FROM vocabulary
+            WHERE phonetic_key >= ? AND phonetic_key < ?
+              AND LENGTH(phonetic_key) BETWEEN ? AND ?
+        """,
+            (prefix, prefix + "\uffff", len(key) - 1, len(key) + 1),
+        ).fetchall()
+
+        # 先以發音鍵相似度（同一個鍵只算一次）篩出候選，再加上拼字相似度排序
+        key_matcher = difflib.SequenceMatcher(None, "", key)
+        key_scores: Dict[str, float] = {}
+        for row in rows:
+            if row["phonetic_key"] not in key_scores:
+                key_matcher.set_seq1(row["phonetic_key"])
+                # quick_ratio() 是 ratio() 的上界，低於一半者不必精算
+                quick = key_matcher.quick_ratio()
+                key_scores[row["phonetic_key"]] = key_matcher.ratio() if quick >= 0.5 else quick
+        shortlist = heapq.nsmallest(
+            limit * 5,
+            rows,
+            key=lambda row: (row["phonetic_key"] != key, -key_scores[row["phonetic_key"]], row["rank"]),
+        )
+
+        word_matcher = difflib.SequenceMatcher(None, "", text.strip().lower())
+
+        def score(row) -> Tuple:
+            word_matcher.set_seq1(row["word"].lower())
+            similarity = key_scores[row["phonetic_key"]] + word_matcher.ratio()
+            return (row["phonetic_key"] != key, -round(similarity, 1), row["rank"])
+
+        return sorted(shortlist, key=score)[:limit]
+
+    @cached_read("vocabulary", "learning_progress")
     def get_statistics(self) -> Dict:
         """取得資料庫統計資訊
 
@@ -203,7 +1287,8 @@ class VocabularyDatabase:
 
     # ========== 學習進度管理 ==========
 
-    def get_progress(self, vocabulary_id: int) -> Optional[Dict]:
+    @cached_read("learning_progress")
+    def get_progress(self, vocabulary_id: int) -> Optional[Record]:
         """取得單字的學習進度
 
         Args:
@@ -220,15 +1305,17 @@ class VocabularyDatabase:
         )
 
         row = self.cursor.fetchone()
-        return dict(row) if row else None
+        return row
 
+    @write_transaction("learning_progress", "unlearned_words")
     def update_progress(
         self,
         vocabulary_id: int,
         ease_factor: float,
         interval_days: int,
-        next_review: str,
+        next_review: int,
         is_correct: bool = True,
+        response_ms: Optional[int] = None,
     ):
         """更新單字的學習進度
 
@@ -236,10 +1323,17 @@ class VocabularyDatabase:
             vocabulary_id: 單字 ID
             ease_factor: 難度因子 (SM-2)
             interval_days: 間隔天數
-            next_review: 下次複習日期 (YYYY-MM-DD)
+            next_review: 下次複習日期（日序數）
             is_correct: 是否答對
+            response_ms: 作答時間（毫秒），None 表示未計時
+
+        Returns:
+            這次遺忘使單字成為 leech 時回傳 True
         """
         progress = self.get_progress(vocabulary_id)
+        timed = 0 if response_ms is None else 1
+
+        lapsed = is_lapse(progress, is_correct)
 
         if progress:
             # 更新現有進度
@@ -251,7 +1345,11 @@ class VocabularyDatabase:
                     next_review = ?,
                     last_reviewed = CURRENT_TIMESTAMP,
                     review_count = review_count + 1,
-                    correct_count = correct_count + ?
+                    correct_count = correct_count + ?,
+                    response_ms_total = response_ms_total + ?,
+                    response_count = response_count + ?,
+                    last_response_ms = COALESCE(?, last_response_ms),
+                    lapse_count = lapse_count + ?
                 WHERE vocabulary_id = ?
             """,
                 (
@@ -259,6 +1357,10 @@ class VocabularyDatabase:
                     interval_days,
                     next_review,
                     1 if is_correct else 0,
+                    response_ms or 0,
+                    timed,
+                    response_ms,
+                    1 if lapsed else 0,
                     vocabulary_id,
                 ),
             )
@@ -268,8 +1370,9 @@ class VocabularyDatabase:
                 """
                 INSERT INTO learning_progress
                 (vocabulary_id, ease_factor, interval_days, next_review,
-                 last_reviewed, review_count, correct_count)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 1, ?)
+                 last_reviewed, review_count, correct_count,
+                 response_ms_total, response_count, last_response_ms)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 1, ?, ?, ?, ?)
             """,
                 (
                     vocabulary_id,
@@ -277,39 +1380,147 @@ class VocabularyDatabase:
                     interval_days,
                     next_review,
                     1 if is_correct else 0,
+                    response_ms or 0,
+                    timed,
+                    response_ms,
                 ),
             )
 
-        self.conn.commit()
+        if lapsed and progress["lapse_count"] + 1 == LEECH_THRESHOLD:
+            self._handle_leech(vocabulary_id)
+            return True
+        return False
+
+    def _handle_leech(self, vocabulary_id: int):
+        """依 leech_action 暫停複習或加入收藏"""
+        if self.leech_action == "favorite":
+            self.cursor.execute(
+                "UPDATE learning_progress SET is_favorite = 1 WHERE vocabulary_id = ?",
+                (vocabulary_id,),
+            )
+        else:
+            self.cursor.execute(
+                "UPDATE learning_progress SET is_suspended = 1 WHERE vocabulary_id = ?",
+                (vocabulary_id,),
+            )
+
+    @cached_read("vocabulary")
+    def get_sibling_ids(self, vocabulary_id: int) -> List[int]:
+        """取得同一詞條鍵的其他單字 ID（同形異義字、不同詞性），以 idx_lemma_key 查詢
+
+        Args:
+            vocabulary_id: 單字 ID
+
+        Returns:
+            兄弟詞條的單字 ID 列表
+        """
+        self.cursor.execute(
+            """
+            SELECT s.id FROM vocabulary v
+            INNER JOIN vocabulary s ON s.lemma_key = v.lemma_key AND s.id != v.id
+            WHERE v.id = ?
+        """,
+            (vocabulary_id,),
+        )
+        return [row[0] for row in self.cursor.fetchall()]
+
+    @cached_read("vocabulary", "learning_progress")
+    def get_leech_words(self, limit: Optional[int] = None) -> List[Record]:
+        """取得遺忘次數達 LEECH_THRESHOLD 的單字（以部分索引 idx_leech 讀取）
 
-    def get_words_for_review(self, limit: int = 50) -> List[Dict]:
+        Args:
+            limit: 數量上限，None 表示全部
+
+        Returns:
+            單字列表（含 lapse_count、is_suspended、is_favorite），遺忘次數多者在前
+        """
+        self.cursor.execute(
+            f"""
+            SELECT v.*, lp.lapse_count, lp.is_suspended, lp.is_favorite,
+                   lp.review_count, lp.correct_count
+            FROM learning_progress lp
+            INNER JOIN vocabulary v ON v.id = lp.vocabulary_id
+            WHERE lp.lapse_count >= {LEECH_THRESHOLD}
+            ORDER BY lp.lapse_count DESC
+            LIMIT ?
+        """,
+            (-1 if limit is None else limit,),
+        )
+        return self.cursor.fetchall()
+
+    @write_transaction("learning_progress")
+    def set_suspended(self, vocabulary_id: int, suspended: bool):
+        """暫停或恢復單字的複習
+
+        Args:
+            vocabulary_id: 單字 ID
+            suspended: True 暫停，False 恢復
+        """
+        self.cursor.execute(
+            "UPDATE learning_progress SET is_suspended = ? WHERE vocabulary_id = ?",
+            (1 if suspended else 0, vocabulary_id),
+        )
+
+    @cached_read("learning_progress")
+    def count_due_words(self) -> int:
+        """今天到期（未暫停）的單字數，只掃描部分索引 idx_due，不讀進度與單字資料"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM learning_progress WHERE next_review <= ? AND is_suspended = 0",
+            (day_number.today(),),
+        ).fetchone()
+        return row[0]
+
+    @cached_read("vocabulary", "learning_progress")
+    def get_words_for_review(self, limit: Optional[int] = 50) -> List[Record]:
         """取得待複習的單字
 
         Args:
-            limit: 取得數量上限
+            limit: 取得數量上限，None 表示全部
 
         Returns:
             待複習的單字列表（包含單字資料和學習進度）
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-
         self.cursor.execute(
             """
             SELECT v.*, lp.ease_factor, lp.interval_days, lp.next_review,
                    lp.review_count, lp.correct_count, lp.is_favorite
             FROM vocabulary v
             INNER JOIN learning_progress lp ON v.id = lp.vocabulary_id
-            WHERE lp.next_review <= ?
+            WHERE lp.next_review <= ? AND lp.is_suspended = 0
             ORDER BY lp.next_review ASC, v.level ASC
             LIMIT ?
         """,
-            (today, limit),
+            (day_number.today(), -1 if limit is None else limit),
         )
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
 
-    def get_new_words(self, level: Optional[int] = None, limit: int = 20) -> List[Dict]:
-        """取得尚未學習的新單字
+    def get_review_words_by_ids(self, vocabulary_ids: Sequence[int]) -> List[Record]:
+        """取得指定單字中目前到期的部分（欄位與 get_words_for_review 相同）
+
+        Args:
+            vocabulary_ids: 單字 ID 列表
+
+        Returns:
+            到期且未暫停的單字，不到期或沒有學習進度的單字不會出現
+        """
+        if not vocabulary_ids:
+            return []
+        placeholders = ", ".join("?" * len(vocabulary_ids))
+        self.cursor.execute(
+            f"""
+            SELECT v.*, lp.ease_factor, lp.interval_days, lp.next_review,
+                   lp.review_count, lp.correct_count, lp.is_favorite
+            FROM vocabulary v
+            INNER JOIN learning_progress lp ON v.id = lp.vocabulary_id
+            WHERE v.id IN ({placeholders}) AND lp.next_review <= ? AND lp.is_suspended = 0
+        """,
+            (*vocabulary_ids, day_number.today()),
+        )
+        return self.cursor.fetchall()
+
+    def get_new_words(self, level: Optional[int] = None, limit: int = 20) -> List[Record]:
+        """取得尚未學習的新單字（第一頁）
 
         Args:
             level: 指定級別，None 表示所有級別
@@ -318,31 +1529,69 @@ class VocabularyDatabase:
         Returns:
             新單字列表
         """
+        return self.get_new_words_page(level, after=None, limit=limit)
+
+    @cached_read("vocabulary", "unlearned_words")
+    def get_new_words_page(
+        self,
+        level: Optional[int] = None,
+        after: Optional[Tuple[int, int, int]] = None,
+        limit: int = 20,
+    ) -> List[Record]:
+        """以 keyset 分頁取得尚未學習的新單字
+
+        依 (level, sort_key, id) 排序，sort_key 為頻率排名（常用字在前）。
+        從 after 之後開始讀取，每一頁都是索引上的一段範圍掃描，
+        不會因為已學單字變多而變慢。
+
+        Args:
+            level: 指定級別，None 表示所有級別
+            after: 上一頁最後一筆的 (level, sort_key, id)，None 表示從頭開始
+            limit: 取得數量上限
+
+        Returns:
+            新單字列表（含 sort_key 欄位，可組成下一頁的 after）
+        """
+        conditions = []
+        params: List = []
         if level:
-            self.cursor.execute(
-                """
-                SELECT v.* FROM vocabulary v
-                LEFT JOIN learning_progress lp ON v.id = lp.vocabulary_id
-                WHERE lp.id IS NULL AND v.level = ?
-                ORDER BY v.word
-                LIMIT ?
-            """,
-                (level, limit),
-            )
-        else:
-            self.cursor.execute(
-                """
-                SELECT v.* FROM vocabulary v
-                LEFT JOIN learning_progress lp ON v.id = lp.vocabulary_id
-                WHERE lp.id IS NULL
-                ORDER BY v.level, v.word
-                LIMIT ?
-            """,
-                (limit,),
-            )
+            conditions.append("u.level = ?")
+            params.append(level)
+            if after:
+                conditions.append("(u.sort_key, u.vocabulary_id) > (?, ?)")
+                params.extend(after[1:])
+        elif after:
+            conditions.append("(u.level, u.sort_key, u.vocabulary_id) > (?, ?, ?)")
+            params.extend(after)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        self.cursor.execute(
+            f"""
+            SELECT v.*, u.sort_key FROM unlearned_words u
+            INNER JOIN vocabulary v ON v.id = u.vocabulary_id
+            {where}
+            ORDER BY u.level, u.sort_key, u.vocabulary_id
+            LIMIT ?
+        """,
+            (*params, limit),
+        )
+
+        return self.cursor.fetchall()
+
+    @cached_read("unlearned_words")
+    def count_new_words(self, level: Optional[int] = None) -> int:
+        """計算尚未學習的新單字數量
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        Args:
+            level: 指定級別，None 表示所有級別
+        """
+        if level:
+            self.cursor.execute("SELECT COUNT(*) FROM unlearned_words WHERE level = ?", (level,))
+        else:
+            self.cursor.execute("SELECT COUNT(*) FROM unlearned_words")
+        return self.cursor.fetchone()[0]
 
+    @write_transaction("learning_progress", "unlearned_words")
     def toggle_favorite(self, vocabulary_id: int) -> bool:
         """切換單字的收藏狀態
 
@@ -375,10 +1624,10 @@ class VocabularyDatabase:
             )
             new_status = True
 
-        self.conn.commit()
         return new_status
 
-    def get_favorite_words(self) -> List[Dict]:
+    @cached_read("vocabulary", "learning_progress")
+    def get_favorite_words(self) -> List[Record]:
         """取得所有收藏的單字
 
         Returns:
@@ -393,11 +1642,79 @@ class VocabularyDatabase:
             ORDER BY v.level, v.word
         """)
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
+
+    @cached_read("vocabulary", "learning_progress")
+    def get_favorite_words_page(
+        self,
+        after: Optional[Tuple] = None,
+        limit: int = 50,
+        order: str = "level",
+        keyword: Optional[str] = None,
+    ) -> List[Record]:
+        """以 keyset 分頁取得收藏的單字
+
+        order 為 "level" 時依 (level, word, id) 排序，"word" 時依 (word, id) 排序，
+        都沿 vocabulary 上的索引依序讀取並逐筆比對收藏，讀滿 limit 筆即停止，
+        開啟收藏列表的時間與收藏數量無關。
+
+        Args:
+            after: 上一頁最後一筆的排序鍵（"level"：(level, word, id)，"word"：(word, id)），
+                None 表示從頭開始
+            limit: 取得數量上限
+            order: "level" 或 "word"
+            keyword: 篩選字串；英文比對單字開頭，其他比對翻譯內容
+
+        Returns:
+            收藏的單字列表（short_translation 為截斷至 30 字的翻譯）
+        """
+        if order == "word":
+            columns = ("v.word", "v.id")
+        else:
+            columns = ("v.level", "v.word", "v.id")
+
+        conditions = ["lp.is_favorite = 1"]
+        params: List = []
+        if after:
+            conditions.append(f"({', '.join(columns)}) > ({', '.join('?' * len(columns))})")
+            params.extend(after)
+        if keyword:
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            if keyword.isascii():
+                conditions.append("v.word LIKE ? ESCAPE '\\'")
+                params.append(f"{escaped}%")
+            else:
+                conditions.append("v.translation LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+
+        # CROSS JOIN 固定以 vocabulary 為外層，沿排序索引掃描
+        self.cursor.execute(
+            f"""
+            SELECT v.id, v.word, v.phonetic, v.part_of_speech, v.level,
+                   CASE WHEN length(v.translation) > 30
+                        THEN substr(v.translation, 1, 30) || '...'
+                        ELSE v.translation END AS short_translation,
+                   lp.review_count
+            FROM vocabulary v
+            CROSS JOIN learning_progress lp ON lp.vocabulary_id = v.id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {', '.join(columns)}
+            LIMIT ?
+        """,
+            (*params, limit),
+        )
+
+        return self.cursor.fetchall()
+
+    @cached_read("learning_progress")
+    def count_favorite_words(self) -> int:
+        """計算收藏的單字數量"""
+        self.cursor.execute("SELECT COUNT(*) FROM learning_progress WHERE is_favorite = 1")
+        return self.cursor.fetchone()[0]
 
     def get_random_words_by_level(
         self, level: int, exclude_id: int, limit: int = 10
-    ) -> List[Dict]:
+    ) -> List[Record]:
         """取得指定級別的隨機單字（用於生成干擾選項）
 
         Args:
@@ -418,11 +1735,11 @@ class VocabularyDatabase:
             (level, exclude_id, limit),
         )
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
 
     def get_random_words_nearby_level(
         self, level: int, exclude_id: int, limit: int = 10
-    ) -> List[Dict]:
+    ) -> List[Record]:
         """取得相鄰級別的隨機單字（level ± 1）
 
         Args:
@@ -446,8 +1763,30 @@ class VocabularyDatabase:
             (min_level, max_level, exclude_id, limit),
         )
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self.cursor.fetchall()
 
+    def get_distractor_pool(self, levels: List[int]) -> List[Record]:
+        """一次取得多個級別的全部單字（批次產生選擇題的干擾選項池）
+
+        Args:
+            levels: 級別列表
+
+        Returns:
+            (id, word, phonetic, part_of_speech, translation, level)
+        """
+        if not levels:
+            return []
+        placeholders = ", ".join("?" * len(levels))
+        return self.conn.execute(
+            f"""
+            SELECT id, word, phonetic, part_of_speech, translation, level
+            FROM vocabulary
+            WHERE level IN ({placeholders})
+        """,
+            list(levels),
+        ).fetchall()
+
+    @cached_read("vocabulary", "learning_progress", "study_sessions")
     def get_learning_statistics(self) -> Dict:
         """取得學習統計資訊
 
@@ -465,15 +1804,8 @@ class VocabularyDatabase:
         stats["learned_words"] = self.cursor.fetchone()["learned"]
 
         # 待複習單字數
-        today = datetime.now().strftime("%Y-%m-%d")
-        self.cursor.execute(
-            """
-            SELECT COUNT(*) as due FROM learning_progress
-            WHERE next_review <= ?
-        """,
-            (today,),
-        )
-        stats["due_words"] = self.cursor.fetchone()["due"]
+        today = day_number.today()
+        stats["due_words"] = self.count_due_words()
 
         # 收藏單字數
         self.cursor.execute("""
@@ -482,6 +1814,13 @@ class VocabularyDatabase:
         """)
         stats["favorite_words"] = self.cursor.fetchone()["favorites"]
 
+        # 難以記住（leech）的單字數
+        self.cursor.execute(f"""
+            SELECT COUNT(*) as leeches FROM learning_progress
+            WHERE lapse_count >= {LEECH_THRESHOLD}
+        """)
+        stats["leech_words"] = self.cursor.fetchone()["leeches"]
+
         # 各級別學習進度
         self.cursor.execute("""
             SELECT v.level,
@@ -503,7 +1842,6 @@ class VocabularyDatabase:
         ]
 
         # 今日學習統計
-        today = datetime.now().strftime("%Y-%m-%d")
         self.cursor.execute(
             """
             SELECT * FROM study_sessions WHERE date = ?
@@ -519,91 +1857,288 @@ class VocabularyDatabase:
                 "reviewed_words": 0,
                 "correct_count": 0,
                 "total_count": 0,
+                "study_time_seconds": 0,
             }
         )
 
-        # 連續學習天數
-        self.cursor.execute("""
+        # 連續學習天數（逐列讀取，遇到中斷即停止）
+        days = self.conn.execute(
+            """
             SELECT date FROM study_sessions
+            WHERE date <= ?
             ORDER BY date DESC
-        """)
-        dates = [row["date"] for row in self.cursor.fetchall()]
-        stats["streak_days"] = self._calculate_streak(dates)
+        """,
+            (today,),
+        )
+        stats["streak_days"] = self._calculate_streak(row[0] for row in days)
 
         return stats
 
-    def _calculate_streak(self, dates: List[str]) -> int:
+    def _calculate_streak(self, days: Iterator[int]) -> int:
         """計算連續學習天數
 
         Args:
-            dates: 日期列表 (降序排列)
+            days: 日序數 (降序排列)
 
         Returns:
             連續天數
         """
-        if not dates:
-            return 0
-
         streak = 0
-        expected_date = datetime.now().date()
+        expected_day = day_number.today()
 
-        for date_str in dates:
-            date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-            if date == expected_date:
+        for day in days:
+            if day == expected_day:
                 streak += 1
-                expected_date -= timedelta(days=1)
-            elif date < expected_date:
+                expected_day -= 1
+            elif day < expected_day:
                 break
 
         return streak
 
+    def get_next_review_date(self, vocabulary_id: int) -> Optional[date]:
+        """取得單字的下次複習日期
+
+        Args:
+            vocabulary_id: 單字 ID
+
+        Returns:
+            下次複習日期，尚未排程則返回 None
+        """
+        row = self.conn.execute(
+            "SELECT next_review FROM learning_progress WHERE vocabulary_id = ?",
+            (vocabulary_id,),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return day_number.to_date(row[0])
+
+    def get_review_forecast(self, days: int = 30) -> Dict[int, int]:
+        """取得未來每日到期的單字數（已過期的計入今天）
+
+        Args:
+            days: 預測天數
+
+        Returns:
+            {距今天數: 到期數}
+        """
+        today = day_number.today()
+        self.cursor.execute(
+            """
+            SELECT MAX(next_review - ?, 0) AS offset, COUNT(*) AS count
+            FROM learning_progress
+            WHERE next_review < ? AND is_suspended = 0
+            GROUP BY offset
+        """,
+            (today, today + days),
+        )
+        forecast = {offset: 0 for offset in range(days)}
+        for row in self.cursor.fetchall():
+            forecast[row["offset"]] = row["count"]
+        return forecast
+
+    @cached_read("daily_plan")
+    def has_daily_plan(self, plan_day: int) -> bool:
+        """指定日期是否已建立學習計畫"""
+        self.cursor.execute("SELECT 1 FROM daily_plan WHERE plan_day = ? LIMIT 1", (plan_day,))
+        return self.cursor.fetchone() is not None
+
+    @write_transaction("daily_plan")
+    def save_daily_plan(self, plan_day: int, entries: List[Tuple[int, str]]):
+        """寫入一天的學習計畫，並清除之前的計畫
+
+        Args:
+            plan_day: 計畫日期（日序數）
+            entries: 依出題順序排列的 (vocabulary_id, kind)，kind 為 "review" 或 "new"
+        """
+        self.cursor.execute("DELETE FROM daily_plan WHERE plan_day <= ?", (plan_day,))
+        self.cursor.executemany(
+            """
+            INSERT INTO daily_plan (plan_day, position, vocabulary_id, kind)
+            VALUES (?, ?, ?, ?)
+        """,
+            [
+                (plan_day, position, vocabulary_id, kind)
+                for position, (vocabulary_id, kind) in enumerate(entries)
+            ],
+        )
+
+    @cached_read("daily_plan", "vocabulary", "learning_progress")
+    def get_daily_plan(self, plan_day: int, limit: Optional[int] = None) -> List[Record]:
+        """取得計畫中尚未完成的單字（依出題順序）
+
+        Args:
+            plan_day: 計畫日期（日序數）
+            limit: 取得數量上限，None 表示全部
+
+        Returns:
+            單字列表（包含學習進度與 kind 欄位）
+        """
+        self.cursor.execute(
+            """
+            SELECT v.*, lp.ease_factor, lp.interval_days, lp.next_review,
+                   lp.review_count, lp.correct_count, lp.is_favorite, dp.kind
+            FROM daily_plan dp
+            INNER JOIN vocabulary v ON v.id = dp.vocabulary_id
+            LEFT JOIN learning_progress lp ON lp.vocabulary_id = dp.vocabulary_id
+            WHERE dp.plan_day = ? AND dp.done = 0
+            ORDER BY dp.position
+            LIMIT ?
+        """,
+            (plan_day, -1 if limit is None else limit),
+        )
+        return self.cursor.fetchall()
+
+    @write_transaction("daily_plan")
+    def mark_plan_done(self, plan_day: int, vocabulary_id: int):
+        """將計畫中的單字標記為完成（不在計畫中時不做任何事）"""
+        self.cursor.execute(
+            "UPDATE daily_plan SET done = 1 WHERE plan_day = ? AND vocabulary_id = ?",
+            (plan_day, vocabulary_id),
+        )
+
+    @cached_read("study_weekly")
+    def get_weekly_rollups(self, weeks: int = 53) -> List[Record]:
+        """取得最近幾週（含本週）的學習統計彙總
+
+        Args:
+            weeks: 週數
+
+        Returns:
+            依 week_start 排序的彙總列（沒有學習記錄的週不會出現）
+        """
+        today = day_number.today()
+        this_week = today - (today + 3) % 7
+        self.cursor.execute(
+            "SELECT * FROM study_weekly WHERE week_start > ? ORDER BY week_start",
+            (this_week - weeks * 7,),
+        )
+        return self.cursor.fetchall()
+
+    @cached_read("study_monthly")
+    def get_monthly_rollups(self, months: int = 12) -> List[Record]:
+        """取得最近幾個月（含本月）的學習統計彙總
+
+        Args:
+            months: 月數
+
+        Returns:
+            依 month（YYYY-MM）排序的彙總列（沒有學習記錄的月份不會出現）
+        """
+        today = date.today()
+        index = today.year * 12 + today.month - months
+        first = f"{index // 12:04d}-{index % 12 + 1:02d}"
+        self.cursor.execute(
+            "SELECT * FROM study_monthly WHERE month >= ? ORDER BY month", (first,)
+        )
+        return self.cursor.fetchall()
+
+    @cached_read("vocabulary", "learning_progress")
+    def get_response_time_stats(self, slowest: int = 5) -> Dict:
+        """取得每張卡片的作答時間統計
+
+        Args:
+            slowest: 列出平均作答時間最長的單字數
+
+        Returns:
+            {"average_ms": 所有計時作答的平均毫秒數（沒有記錄時為 None）,
+             "timed_cards": 有計時記錄的單字數,
+             "slowest": 平均作答最慢的單字（含 average_ms 欄位）}
+        """
+        self.cursor.execute("""
+            SELECT SUM(response_ms_total) AS total, SUM(response_count) AS answers,
+                   COUNT(*) AS cards
+            FROM learning_progress WHERE response_count > 0
+        """)
+        row = self.cursor.fetchone()
+        self.cursor.execute(
+            """
+            SELECT v.id, v.word, v.translation,
+                   lp.response_ms_total / lp.response_count AS average_ms
+            FROM learning_progress lp
+            INNER JOIN vocabulary v ON v.id = lp.vocabulary_id
+            WHERE lp.response_count > 0
+            ORDER BY average_ms DESC
+            LIMIT ?
+        """,
+            (slowest,),
+        )
+        return {
+            "average_ms": row["total"] // row["answers"] if row["answers"] else None,
+            "timed_cards": row["cards"],
+            "slowest": self.cursor.fetchall(),
+        }
+
+    @write_transaction("study_sessions", "study_weekly", "study_monthly")
     def record_study_session(
         self,
         new_words: int = 0,
         reviewed_words: int = 0,
         correct: int = 0,
         total: int = 0,
+        study_seconds: int = 0,
     ):
-        """記錄今日學習統計
+        """記錄今日學習統計（週、月彙總由觸發器同步累加）
 
         Args:
             new_words: 新學單字數
             reviewed_words: 複習單字數
             correct: 答對數
             total: 總測驗數
+            study_seconds: 作答時間（秒）
         """
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = day_number.today()
 
         self.cursor.execute(
             """
-            INSERT INTO study_sessions (date, new_words, reviewed_words, correct_count, total_count)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO study_sessions
+            (date, new_words, reviewed_words, correct_count, total_count, study_time_seconds)
+            VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(date) DO UPDATE SET
-                new_words = new_words + ?,
-                reviewed_words = reviewed_words + ?,
-                correct_count = correct_count + ?,
-                total_count = total_count + ?
+                new_words = new_words + excluded.new_words,
+                reviewed_words = reviewed_words + excluded.reviewed_words,
+                correct_count = correct_count + excluded.correct_count,
+                total_count = total_count + excluded.total_count,
+                study_time_seconds = COALESCE(study_time_seconds, 0) + excluded.study_time_seconds
         """,
-            (
-                today,
-                new_words,
-                reviewed_words,
-                correct,
-                total,
-                new_words,
-                reviewed_words,
-                correct,
-                total,
-            ),
+            (today, new_words, reviewed_words, correct, total, study_seconds),
         )
 
-        self.conn.commit()
+
+def open_database(
+    db_path: str = "data/vocabulary.db",
+    catalogue_path: Optional[str] = DEFAULT_CATALOGUE_PATH,
+    **options,
+) -> VocabularyDatabase:
+    """開啟資料庫連線；拆分過的資料庫會掛載唯讀單字庫
+
+    開啟既有資料庫的工具都應經由此函式，拆分後才能讀到 vocabulary。
+
+    Args:
+        db_path: 資料庫路徑
+        catalogue_path: 唯讀單字庫路徑（None 表示只使用單檔模式）
+        **options: 其餘 VocabularyDatabase 參數（busy_timeout、wal、leech_action）
+
+    Returns:
+        已連線的 VocabularyDatabase
+
+    Raises:
+        MissingVocabularyError: 資料庫沒有 vocabulary 表，單字庫也不存在
+            （例如拆分後遺失 catalogue.db），避免查詢默默得到 0 筆或缺表錯誤
+    """
+    db = VocabularyDatabase(db_path, catalogue_path=catalogue_path, **options)
+    db.connect()
+    if not db.catalogue_attached and not db._has_local_vocabulary():
+        db.close()
+        raise MissingVocabularyError(
+            f"{db_path} has no vocabulary table and the catalogue "
+            f"{catalogue_path or '(none)'} could not be attached"
+        )
+    return db
 
 
 if __name__ == "__main__":
     # 測試資料庫建立
-    db = VocabularyDatabase()
+    db = VocabularyDatabase(catalogue_path=DEFAULT_CATALOGUE_PATH)
     db.initialize_schema()
 
     # 顯示統計
@@ -0,0 +1,40 @@
+"""
+日序數日期
+以「距 1970-01-01 的天數」整數表示日期，
+讓到期比較、分布統計與連續天數計算都是整數運算
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def today() -> int:
+    """今天（本地時區）的日序數"""
+    return date.today().toordinal() - _EPOCH_ORDINAL
+
+
+def from_date(value: date) -> int:
+    """date 轉日序數"""
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def to_date(day: int) -> date:
+    """日序數轉 date"""
+    return date.fromordinal(day + _EPOCH_ORDINAL)
+
+
+def from_iso(value: Optional[str]) -> Optional[int]:
+    """YYYY-MM-DD 字串轉日序數（已是整數時原樣返回）"""
+    if value is None or isinstance(value, int):
+        return value
+    return from_date(date.fromisoformat(value[:10]))
+
+
+def to_iso(day: Optional[int]) -> Optional[str]:
+    """日序數轉 YYYY-MM-DD 字串（僅用於顯示與對外格式）"""
+    if day is None:
+        return None
+    return (EPOCH + timedelta(days=day)).isoformat()
@@ -0,0 +1,107 @@
+"""
+單字頻率排名
+依內附的常用字頻率表批次計算 vocabulary.frequency_rank，
+讓新單字依使用頻率（而非字母順序）出題
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from database import ReadOnlyVocabularyError, VocabularyDatabase, open_database
+
+DEFAULT_FREQUENCY_LIST = Path(__file__).parent.parent / "data" / "word_frequency.txt"
+
+_HOMOGRAPH_SUFFIX = re.compile(r"\s*\(\d+\)$")
+
+
+def headword(word: str) -> str:
+    """取得查表用的字頭（去除同形異義字編號如 "arm (1)"，轉小寫）"""
+    return _HOMOGRAPH_SUFFIX.sub("", word).strip().lower()
+
+
+def _lookup(frequency: Dict[str, int], word: str, default: int) -> int:
+    """查詢單字名次，"Miss/miss" 這類並列寫法取各寫法中最前面的名次"""
+    return min(frequency.get(variant.strip(), default) for variant in headword(word).split("/"))
+
+
+def load_frequency_list(path: Path = DEFAULT_FREQUENCY_LIST) -> Dict[str, int]:
+    """讀取頻率表（一行一字，# 開頭為註解）
+
+    Returns:
+        單字 → 名次（從 1 開始，重複出現的單字以第一次為準）
+    """
+    ranks: Dict[str, int] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith("#") and word not in ranks:
+                ranks[word] = len(ranks) + 1
+    return ranks
+
+
+def compute_ranks(rows: List[Tuple[int, str]], frequency: Dict[str, int]) -> List[Tuple[int, int]]:
+    """計算所有單字的排名
+
+    頻率表中的單字依名次排序，其餘排在後面並依字母順序；
+    同一字頭的同形異義字依 id 相鄰。
+
+    Args:
+        rows: (id, word)
+        frequency: load_frequency_list() 的結果
+
+    Returns:
+        (frequency_rank, id)，排名從 1 開始且不重複
+    """
+    unlisted = len(frequency) + 1
+    ordered = sorted(
+        rows,
+        key=lambda row: (_lookup(frequency, row[1], unlisted), headword(row[1]), row[0]),
+    )
+    return [(rank, vocabulary_id) for rank, (vocabulary_id, _) in enumerate(ordered, start=1)]
+
+
+def apply_frequency_ranks(db: VocabularyDatabase, path: Path = DEFAULT_FREQUENCY_LIST) -> Dict:
+    """重新計算並寫入全部單字的 frequency_rank（單一交易）
+
+    Returns:
+        統計資訊（單字總數、頻率表命中數）
+
+    Raises:
+        ReadOnlyVocabularyError: 單字由唯讀單字庫提供
+    """
+    db.require_writable_vocabulary()
+    frequency = load_frequency_list(path)
+    rows = [(row["id"], row["word"]) for row in db.conn.execute("SELECT id, word FROM vocabulary")]
+    ranks = compute_ranks(rows, frequency)
+
+    with db.batch():
+        db.conn.executemany("UPDATE vocabulary SET frequency_rank = ? WHERE id = ?", ranks)
+
+    unlisted = len(frequency) + 1
+    matched = sum(1 for _, word in rows if _lookup(frequency, word, unlisted) < unlisted)
+    return {"total": len(rows), "matched": matched}
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="依頻率表計算單字排名")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--list", default=str(DEFAULT_FREQUENCY_LIST), help="頻率表路徑")
+    args = parser.parse_args(argv)
+
+    db = open_database(args.db)
+    try:
+        result = apply_frequency_ranks(db, Path(args.list))
+    except ReadOnlyVocabularyError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    print(f"✓ 已更新 {result['total']} 個單字的頻率排名（頻率表命中 {result['matched']} 個）")
+
+
+if __name__ == "__main__":
+    main()
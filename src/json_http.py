@@ -0,0 +1,260 @@
+"""
+輕量 JSON HTTP 伺服器
+以 asyncio 串流實作的最小 HTTP/1.1 伺服器（支援 keep-alive），
+供無介面的學習服務與同步服務共用，不需要額外的 Web 框架
+"""
+
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+MAX_BODY_BYTES = 1024 * 1024  # 請求內容上限 1 MB
+MAX_HEADER_LINES = 100
+
+
+class HTTPError(Exception):
+    """處理請求時回傳給客戶端的錯誤（格式與 Workers API 相同）"""
+
+    def __init__(self, status: int, error: str, message: str = ""):
+        super().__init__(message or error)
+        self.status = status
+        self.error = error
+        self.message = message
+
+    def to_payload(self) -> Dict:
+        payload = {"error": self.error}
+        if self.message:
+            payload["message"] = self.message
+        return payload
+
+
+class Request:
+    """已解析的 HTTP 請求"""
+
+    __slots__ = ("method", "path", "query", "headers", "body", "params")
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: bytes,
+    ):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.params: Dict[str, str] = {}  # 路徑參數，例如 /check/:tag
+
+    def json(self) -> Any:
+        """解析 JSON 內容
+
+        Raises:
+            HTTPError: 內容不是合法的 JSON
+        """
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "INVALID_JSON", "Request body is not valid JSON")
+
+    def query_int(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """取得整數查詢參數"""
+        value = self.query.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(400, "INVALID_PARAMETER", f"{name} must be an integer")
+
+
+# 處理函式回傳 payload（狀態碼 200）或 (狀態碼, payload)
+Handler = Callable[[Request], Awaitable[Any]]
+
+
+class JSONServer:
+    """以路由表分派請求的 JSON HTTP 伺服器"""
+
+    def __init__(self):
+        """初始化路由表"""
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._prefix_routes: Dict[Tuple[str, str], Tuple[str, Handler]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def route(self, method: str, path: str) -> Callable[[Handler], Handler]:
+        """註冊路由的裝飾器
+
+        路徑結尾為 "/:name" 時視為前綴路由，最後一段存入 request.params[name]
+
+        Args:
+            method: HTTP 方法
+            path: 路徑
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            if "/:" in path:
+                prefix, name = path.rsplit("/:", 1)
+                self._prefix_routes[(method.upper(), prefix)] = (name, handler)
+            else:
+                self._routes[(method.upper(), path)] = handler
+            return handler
+
+        return decorator
+
+    def _resolve(self, request: Request) -> Handler:
+        """找出請求對應的處理函式"""
+        handler = self._routes.get((request.method, request.path))
+        if handler:
+            return handler
+
+        prefix, _, last = request.path.rpartition("/")
+        entry = self._prefix_routes.get((request.method, prefix))
+        if entry and last:
+            name, handler = entry
+            request.params[name] = last
+            return handler
+
+        known_paths = {p for _, p in self._routes}
+        if request.path in known_paths:
+            raise HTTPError(405, "METHOD_NOT_ALLOWED")
+        raise HTTPError(404, "NOT_FOUND", f"No route for {request.path}")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8787) -> asyncio.AbstractServer:
+        """開始監聽連線
+
+        Args:
+            host: 綁定位址
+            port: 連接埠（0 表示自動分配）
+
+        Returns:
+            asyncio 伺服器物件
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_BODY_BYTES
+        )
+        return self._server
+
+    @property
+    def port(self) -> int:
+        """實際監聽的連接埠"""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """停止接受新連線"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """處理單一連線上的所有請求（HTTP/1.1 keep-alive）"""
+        try:
+            while True:
+                try:
+                    request, keep_alive = await self._read_request(reader)
+                except HTTPError as e:
+                    self._write_response(writer, e.status, e.to_payload(), False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                try:
+                    result = await self._resolve(request)(request)
+                    status, payload = result if isinstance(result, tuple) else (200, result)
+                except HTTPError as e:
+                    status, payload = e.status, e.to_payload()
+                except Exception as e:
+                    status = 500
+                    payload = {"error": "INTERNAL_ERROR", "message": str(e)}
+
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[Optional[Request], bool]:
+        """讀取並解析一個請求
+
+        Returns:
+            (請求物件, 是否保持連線)；連線已關閉時請求為 None
+        """
+        request_line = await self._read_line(reader, 414, "URI_TOO_LONG")
+        if not request_line:
+            return None, False
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "BAD_REQUEST", "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._read_line(reader, 431, "HEADERS_TOO_LARGE")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(431, "HEADERS_TOO_LARGE")
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "BAD_REQUEST", "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "PAYLOAD_TOO_LARGE")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+
+        request = Request(
+            method.upper(), url.path, dict(parse_qsl(url.query)), headers, body
+        )
+        return request, keep_alive
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, status: int, error: str) -> bytes:
+        """讀取一行；超過串流上限（limit）時回傳 status 錯誤而不是中斷連線
+
+        Raises:
+            HTTPError: 單行長度超過上限
+        """
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            # readline 把 LimitOverrunError 轉成 ValueError
+            raise HTTPError(status, error, "Line exceeds the size limit")
+
+    @staticmethod
+    def _write_response(
+        writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool
+    ):
+        """寫出 JSON 回應"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
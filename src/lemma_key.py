@@ -0,0 +1,23 @@
+"""
+詞條鍵
+把同一個字頭的不同詞條（同形異義字 "arm (1)"、"arm (2)"，
+或同一單字的不同詞性）正規化成相同的鍵，出題時據此避開兄弟詞條
+"""
+
+import re
+
+_HOMOGRAPH_SUFFIX = re.compile(r"\s*\(\d+\)$")
+
+
+def lemma_key(word: str) -> str:
+    """計算單字的詞條鍵
+
+    去除同形異義字編號並轉小寫；"Miss/miss" 這類並列寫法取第一個拼法。
+
+    Args:
+        word: 英文單字
+
+    Returns:
+        詞條鍵
+    """
+    return _HOMOGRAPH_SUFFIX.sub("", word).split("/")[0].strip().lower()
@@ -0,0 +1,137 @@
+"""
+發音鍵
+以 Metaphone 規則將英文拼字轉成子音骨架（例如 phone、fone → FN），
+讓聽過但不會拼的單字也能以「聽起來像」的拼法找到
+"""
+
+import re
+from typing import List
+
+# 發音鍵最長字元數（只比對前幾個子音已足以區分，也讓結尾拼錯不影響）
+MAX_KEY_LENGTH = 6
+
+_VOWELS = frozenset("AEIOU")
+_FRONT_VOWELS = frozenset("EIY")
+_NON_LETTERS = re.compile(r"[^A-Z]")
+_HOMOGRAPH_SUFFIX = re.compile(r"\s*\(\d+\)$")
+
+
+def phonetic_key(word: str, max_length: int = MAX_KEY_LENGTH) -> str:
+    """計算單字的發音鍵（簡化版 Metaphone）
+
+    只保留字首母音（一律記為 A），子音依發音規則合併：
+    PH→F、CK→K、SH/CH/TIO/CIA→X、TH→0、DGE→J、GH 在子音前不發音等。
+    "arm (1)" 與 "Miss/miss" 取第一個拼法的字頭計算。
+
+    Args:
+        word: 英文單字
+        max_length: 發音鍵最長字元數
+
+    Returns:
+        發音鍵（大寫），沒有英文字母時回傳空字串
+    """
+    w = _NON_LETTERS.sub("", _HOMOGRAPH_SUFFIX.sub("", word).split("/")[0].upper())
+    if not w:
+        return ""
+
+    # 字首特例
+    if w[:2] in ("AE", "GN", "KN", "PN", "WR"):
+        w = w[1:]
+    elif w[0] == "X":
+        w = "S" + w[1:]
+    elif w[:2] == "WH":
+        w = "W" + w[2:]
+
+    n = len(w)
+    key: List[str] = []
+    i = 0
+    while i < n and len(key) < max_length:
+        c = w[i]
+        prev = w[i - 1] if i > 0 else ""
+        nxt = w[i + 1] if i + 1 < n else ""
+        nxt2 = w[i + 2] if i + 2 < n else ""
+        step = 1
+
+        if c == prev and c != "C":
+            pass  # 重複字母只算一次
+        elif c in _VOWELS:
+            if i == 0:
+                key.append("A")
+        elif c == "B":
+            if not (prev == "M" and i == n - 1):  # 字尾 MB 的 B 不發音
+                key.append("B")
+        elif c == "C":
+            if nxt == "I" and nxt2 == "A":
+                key.append("X")
+            elif nxt == "H":
+                key.append("K" if prev == "S" else "X")
+                step = 2
+            elif nxt in _FRONT_VOWELS:
+                if prev != "S":  # SCE、SCI、SCY 的 C 不發音
+                    key.append("S")
+            else:
+                key.append("K")
+        elif c == "D":
+            if nxt == "G" and nxt2 in _FRONT_VOWELS:
+                key.append("J")
+                step = 2
+            else:
+                key.append("T")
+        elif c == "G":
+            if nxt == "H":
+                if i == 0:
+                    key.append("K")
+                elif nxt2 in _VOWELS:
+                    key.append("K")
+                # 其餘 GH 不發音（night、though）
+                step = 2
+            elif nxt == "N" and (i + 2 == n or w[i + 2:] == "ED"):
+                pass  # sign、signed 的 G 不發音
+            elif nxt in _FRONT_VOWELS:
+                key.append("J")
+            else:
+                key.append("K")
+        elif c == "H":
+            if nxt in _VOWELS and prev not in ("C", "G", "P", "S", "T"):
+                key.append("H")
+        elif c == "K":
+            if prev != "C":
+                key.append("K")
+        elif c == "P":
+            if nxt == "H":
+                key.append("F")
+                step = 2
+            else:
+                key.append("P")
+        elif c == "Q":
+            key.append("K")
+        elif c == "S":
+            if nxt == "H":
+                key.append("X")
+                step = 2
+            elif nxt == "I" and nxt2 in ("O", "A"):
+                key.append("X")
+            else:
+                key.append("S")
+        elif c == "T":
+            if nxt == "I" and nxt2 in ("O", "A"):
+                key.append("X")
+            elif nxt == "H":
+                key.append("0")
+                step = 2
+            elif not (nxt == "C" and nxt2 == "H"):  # TCH 的 T 不發音
+                key.append("T")
+        elif c == "V":
+            key.append("F")
+        elif c in ("W", "Y"):
+            if nxt in _VOWELS:
+                key.append(c)
+        elif c == "X":
+            key.append("KS")
+        elif c == "Z":
+            key.append("S")
+        else:  # F J L M N R
+            key.append(c)
+        i += step
+
+    return "".join(key)[:max_length]
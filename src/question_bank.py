@@ -0,0 +1,210 @@
+"""
+選擇題題庫
+一次讀取干擾選項池，批次產生整個學習階段的選擇題；
+題目只記錄選項的單字 ID 與正確答案位置，切換題目時不需查詢資料庫
+"""
+
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database import VocabularyDatabase
+
+OPTION_COUNT = 4  # 每題選項數（含正確答案）
+QUESTION_TYPES = ("mc_en2zh", "mc_zh2en")  # 題型編號 → 題型名稱
+
+# 抽干擾選項時的重抽次數上限（遇到重複或同義選項時重抽）
+_DRAW_ATTEMPTS = 8
+
+# (word, phonetic, part_of_speech, translation)
+WordText = Tuple[str, str, str, str]
+
+
+class QuestionBank:
+    """預先產生的選擇題
+
+    每題以 OPTION_COUNT 個單字 ID（array）加上題型與正確位置（bytearray）儲存，
+    單字文字只在 _words 存一份，題目多時也只佔少量記憶體。
+    """
+
+    def __init__(self):
+        self._words: Dict[int, WordText] = {}
+        self._slots: Dict[int, int] = {}  # 單字 ID → 題目序號
+        self._options = array("i")
+        self._types = bytearray()
+        self._correct = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __contains__(self, vocabulary_id: int) -> bool:
+        return vocabulary_id in self._slots
+
+    def add(
+        self,
+        vocabulary_id: int,
+        option_ids: Sequence[int],
+        correct_index: int,
+        question_type: int,
+    ):
+        """加入一題（同一單字重複加入時覆蓋）
+
+        Args:
+            vocabulary_id: 題目單字 ID
+            option_ids: 選項單字 ID（長度為 OPTION_COUNT）
+            correct_index: 正確答案在選項中的位置
+            question_type: QUESTION_TYPES 的索引
+        """
+        slot = self._slots.get(vocabulary_id)
+        if slot is None:
+            self._slots[vocabulary_id] = len(self._types)
+            self._options.extend(option_ids)
+            self._types.append(question_type)
+            self._correct.append(correct_index)
+        else:
+            start = slot * OPTION_COUNT
+            self._options[start:start + OPTION_COUNT] = array("i", option_ids)
+            self._types[slot] = question_type
+            self._correct[slot] = correct_index
+
+    def question(self, vocabulary_id: int) -> Optional[Dict]:
+        """取得單字的選擇題
+
+        Returns:
+            與 QuizEngine.generate_multiple_choice_question() 相同格式的字典，
+            另含 'option_ids'；題庫中沒有此單字時回傳 None
+        """
+        slot = self._slots.get(vocabulary_id)
+        if slot is None:
+            return None
+
+        start = slot * OPTION_COUNT
+        option_ids = list(self._options[start:start + OPTION_COUNT])
+        question_type = QUESTION_TYPES[self._types[slot]]
+        correct_index = self._correct[slot]
+
+        word, phonetic, part_of_speech, translation = self._words[vocabulary_id]
+        if question_type == "mc_en2zh":
+            question = f"{word}\n[{phonetic}]\n{part_of_speech}"
+            options = [self._words[i][3] for i in option_ids]
+        else:
+            question = translation
+            options = [self._words[i][0] for i in option_ids]
+
+        return {
+            "type": question_type,
+            "question": question,
+            "options": options,
+            "option_ids": option_ids,
+            "correct_answer": options[correct_index],
+            "correct_index": correct_index,
+        }
+
+
+def _nearby_levels(level: int) -> List[int]:
+    """相鄰級別（level ± 1，限制在 1-6）"""
+    return list(range(max(1, level - 1), min(6, level + 1) + 1))
+
+
+def _draw(
+    rng: random.Random,
+    candidates: List[int],
+    chosen: List[int],
+    seen_text: set,
+    text_of,
+    count: int,
+):
+    """從候選 ID 隨機抽出不重複、顯示文字也不相同的干擾選項（直接加入 chosen）"""
+    if not candidates:
+        return
+    for _ in range(count * _DRAW_ATTEMPTS):
+        if len(chosen) >= count:
+            return
+        candidate = candidates[rng.randrange(len(candidates))]
+        text = text_of(candidate)
+        if text in seen_text:
+            continue
+        seen_text.add(text)
+        chosen.append(candidate)
+
+
+def build_question_bank(
+    db: VocabularyDatabase,
+    cards: List[Dict],
+    mode: str = "mixed",
+    seed: Optional[int] = None,
+) -> QuestionBank:
+    """一次批次產生所有卡片的選擇題
+
+    只查詢一次資料庫（卡片所在級別及相鄰級別的全部單字），
+    之後干擾選項都在記憶體中抽取：優先同級別，不足時從相鄰級別補充，
+    並排除與正確答案顯示文字相同的選項。
+
+    Args:
+        db: 已連接的資料庫
+        cards: 卡片（需含 id 與 level）
+        mode: "mc_en2zh"、"mc_zh2en" 或 "mixed"（每題隨機）
+        seed: 亂數種子（測試用）
+
+    Returns:
+        QuestionBank
+    """
+    rng = random.Random(seed)
+    bank = QuestionBank()
+    if not cards:
+        return bank
+
+    levels = sorted({level for card in cards for level in _nearby_levels(card["level"])})
+    by_level: Dict[int, List[int]] = {level: [] for level in levels}
+    for row in db.get_distractor_pool(levels):
+        vocabulary_id = row["id"]
+        bank._words[vocabulary_id] = (
+            row["word"],
+            row["phonetic"] or "",
+            row["part_of_speech"] or "",
+            row["translation"],
+        )
+        by_level[row["level"]].append(vocabulary_id)
+
+    nearby_pools: Dict[int, List[int]] = {}
+    distractor_count = OPTION_COUNT - 1
+
+    for card in cards:
+        vocabulary_id = card["id"]
+        if vocabulary_id not in bank._words:
+            continue
+
+        if mode == "mixed":
+            question_type = rng.randrange(len(QUESTION_TYPES))
+        else:
+            question_type = QUESTION_TYPES.index(mode)
+        field = 3 if QUESTION_TYPES[question_type] == "mc_en2zh" else 0
+
+        def text_of(i: int, field: int = field) -> str:
+            return bank._words[i][field].strip().lower()
+
+        chosen: List[int] = []
+        seen_text = {text_of(vocabulary_id)}
+
+        # 策略 1: 相同級別
+        _draw(rng, by_level.get(card["level"], []), chosen, seen_text, text_of, distractor_count)
+
+        # 策略 2: 不足時從相鄰級別補充
+        if len(chosen) < distractor_count:
+            pool = nearby_pools.get(card["level"])
+            if pool is None:
+                pool = [i for level in _nearby_levels(card["level"]) for i in by_level.get(level, [])]
+                nearby_pools[card["level"]] = pool
+            _draw(rng, pool, chosen, seen_text, text_of, distractor_count)
+
+        if len(chosen) < distractor_count:
+            continue  # 單字太少，無法出題
+
+        correct_index = rng.randrange(OPTION_COUNT)
+        chosen.insert(correct_index, vocabulary_id)
+        bank.add(vocabulary_id, chosen, correct_index, question_type)
+
+    # 只保留題目用到的單字文字
+    used = set(bank._options)
+    bank._words = {i: text for i, text in bank._words.items() if i in used}
+    return bank
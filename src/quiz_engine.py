@@ -4,11 +4,31 @@
 """
 
 import random
+import threading
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
 
-from database import VocabularyDatabase
-from srs_algorithm import SM2Algorithm
+import day_number
+from answer_matcher import direction_of, get_matcher
+from database import (
+    DEFAULT_BUSY_TIMEOUT,
+    DEFAULT_CATALOGUE_PATH,
+    LEECH_THRESHOLD,
+    Record,
+    VocabularyDatabase,
+    is_lapse,
+    open_database,
+)
+from question_bank import QuestionBank, build_question_bank
+from review_queue import ReviewQueue
+from srs_algorithm import MAX_RESPONSE_MS, SM2Algorithm
+from word_index import WordIndex, load_word_index
+
+# 每日學習計畫預設加入的新單字數量
+DEFAULT_NEW_PER_DAY = 20
+
+# 學習畫面可以撤回的作答數（最近幾題先留在記憶體，超出時較舊的作答一次寫入）
+DEFAULT_UNDO_WINDOW = 3
 
 
 class QuizMode(Enum):
@@ -22,39 +42,207 @@ class QuizMode(Enum):
 class QuizEngine:
     """測驗引擎"""
 
-    def __init__(self, db_path: str = "data/vocabulary.db"):
+    def __init__(
+        self,
+        db_path: str = "data/vocabulary.db",
+        new_per_day: int = DEFAULT_NEW_PER_DAY,
+        busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+        wal: bool = True,
+        catalogue_path: Optional[str] = DEFAULT_CATALOGUE_PATH,
+        undo_window: int = 0,
+    ):
         """初始化測驗引擎
 
         Args:
             db_path: 資料庫路徑
+            new_per_day: 每日學習計畫加入的新單字數量上限
+            busy_timeout: 等待其他連線釋放鎖的秒數
+            wal: 是否使用 WAL 模式
+            catalogue_path: 唯讀單字庫路徑（不存在時使用單檔模式）
+            undo_window: submit_binary_answer 可撤回的作答數，0 表示每題立即寫入
         """
-        self.db = VocabularyDatabase(db_path)
-        self.db.connect()
+        self.db = open_database(
+            db_path, busy_timeout=busy_timeout, wal=wal, catalogue_path=catalogue_path
+        )
         self.sm2 = SM2Algorithm()
         self.current_quiz_mode = QuizMode.MIXED
+        self.new_per_day = new_per_day
+        self._review_queue: Optional[ReviewQueue] = None
+        self._review_data_version: Optional[int] = None
+        self._external_writes: set = set()  # 其他連線寫入、尚未套用到佇列的單字 ID
+        self._external_writes_lock = threading.Lock()
+        self._word_index: Optional[WordIndex] = None
+        self._study_ms_remainder = 0  # 尚未累計到 study_time_seconds 的毫秒數
+        self.undo_window = undo_window
+        self._pending: List[Dict] = []  # 尚未寫入資料庫的作答（由舊到新）
 
     def get_quiz_words(
         self, mode: str = "review", level: Optional[int] = None, limit: int = 50
-    ) -> List[Dict]:
+    ) -> List[Record]:
         """取得測驗單字
 
         Args:
-            mode: 模式 ("review"=複習, "new"=新單字, "favorite"=收藏)
+            mode: 模式 ("plan"=今日計畫, "review"=複習, "new"=新單字, "favorite"=收藏)
             level: 級別 (僅對 new 模式有效)
             limit: 數量上限
 
         Returns:
             單字列表
         """
-        if mode == "review":
-            return self.db.get_words_for_review(limit)
+        self.flush_pending()
+        if mode == "plan":
+            return self.get_daily_plan(limit)
+        elif mode == "review":
+            return self._get_review_queue().top_distinct(limit)
         elif mode == "new":
-            return self.db.get_new_words(level, limit)
+            return self._get_new_words(level, limit)
         elif mode == "favorite":
             return self.db.get_favorite_words()
         else:
             return []
 
+    def _get_review_queue(self) -> ReviewQueue:
+        """取得複習優先佇列
+
+        第一次使用時載入全部到期單字建立堆積，之後由作答增量更新；
+        其他連線寫入資料庫（data_version 改變）時，若寫入的單字已由
+        note_external_writes 告知，只重新讀取這些單字，否則與換日時一樣重新建立。
+        """
+        today = day_number.today()
+        data_version = self.db.conn.execute("PRAGMA data_version").fetchone()[0]
+        queue = self._review_queue
+        if queue is not None and queue.today == today:
+            if data_version == self._review_data_version:
+                return queue
+            with self._external_writes_lock:
+                written, self._external_writes = self._external_writes, set()
+            if written:
+                cards = self.db.get_review_words_by_ids(sorted(written))
+                due = {card["id"]: card for card in cards}
+                for vocabulary_id in written:
+                    if vocabulary_id in due:
+                        queue.update(due[vocabulary_id])
+                    else:
+                        queue.remove(vocabulary_id)
+                self._review_data_version = data_version
+                return queue
+
+        with self._external_writes_lock:
+            self._external_writes.clear()
+        queue = ReviewQueue(today)
+        queue.build(self.db.get_words_for_review(limit=None))
+        self._review_queue = queue
+        self._review_data_version = data_version
+        return queue
+
+    def note_external_writes(self, vocabulary_ids: List[int]):
+        """告知其他連線已寫入（並 commit）這些單字的學習進度
+
+        可從其他執行緒呼叫；下次取得複習佇列時只增量更新這些單字，不必整個重建。
+        若同時有未告知的寫入（例如另一個程式），這些寫入要到換日或下次重建才會反映。
+
+        Args:
+            vocabulary_ids: 寫入的單字 ID
+        """
+        with self._external_writes_lock:
+            self._external_writes.update(vocabulary_ids)
+
+    def get_daily_plan(self, limit: Optional[int] = None) -> List[Record]:
+        """取得今日學習計畫中尚未完成的單字
+
+        每天第一次呼叫時建立計畫並寫入資料庫，之後（包含重新啟動程式）
+        都讀取同一份計畫，答完的單字會被標記完成。
+
+        Args:
+            limit: 數量上限，None 表示全部
+
+        Returns:
+            單字列表，kind 欄位為 "review" 或 "new"
+        """
+        today = day_number.today()
+        if not self.db.has_daily_plan(today):
+            self._build_daily_plan(today)
+        return self.db.get_daily_plan(today, limit)
+
+    def _get_new_words(
+        self, level: Optional[int], limit: int, exclude: Optional[set] = None
+    ) -> List[Record]:
+        """取得新單字，同一詞條鍵（兄弟詞條）只取第一個，其餘留到之後再學
+
+        Args:
+            level: 指定級別，None 表示所有級別
+            limit: 數量上限
+            exclude: 已排入的詞條鍵（這些詞條的兄弟也略過）
+
+        Returns:
+            新單字列表
+        """
+        seen = set(exclude or ())
+        words: List[Record] = []
+        after = None
+        while len(words) < limit:
+            page = self.db.get_new_words_page(level, after=after, limit=limit)
+            for word in page:
+                key = word.get("lemma_key") or word["id"]
+                if key not in seen:
+                    seen.add(key)
+                    words.append(word)
+                    if len(words) >= limit:
+                        break
+            if len(page) < limit:
+                break
+            last = page[-1]
+            after = (last["level"], last["sort_key"], last["id"])
+        return words
+
+    def _build_daily_plan(self, plan_day: int):
+        """建立今日計畫：到期單字依記憶保留率排序，新單字平均穿插其中
+
+        同一詞條鍵的兄弟詞條（"arm (1)"、"arm (2)"）每天只排一個，其餘延到之後。
+        """
+        queue = self._get_review_queue()
+        due = queue.top_distinct(len(queue))
+        reviews = [card["id"] for card in due]
+        lemmas = {card.get("lemma_key") or card["id"] for card in due}
+        new_words = [word["id"] for word in self._get_new_words(None, self.new_per_day, lemmas)]
+
+        # 以相對位置 (i + 1) / (n + 1) 合併兩個序列，讓新單字平均分散
+        slots = [((i + 1) / (len(reviews) + 1), 0, vid, "review") for i, vid in enumerate(reviews)]
+        slots += [((i + 1) / (len(new_words) + 1), 1, vid, "new") for i, vid in enumerate(new_words)]
+        slots.sort()
+        self.db.save_daily_plan(plan_day, [(vid, kind) for _, _, vid, kind in slots])
+
+    def _after_answer(
+        self,
+        vocabulary_id: int,
+        ease_factor: float,
+        interval_days: int,
+        next_review: int,
+        became_leech: bool = False,
+    ):
+        """作答後同步更新今日計畫與複習佇列
+
+        單字已不到期或被暫停時會自佇列移除；兄弟詞條也移出佇列，延到明天再複習。
+        """
+        self.db.mark_plan_done(day_number.today(), vocabulary_id)
+
+        queue = self._review_queue
+        if queue is None:
+            return
+        for sibling_id in self.db.get_sibling_ids(vocabulary_id):
+            queue.remove(sibling_id)
+        if vocabulary_id not in queue:
+            return
+        if became_leech and self.db.leech_action == "suspend":
+            queue.remove(vocabulary_id)
+            return
+        card = queue.get(vocabulary_id)
+        queue.update(
+            card._replace(
+                ease_factor=ease_factor, interval_days=interval_days, next_review=next_review
+            )
+        )
+
     def generate_quiz_question(
         self, word_data: Dict, mode: QuizMode = QuizMode.MIXED
     ) -> Tuple[str, str, str]:
@@ -136,9 +324,51 @@ class QuizEngine:
             "correct_index": correct_index,
         }
 
+    def build_question_bank(
+        self, cards: List[Record], mode: QuizMode = QuizMode.MIXED
+    ) -> QuestionBank:
+        """批次產生整個學習階段的選擇題
+
+        使用獨立的資料庫連線，可在背景執行緒中呼叫。
+
+        Args:
+            cards: 本次學習的卡片
+            mode: 測驗模式
+
+        Returns:
+            QuestionBank（以單字 ID 取題，不再查詢資料庫）
+        """
+        db = self._open_connection()
+        try:
+            return build_question_bank(db, cards, mode.value)
+        finally:
+            db.close()
+
+    def get_word_index(self) -> WordIndex:
+        """取得單字前綴索引（第一次呼叫時載入索引檔，過期則重建）
+
+        使用獨立的資料庫連線，可在背景執行緒中呼叫。
+        """
+        if self._word_index is None:
+            db = self._open_connection()
+            try:
+                self._word_index = load_word_index(db)
+            finally:
+                db.close()
+        return self._word_index
+
+    def _open_connection(self) -> VocabularyDatabase:
+        """以相同設定開啟另一個資料庫連線（供背景執行緒使用）"""
+        return open_database(
+            self.db.db_path,
+            busy_timeout=self.db.busy_timeout,
+            wal=self.db.wal,
+            catalogue_path=self.db.catalogue_path,
+        )
+
     def _get_distractors(
         self, word_data: Dict, count: int = 3, mode: QuizMode = None
-    ) -> List[Dict]:
+    ) -> List[Record]:
         """生成干擾選項
 
         Args:
@@ -183,26 +413,18 @@ class QuizEngine:
     ) -> bool:
         """檢查答案是否正確
 
+        使用預編譯並快取的比對器：中文答案只要包含任一關鍵詞就算對
+        （例如「能，可以」答「能」或「可以」都對），英文答案容許少量拼字錯誤。
+
         Args:
             user_answer: 使用者答案
             correct_answer: 正確答案
-            question_type: 問題類型
+            question_type: 問題類型（"mc_en2zh"、"mc_zh2en"、"typed_zh2en" 等）
 
         Returns:
             是否正確
         """
-        # 移除首尾空白，轉小寫比較
-        user_answer = user_answer.strip().lower()
-        correct_answer = correct_answer.strip().lower()
-
-        # 對於中文答案，允許部分匹配
-        if question_type == "zh2en":
-            return user_answer == correct_answer
-        else:
-            # 中文翻譯可能有多個，只要包含關鍵詞就算對
-            # 例如：「能，可以」只要答「能」或「可以」都對
-            keywords = [k.strip() for k in correct_answer.replace("；", ",").split(",")]
-            return any(keyword in user_answer for keyword in keywords)
+        return get_matcher(correct_answer, direction_of(question_type)).check(user_answer)
 
     def submit_answer(
         self, vocabulary_id: int, is_correct: bool, is_new_word: bool = False
@@ -217,6 +439,8 @@ class QuizEngine:
         Returns:
             更新後的進度資訊
         """
+        self.flush_pending()
+
         # 取得當前進度
         progress = self.db.get_progress(vocabulary_id)
 
@@ -242,58 +466,81 @@ class QuizEngine:
             review_count=review_count,
         )
 
-        # 更新資料庫
-        self.db.update_progress(
-            vocabulary_id=vocabulary_id,
-            ease_factor=new_ef,
-            interval_days=new_interval,
-            next_review=next_review,
-            is_correct=is_correct,
-        )
-
-        # 記錄學習統計
-        if is_new_word:
-            self.db.record_study_session(
-                new_words=1, correct=1 if is_correct else 0, total=1
-            )
-        else:
-            self.db.record_study_session(
-                reviewed_words=1, correct=1 if is_correct else 0, total=1
+        # 更新資料庫（進度、計畫與統計在同一個交易內寫入）
+        with self.db.batch():
+            became_leech = self.db.update_progress(
+                vocabulary_id=vocabulary_id,
+                ease_factor=new_ef,
+                interval_days=new_interval,
+                next_review=next_review,
+                is_correct=is_correct,
             )
+            self._after_answer(vocabulary_id, new_ef, new_interval, next_review, became_leech)
+
+            # 記錄學習統計
+            if is_new_word:
+                self.db.record_study_session(
+                    new_words=1, correct=1 if is_correct else 0, total=1
+                )
+            else:
+                self.db.record_study_session(
+                    reviewed_words=1, correct=1 if is_correct else 0, total=1
+                )
 
         return {
             "ease_factor": new_ef,
             "interval_days": new_interval,
             "next_review": next_review,
             "is_correct": is_correct,
+            "became_leech": became_leech,
         }
 
+    def _study_seconds(self, response_ms: Optional[int]) -> int:
+        """把作答毫秒數換成要累加的整數秒，不足一秒的部分留到下一題"""
+        if response_ms is None:
+            return 0
+        seconds, self._study_ms_remainder = divmod(self._study_ms_remainder + response_ms, 1000)
+        return seconds
+
     def submit_binary_answer(
-        self, vocabulary_id: int, know: bool, is_new_word: bool = False
+        self,
+        vocabulary_id: int,
+        know: bool,
+        is_new_word: bool = False,
+        response_ms: Optional[int] = None,
     ) -> Dict:
         """提交二元答題結果（會/不會）並更新學習進度
 
-        使用簡化的二元評分系統，更符合翻牌學習模式
+        使用簡化的二元評分系統，更符合翻牌學習模式；
+        有作答時間時，想很久才答「會」的單字會排得較近。
+        undo_window 大於 0 時作答先留在記憶體（可用 undo_last 撤回），
+        累積到兩倍時把較舊的作答在同一個交易內寫入。
 
         Args:
             vocabulary_id: 單字 ID
             know: True 表示「會」，False 表示「不會」
             is_new_word: 是否為新單字
+            response_ms: 想起答案花的時間（毫秒），None 表示未計時
 
         Returns:
             更新後的進度資訊
         """
-        # 取得當前進度
-        progress = self.db.get_progress(vocabulary_id)
+        # 取得當前進度（同一個單字還有未寫入的作答時以該作答後的進度為準）
+        progress = self._pending_progress(vocabulary_id) or self.db.get_progress(vocabulary_id)
 
         if progress:
             current_ef = progress["ease_factor"]
             current_interval = progress["interval_days"]
             review_count = progress["review_count"]
+            lapse_count = progress["lapse_count"]
         else:
             current_ef = 2.5
             current_interval = 0
             review_count = 0
+            lapse_count = 0
+
+        if response_ms is not None:
+            response_ms = min(response_ms, MAX_RESPONSE_MS)
 
         # 使用二元 SM-2 演算法計算下次複習
         new_ef, new_interval, next_review = self.sm2.calculate_binary(
@@ -301,32 +548,118 @@ class QuizEngine:
             current_ease_factor=current_ef,
             current_interval_days=current_interval,
             review_count=review_count,
+            response_ms=response_ms,
         )
 
-        # 更新資料庫
-        self.db.update_progress(
-            vocabulary_id=vocabulary_id,
-            ease_factor=new_ef,
-            interval_days=new_interval,
-            next_review=next_review,
-            is_correct=know,
-        )
+        # 與 update_progress 相同的遺忘判斷，寫入前就能告訴畫面是否成為難記單字
+        lapsed = is_lapse(progress, know)
+        became_leech = lapsed and lapse_count + 1 == LEECH_THRESHOLD
 
-        # 記錄學習統計
-        if is_new_word:
-            self.db.record_study_session(new_words=1, correct=1 if know else 0, total=1)
-        else:
-            self.db.record_study_session(
-                reviewed_words=1, correct=1 if know else 0, total=1
-            )
+        answer = {
+            "vocabulary_id": vocabulary_id,
+            "know": know,
+            "is_new_word": is_new_word,
+            "response_ms": response_ms,
+            "ease_factor": new_ef,
+            "interval_days": new_interval,
+            "next_review": next_review,
+            "review_count": review_count + 1,
+            "lapse_count": lapse_count + (1 if lapsed else 0),
+            "became_leech": became_leech,
+        }
+        self._pending.append(answer)
+        if len(self._pending) >= self.undo_window * 2:
+            self._write_answers(len(self._pending) - self.undo_window)
 
         return {
             "ease_factor": new_ef,
             "interval_days": new_interval,
             "next_review": next_review,
             "is_correct": know,
+            "response_ms": response_ms,
+            "became_leech": became_leech,
+            "review_count": review_count + 1,
         }
 
+    def _pending_progress(self, vocabulary_id: int) -> Optional[Dict]:
+        """同一個單字最近一次尚未寫入的作答（作為計算下一次的進度）"""
+        for answer in reversed(self._pending):
+            if answer["vocabulary_id"] == vocabulary_id:
+                return answer
+        return None
+
+    def _write_answers(self, count: int):
+        """把最舊的 count 筆作答寫入資料庫（進度、計畫與統計在同一個交易內）
+
+        作答在交易 commit 之後才自 _pending 移除；寫入失敗時較舊的作答留著下次再寫，
+        只有立即寫入模式（undo_window 為 0）失敗的那一筆就是這次的作答，例外交給呼叫端後丟棄。
+        """
+        answers = self._pending[:count]
+        study_ms_remainder = self._study_ms_remainder
+        try:
+            self._apply_answers(answers)
+        except Exception:
+            self._study_ms_remainder = study_ms_remainder
+            # 佇列可能已套用了被 rollback 的作答，下次使用時重新建立
+            self._review_queue = None
+            if not self.undo_window:
+                del self._pending[:count]
+            raise
+        del self._pending[:count]
+
+    def _apply_answers(self, answers: List[Dict]):
+        """在一個交易內寫入作答的進度、計畫與統計"""
+        with self.db.batch():
+            for answer in answers:
+                vocabulary_id = answer["vocabulary_id"]
+                know = answer["know"]
+                self.db.update_progress(
+                    vocabulary_id=vocabulary_id,
+                    ease_factor=answer["ease_factor"],
+                    interval_days=answer["interval_days"],
+                    next_review=answer["next_review"],
+                    is_correct=know,
+                    response_ms=answer["response_ms"],
+                )
+                self._after_answer(
+                    vocabulary_id,
+                    answer["ease_factor"],
+                    answer["interval_days"],
+                    answer["next_review"],
+                    answer["became_leech"],
+                )
+
+                # 記錄學習統計
+                study_seconds = self._study_seconds(answer["response_ms"])
+                if answer["is_new_word"]:
+                    self.db.record_study_session(
+                        new_words=1, correct=1 if know else 0, total=1, study_seconds=study_seconds
+                    )
+                else:
+                    self.db.record_study_session(
+                        reviewed_words=1, correct=1 if know else 0, total=1, study_seconds=study_seconds
+                    )
+
+    @property
+    def pending_count(self) -> int:
+        """尚未寫入資料庫（還可以撤回）的作答數"""
+        return len(self._pending)
+
+    def undo_last(self) -> Optional[int]:
+        """撤回最近一次尚未寫入的作答（只丟棄記憶體中的記錄，不動資料庫）
+
+        Returns:
+            被撤回作答的單字 ID，沒有可撤回的作答時回傳 None
+        """
+        if not self._pending:
+            return None
+        return self._pending.pop()["vocabulary_id"]
+
+    def flush_pending(self):
+        """把所有尚未寫入的作答寫入資料庫"""
+        if self._pending:
+            self._write_answers(len(self._pending))
+
     def submit_rating(
         self, vocabulary_id: int, rating: int, is_new_word: bool = False
     ) -> Dict:
@@ -340,6 +673,8 @@ class QuizEngine:
         Returns:
             更新後的進度資訊
         """
+        self.flush_pending()
+
         # 取得當前進度
         progress = self.db.get_progress(vocabulary_id)
 
@@ -360,31 +695,34 @@ class QuizEngine:
             review_count=review_count,
         )
 
-        # 更新資料庫
+        # 更新資料庫（進度、計畫與統計在同一個交易內寫入）
         is_correct = rating >= 3
-        self.db.update_progress(
-            vocabulary_id=vocabulary_id,
-            ease_factor=new_ef,
-            interval_days=new_interval,
-            next_review=next_review,
-            is_correct=is_correct,
-        )
-
-        # 記錄學習統計
-        if is_new_word:
-            self.db.record_study_session(
-                new_words=1, correct=1 if is_correct else 0, total=1
-            )
-        else:
-            self.db.record_study_session(
-                reviewed_words=1, correct=1 if is_correct else 0, total=1
+        with self.db.batch():
+            became_leech = self.db.update_progress(
+                vocabulary_id=vocabulary_id,
+                ease_factor=new_ef,
+                interval_days=new_interval,
+                next_review=next_review,
+                is_correct=is_correct,
             )
+            self._after_answer(vocabulary_id, new_ef, new_interval, next_review, became_leech)
+
+            # 記錄學習統計
+            if is_new_word:
+                self.db.record_study_session(
+                    new_words=1, correct=1 if is_correct else 0, total=1
+                )
+            else:
+                self.db.record_study_session(
+                    reviewed_words=1, correct=1 if is_correct else 0, total=1
+                )
 
         return {
             "ease_factor": new_ef,
             "interval_days": new_interval,
             "next_review": next_review,
             "is_correct": is_correct,
+            "became_leech": became_leech,
         }
 
     def get_study_session_summary(self) -> Dict:
@@ -393,6 +731,7 @@ class QuizEngine:
         Returns:
             統計資訊字典
         """
+        self.flush_pending()
         stats = self.db.get_learning_statistics()
         return {
             "today_new": stats["today"]["new_words"],
@@ -408,13 +747,19 @@ class QuizEngine:
                 if stats["today"]["total_count"] > 0
                 else 0
             ),
+            "today_seconds_per_card": (
+                round((stats["today"]["study_time_seconds"] or 0) / stats["today"]["total_count"], 1)
+                if stats["today"]["total_count"] > 0
+                else 0
+            ),
             "streak_days": stats["streak_days"],
             "total_learned": stats["learned_words"],
             "total_words": stats["total_words"],
         }
 
     def close(self):
-        """關閉資料庫連接"""
+        """寫入尚未寫入的作答並關閉資料庫連接"""
+        self.flush_pending()
         self.db.close()
 
 
@@ -0,0 +1,146 @@
+"""
+複習優先佇列
+依預估的記憶保留率（retrievability）排序到期單字，
+以堆積維護，作答後增量更新，取前 K 個只需 O(k log n)
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional
+
+# SM-2 排程的目標：到期當天約有 90% 的機率仍記得
+TARGET_RETENTION = 0.9
+DEFAULT_EASE_FACTOR = 2.5
+
+
+def recall_probability(ease_factor: float, interval_days: int, elapsed_days: int) -> float:
+    """估計單字目前仍記得的機率
+
+    以指數遺忘曲線 R = 0.9 ^ (經過天數 / 穩定度) 近似，
+    穩定度取排程間隔並依難度因子相對初始值縮放：
+    剛好到期時 R ≈ 0.9，逾期越久、難度因子越低，R 越小。
+
+    Args:
+        ease_factor: 難度因子
+        interval_days: 上次排定的間隔天數
+        elapsed_days: 距上次複習的天數
+
+    Returns:
+        0-1 之間的機率
+    """
+    stability = max(interval_days, 1) * (ease_factor or DEFAULT_EASE_FACTOR) / DEFAULT_EASE_FACTOR
+    return TARGET_RETENTION ** (max(elapsed_days, 0) / stability)
+
+
+class ReviewQueue:
+    """以記憶保留率為優先序的到期單字堆積（保留率最低者優先）
+
+    更新採延遲刪除：舊項目標記為失效留在堆積中，取出時略過。
+    """
+
+    def __init__(self, today: int):
+        """初始化佇列
+
+        Args:
+            today: 今天的日序數
+        """
+        self.today = today
+        self._heap: List[list] = []
+        self._entries: Dict[int, list] = {}  # vocabulary_id → 堆積項目
+        self._cards: Dict[int, Dict] = {}
+        self._counter = itertools.count()  # 同分時維持插入順序
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, vocabulary_id: int) -> bool:
+        return vocabulary_id in self._entries
+
+    def get(self, vocabulary_id: int) -> Optional[Dict]:
+        """取得佇列中的單字資料"""
+        return self._cards.get(vocabulary_id)
+
+    def priority(self, card: Dict) -> float:
+        """計算單字的優先序（即預估保留率）"""
+        interval = card["interval_days"] or 0
+        elapsed = self.today - (card["next_review"] - interval)
+        return recall_probability(card["ease_factor"], interval, elapsed)
+
+    def build(self, cards: Iterable[Dict]):
+        """以一批到期單字建立堆積（O(n)）"""
+        self._heap = []
+        self._entries = {}
+        self._cards = {}
+        for card in cards:
+            entry = [self.priority(card), next(self._counter), card["id"]]
+            self._entries[card["id"]] = entry
+            self._cards[card["id"]] = card
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def update(self, card: Dict):
+        """加入或更新單字；已不到期的單字會自佇列移除
+
+        Args:
+            card: 含 id、ease_factor、interval_days、next_review 的單字資料
+        """
+        self.remove(card["id"])
+        if card["next_review"] is None or card["next_review"] > self.today:
+            return
+        entry = [self.priority(card), next(self._counter), card["id"]]
+        self._entries[card["id"]] = entry
+        self._cards[card["id"]] = card
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, vocabulary_id: int):
+        """移除單字（延遲刪除）"""
+        entry = self._entries.pop(vocabulary_id, None)
+        if entry is not None:
+            entry[2] = None
+            self._cards.pop(vocabulary_id, None)
+
+    def top(self, k: int) -> List[Dict]:
+        """取得保留率最低的前 k 個單字（不移出佇列）"""
+        popped = []
+        while self._heap and len(popped) < k:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is not None:
+                popped.append(entry)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return [self._cards[entry[2]] for entry in popped]
+
+    def top_distinct(self, k: int, key: str = "lemma_key") -> List[Dict]:
+        """取得保留率最低的前 k 個單字，同一個鍵（兄弟詞條）只取保留率最低的一個
+
+        其餘兄弟詞條留在佇列中，不到期前都不會被移除，等於延到之後再複習。
+
+        Args:
+            k: 數量上限
+            key: 判斷兄弟詞條的欄位（沒有此欄位時以單字 ID 代替）
+        """
+        popped = []
+        chosen = []
+        seen = set()
+        while self._heap and len(chosen) < k:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is None:
+                continue
+            popped.append(entry)
+            card = self._cards[entry[2]]
+            sibling_key = card.get(key) or card["id"]
+            if sibling_key not in seen:
+                seen.add(sibling_key)
+                chosen.append(card)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return chosen
+
+    def pop(self) -> Optional[Dict]:
+        """移出並返回保留率最低的單字"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is not None:
+                del self._entries[entry[2]]
+                return self._cards.pop(entry[2])
+        return None
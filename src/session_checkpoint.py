@@ -0,0 +1,254 @@
+"""
+學習進度檢查點
+把進行中的學習流程（題目列表、目前題號、錯題、歷史）以只附加的 JSON Lines 記錄到檔案，
+程式中斷後可依記錄重建畫面，不必重新查詢出題佇列；
+尚未寫入資料庫的作答（可撤回的最近幾題）也記在這裡，繼續時重新提交
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import IO, List, Optional, Sequence
+
+import day_number
+from database import Record, make_record
+
+DEFAULT_CHECKPOINT_PATH = "data/session_checkpoint.jsonl"
+FORMAT_VERSION = 2
+
+# 每累積幾筆事件 fsync 一次（每筆都會 flush 到作業系統，程式當掉不會遺失；
+# 只有整台機器斷電時可能少記最後幾題）
+SYNC_EVERY = 5
+
+
+class SessionState:
+    """由檢查點重建的學習流程狀態"""
+
+    def __init__(self, header: dict, words: List[Record]):
+        """
+        Args:
+            header: 檢查點開頭的流程設定
+            words: 第一輪的題目
+        """
+        self.mode: str = header["mode"]
+        self.level: Optional[int] = header["level"]
+        self.quiz_style: str = header["quiz_style"]
+        self.day: int = header["day"]
+        self.by_id = {word["id"]: word for word in words}
+        self.words: List[Record] = list(words)
+        self.current_index = 0
+        self.wrong_words: List[Record] = []
+        self.wrong_ids = set()
+        self.history: List[dict] = []
+        # 尚未寫入資料庫的作答（submit_binary_answer 的參數，由舊到新）
+        self.unflushed: List[list] = []
+        # 每筆未寫入作答寫入後應有的 review_count（舊檢查點沒有時為 None）
+        self._review_counts: List[Optional[int]] = []
+
+    def apply(self, event: dict):
+        """套用一筆事件（與 StudyScreen 的狀態變化一致）"""
+        if "a" in event:
+            index, vocabulary_id, wrong, know, is_new_word, response_ms = event["a"][:6]
+            word = self.by_id[vocabulary_id]
+            wrong_added = bool(wrong) and vocabulary_id not in self.wrong_ids
+            self.history.append({"index": index, "word": word, "wrong_added": wrong_added})
+            if wrong_added:
+                self.wrong_ids.add(vocabulary_id)
+                self.wrong_words.append(word)
+            self.unflushed.append([vocabulary_id, bool(know), bool(is_new_word), response_ms])
+            self._review_counts.append(event["a"][6] if len(event["a"]) > 6 else None)
+            self.current_index = index + 1
+        elif "b" in event:
+            if self.history:
+                previous = self.history.pop()
+                if previous["wrong_added"]:
+                    self.wrong_ids.discard(previous["word"]["id"])
+                    self.wrong_words.pop()
+                self.current_index = previous["index"]
+            if self.unflushed:
+                self.unflushed.pop()
+                self._review_counts.pop()
+        elif "f" in event:
+            del self.unflushed[:event["f"]]
+            del self._review_counts[:event["f"]]
+        elif "r" in event:
+            self.words = [self.by_id[i] for i in event["r"]]
+            self.wrong_words = []
+            self.wrong_ids = set()
+            self.history = []
+            self.unflushed = []
+            self._review_counts = []
+            self.current_index = 0
+
+    @property
+    def remaining(self) -> int:
+        """本輪剩下的題數（含之後要重測的錯題）"""
+        return len(self.words) - self.current_index + len(self.wrong_words)
+
+    @property
+    def stale(self) -> bool:
+        """是否為之前某天的流程（不再提供繼續，只補寫未寫入的作答）"""
+        return self.day != day_number.today()
+
+    def drop_written(self, db) -> int:
+        """移除開頭其實已寫入資料庫的作答
+
+        作答在資料庫 commit 之後才記錄 "f"，兩者之間中斷時重新提交會重複寫入。
+        每筆作答記有寫入後應有的 review_count，資料庫已達到即視為已寫入；
+        每次寫入的都是最舊的連續幾筆，因此只需檢查開頭。
+
+        Args:
+            db: VocabularyDatabase
+
+        Returns:
+            移除的筆數（呼叫端應以 SessionCheckpoint.flushed 記錄）
+        """
+        count = 0
+        for (vocabulary_id, *_), expected in zip(self.unflushed, self._review_counts):
+            if expected is None:
+                break
+            progress = db.get_progress(vocabulary_id)
+            if progress is None or progress["review_count"] < expected:
+                break
+            count += 1
+        del self.unflushed[:count]
+        del self._review_counts[:count]
+        return count
+
+
+class SessionCheckpoint:
+    """學習流程的檢查點檔（一個流程一個檔案，完成後刪除）"""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, sync_every: int = SYNC_EVERY):
+        """
+        Args:
+            path: 檢查點檔路徑
+            sync_every: 每幾筆事件 fsync 一次
+        """
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self._file: Optional[IO[str]] = None
+        self._unsynced = 0
+
+    def start(self, mode: str, level: Optional[int], quiz_style: str, words: Sequence[Record]):
+        """開始新的流程：覆寫檔案並寫入設定與題目（欄位名稱只存一次）"""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fields = list(words[0].keys()) if words else []
+        header = {
+            "version": FORMAT_VERSION,
+            "day": day_number.today(),
+            "mode": mode,
+            "level": level,
+            "quiz_style": quiz_style,
+            "fields": fields,
+            "rows": [list(word) for word in words],
+        }
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write(header, sync=True)
+
+    def resume(self):
+        """從既有檔案繼續附加事件"""
+        self.close()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def answer(
+        self,
+        index: int,
+        vocabulary_id: int,
+        wrong: bool,
+        know: bool,
+        is_new_word: bool,
+        response_ms: Optional[int],
+        review_count: Optional[int] = None,
+    ):
+        """記錄一次作答
+
+        wrong 表示加入錯題重測，review_count 為寫入後應有的複習次數
+        （用來判斷作答是否已寫入，見 SessionState.drop_written），其餘為 submit_binary_answer 的參數。
+        """
+        self._write({
+            "a": [
+                index,
+                vocabulary_id,
+                1 if wrong else 0,
+                1 if know else 0,
+                1 if is_new_word else 0,
+                response_ms,
+                review_count,
+            ]
+        })
+
+    def back(self):
+        """記錄返回上一題（撤回最近一次作答）"""
+        self._write({"b": 1})
+
+    def flushed(self, count: int):
+        """記錄最舊的 count 筆作答已寫入資料庫"""
+        self._write({"f": count}, sync=True)
+
+    def new_round(self, words: Sequence[Record]):
+        """記錄開始重測錯題（之前的作答都已寫入資料庫）"""
+        self._write({"r": [word["id"] for word in words]}, sync=True)
+
+    def finish(self):
+        """流程完成：刪除檢查點"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self):
+        """關閉檔案（先 fsync 尚未同步的事件）"""
+        if self._file is None:
+            return
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._file.close()
+        self._file = None
+
+    def _write(self, record: dict, sync: bool = False):
+        """附加一行並 flush；累積 sync_every 筆或 sync=True 時 fsync"""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= self.sync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+
+def load_checkpoint(path: str = DEFAULT_CHECKPOINT_PATH) -> Optional[SessionState]:
+    """讀取檢查點並重播事件
+
+    最後一行寫到一半（當機）時忽略該行。
+    之前某天的流程仍會讀取（stale 為 True），讓呼叫端補寫未寫入的作答。
+    檔案不存在、格式不符，或沒有需要處理的事（沒有未寫入的作答，
+    且已沒有剩餘題目或不是今天的流程）時回傳 None。
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    try:
+        header = json.loads(lines[0])
+    except (IndexError, ValueError):
+        return None
+    if header.get("version") != FORMAT_VERSION:
+        return None
+
+    words = [make_record(header["fields"], row) for row in header["rows"]]
+    state = SessionState(header, words)
+    for line in lines[1:]:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            break
+        state.apply(event)
+
+    if not state.unflushed and (not state.words or state.remaining <= 0 or state.stale):
+        return None
+    return state
@@ -0,0 +1,410 @@
+"""
+學習進度二進位快照
+將 learning_progress 以欄式區塊儲存：id 差值編碼、日期轉為日序數、
+整數以 varint 壓縮，每個區塊再以 zlib 壓縮，可串流寫出與讀回
+"""
+
+import argparse
+import json
+import struct
+import sys
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+import day_number
+from database import VocabularyDatabase, open_database
+
+MAGIC = b"VBSP"
+FORMAT_VERSION = 2
+DEFAULT_BLOCK_ROWS = 4096
+
+# 檔頭：magic、格式版本、保留位元組
+HEADER = struct.Struct("<4sBxxx")
+# 區塊頭：列數、壓縮後長度、基準日序數、基準秒數、基準毫秒數
+BLOCK_HEADER = struct.Struct("<IIiqq")
+
+EASE_SCALE = 10000  # ease_factor 以萬分之一精度儲存
+
+# 快照欄位（id 與 version 為本機值，匯入時重新產生，不存入快照）
+FIELDS_V1 = (
+    "vocabulary_id",
+    "familiarity",
+    "last_reviewed",
+    "review_count",
+    "correct_count",
+    "ease_factor",
+    "interval_days",
+    "next_review",
+    "is_favorite",
+    "updated_at",
+)
+# v2 加入作答時間與遺忘統計；讀取 v1 快照時這些欄位維持資料庫原值（或預設值）
+FIELDS = FIELDS_V1 + (
+    "response_ms_total",
+    "response_count",
+    "last_response_ms",
+    "lapse_count",
+    "is_suspended",
+)
+
+
+class SnapshotError(Exception):
+    """快照格式錯誤"""
+
+
+# ========== varint 編碼 ==========
+
+
+def _write_varint(out: bytearray, value: int):
+    """寫入無號 LEB128 varint"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int):
+    """讀取無號 varint，回傳 (值, 新位置)"""
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+# 可為 NULL 的相對值：0 表示 NULL，其餘為 zigzag(值 - 基準) + 1
+def _encode_optional(value: Optional[int], base: int) -> int:
+    return 0 if value is None else _zigzag(value - base) + 1
+
+
+def _decode_optional(value: int, base: int) -> Optional[int]:
+    return None if value == 0 else _unzigzag(value - 1) + base
+
+
+# ========== 日期轉換 ==========
+
+
+def _timestamp_seconds(value: Optional[str]) -> Optional[int]:
+    """SQLite CURRENT_TIMESTAMP（UTC）字串轉為 Unix 秒數"""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _timestamp_string(seconds: Optional[int]) -> Optional[str]:
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ========== 寫入 ==========
+
+
+class SnapshotWriter:
+    """串流寫出快照，每累積 block_rows 列輸出一個壓縮區塊"""
+
+    def __init__(self, fileobj: BinaryIO, block_rows: int = DEFAULT_BLOCK_ROWS):
+        """初始化寫入器並寫出檔頭
+
+        Args:
+            fileobj: 以二進位模式開啟的輸出檔
+            block_rows: 每個區塊的列數
+        """
+        self.fileobj = fileobj
+        self.block_rows = block_rows
+        self.rows_written = 0
+        self._pending: List[Dict] = []
+        self._last_id = 0
+        self._block_last_id = 0
+        fileobj.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    def write(self, row: Dict):
+        """寫入一列（vocabulary_id 必須遞增）"""
+        if row["vocabulary_id"] <= self._last_id:
+            raise SnapshotError("rows must be sorted by vocabulary_id")
+        self._last_id = row["vocabulary_id"]
+        self._pending.append(row)
+        if len(self._pending) >= self.block_rows:
+            self._flush()
+
+    def close(self):
+        """輸出剩餘資料與結尾區塊（列數 0）"""
+        self._flush()
+        self.fileobj.write(BLOCK_HEADER.pack(0, 0, 0, 0, 0))
+        self.fileobj.flush()
+
+    def _flush(self):
+        """將暫存的列編碼為一個欄式區塊"""
+        rows = self._pending
+        if not rows:
+            return
+
+        days = [day_number.from_iso(r["next_review"]) for r in rows]
+        seconds = [_timestamp_seconds(r["last_reviewed"]) for r in rows]
+        millis = [r["updated_at"] for r in rows]
+        base_day = min((d for d in days if d is not None), default=0)
+        base_sec = min((s for s in seconds if s is not None), default=0)
+        base_ms = min((m for m in millis if m is not None), default=0)
+
+        out = bytearray()
+        # 逐欄輸出，讓相似的值相鄰，zlib 壓縮效果較好；id 接續前一區塊做差值
+        previous_id = self._block_last_id
+        for row in rows:
+            _write_varint(out, row["vocabulary_id"] - previous_id)
+            previous_id = row["vocabulary_id"]
+        for row in rows:
+            _write_varint(out, row["familiarity"] or 0)
+        for value in seconds:
+            _write_varint(out, _encode_optional(value, base_sec))
+        for row in rows:
+            _write_varint(out, row["review_count"] or 0)
+        for row in rows:
+            _write_varint(out, row["correct_count"] or 0)
+        for row in rows:
+            _write_varint(out, round((row["ease_factor"] or 0) * EASE_SCALE))
+        for row in rows:
+            _write_varint(out, row["interval_days"] or 0)
+        for value in days:
+            _write_varint(out, _encode_optional(value, base_day))
+        out.extend(1 if row["is_favorite"] else 0 for row in rows)
+        for value in millis:
+            _write_varint(out, _encode_optional(value, base_ms))
+        for row in rows:
+            _write_varint(out, row["response_ms_total"] or 0)
+        for row in rows:
+            _write_varint(out, row["response_count"] or 0)
+        for row in rows:
+            _write_varint(out, _encode_optional(row["last_response_ms"], 0))
+        for row in rows:
+            _write_varint(out, row["lapse_count"] or 0)
+        out.extend(1 if row["is_suspended"] else 0 for row in rows)
+
+        payload = zlib.compress(bytes(out), 9)
+        self.fileobj.write(BLOCK_HEADER.pack(len(rows), len(payload), base_day, base_sec, base_ms))
+        self.fileobj.write(payload)
+
+        self._block_last_id = previous_id
+        self.rows_written += len(rows)
+        self._pending = []
+
+
+# ========== 讀取 ==========
+
+
+class SnapshotReader:
+    """逐區塊讀回快照（支援 v1 與 v2，fields 為該版本包含的欄位）"""
+
+    def __init__(self, fileobj: BinaryIO):
+        """初始化讀取器並驗證檔頭
+
+        Raises:
+            SnapshotError: 不是快照檔或版本不支援
+        """
+        self.fileobj = fileobj
+        header = fileobj.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise SnapshotError("file is too short")
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SnapshotError("not a progress snapshot")
+        if version not in (1, FORMAT_VERSION):
+            raise SnapshotError(f"unsupported snapshot version {version}")
+        self.version = version
+        self.fields = FIELDS_V1 if version == 1 else FIELDS
+
+    def __iter__(self) -> Iterator[Dict]:
+        last_id = 0
+        while True:
+            head = self.fileobj.read(BLOCK_HEADER.size)
+            if len(head) != BLOCK_HEADER.size:
+                raise SnapshotError("truncated snapshot")
+            count, length, base_day, base_sec, base_ms = BLOCK_HEADER.unpack(head)
+            if count == 0:
+                return
+
+            payload = self.fileobj.read(length)
+            if len(payload) != length:
+                raise SnapshotError("truncated snapshot")
+            rows, last_id = self._decode_block(
+                zlib.decompress(payload), count, last_id, base_day, base_sec, base_ms, self.version
+            )
+            yield from rows
+
+    @staticmethod
+    def _decode_block(data, count, last_id, base_day, base_sec, base_ms, version=FORMAT_VERSION):
+        """解碼一個欄式區塊（v1 區塊只有 FIELDS_V1 的欄位）"""
+        pos = 0
+
+        def column():
+            nonlocal pos
+            values = []
+            for _ in range(count):
+                value, pos = _read_varint(data, pos)
+                values.append(value)
+            return values
+
+        ids = []
+        current = last_id
+        for delta in column():
+            current += delta
+            ids.append(current)
+
+        familiarity = column()
+        seconds = column()
+        review_counts = column()
+        correct_counts = column()
+        eases = column()
+        intervals = column()
+        days = column()
+        favorites = data[pos : pos + count]
+        pos += count
+        millis = column()
+
+        rows = [
+            {
+                "vocabulary_id": ids[i],
+                "familiarity": familiarity[i],
+                "last_reviewed": _timestamp_string(_decode_optional(seconds[i], base_sec)),
+                "review_count": review_counts[i],
+                "correct_count": correct_counts[i],
+                "ease_factor": eases[i] / EASE_SCALE,
+                "interval_days": intervals[i],
+                "next_review": _decode_optional(days[i], base_day),
+                "is_favorite": favorites[i],
+                "updated_at": _decode_optional(millis[i], base_ms),
+            }
+            for i in range(count)
+        ]
+        if version >= 2:
+            response_totals = column()
+            response_counts = column()
+            last_responses = column()
+            lapses = column()
+            suspended = data[pos : pos + count]
+            pos += count
+            for i, row in enumerate(rows):
+                row["response_ms_total"] = response_totals[i]
+                row["response_count"] = response_counts[i]
+                row["last_response_ms"] = _decode_optional(last_responses[i], 0)
+                row["lapse_count"] = lapses[i]
+                row["is_suspended"] = suspended[i]
+        return rows, ids[-1]
+
+
+# ========== 匯出 / 匯入 ==========
+
+
+def export_progress(db: VocabularyDatabase, fileobj: BinaryIO) -> int:
+    """以串流方式將學習進度寫成快照
+
+    Returns:
+        寫出的列數
+    """
+    writer = SnapshotWriter(fileobj)
+    cursor = db.conn.execute(
+        f"SELECT {', '.join(FIELDS)} FROM learning_progress ORDER BY vocabulary_id"
+    )
+    for row in cursor:
+        writer.write(row)
+    writer.close()
+    return writer.rows_written
+
+
+def import_progress(db: VocabularyDatabase, fileobj: BinaryIO, replace: bool = False) -> int:
+    """將快照批次載入 learning_progress（單一交易）
+
+    v1 快照沒有的欄位：新增的列使用預設值，已存在的列保留原值。
+
+    Args:
+        db: 已連線的資料庫
+        fileobj: 快照檔
+        replace: True 時先清空現有進度，否則以快照內容覆寫相同單字
+
+    Returns:
+        載入的列數
+    """
+    reader = SnapshotReader(fileobj)
+    fields = reader.fields
+    columns = ", ".join(fields)
+    placeholders = ", ".join("?" for _ in fields)
+    updates = ", ".join(f"{f} = excluded.{f}" for f in fields[1:])
+    loaded = 0
+
+    def values():
+        nonlocal loaded
+        for row in reader:
+            loaded += 1
+            yield tuple(row[f] for f in fields)
+
+    with db.batch():
+        if replace:
+            db.conn.execute("DELETE FROM learning_progress")
+        db.conn.executemany(
+            f"""
+            INSERT INTO learning_progress ({columns}) VALUES ({placeholders})
+            ON CONFLICT(vocabulary_id) DO UPDATE SET {updates}
+        """,
+            values(),
+        )
+    return loaded
+
+
+def _json_size(db: VocabularyDatabase) -> int:
+    """同樣資料以 JSON 輸出的大小（比較用）"""
+    rows = [dict(row) for row in db.conn.execute(f"SELECT {', '.join(FIELDS)} FROM learning_progress")]
+    return len(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="學習進度二進位快照")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = sub.add_parser("export", help="匯出快照")
+    export_cmd.add_argument("path")
+    export_cmd.add_argument("--compare-json", action="store_true", help="同時顯示 JSON 大小")
+
+    import_cmd = sub.add_parser("import", help="匯入快照")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--replace", action="store_true", help="先清空現有進度")
+
+    args = parser.parse_args(argv)
+    db = open_database(args.db)
+
+    try:
+        if args.command == "export":
+            with open(args.path, "wb") as f:
+                count = export_progress(db, f)
+            size = Path(args.path).stat().st_size
+            print(f"✓ 匯出 {count} 筆學習進度：{args.path}（{size:,} bytes）")
+            if args.compare_json:
+                json_size = _json_size(db)
+                print(f"  JSON：{json_size:,} bytes，壓縮比 {json_size / max(size, 1):.1f}x")
+        else:
+            with open(args.path, "rb") as f:
+                count = import_progress(db, f, replace=args.replace)
+            print(f"✓ 匯入 {count} 筆學習進度")
+    except SnapshotError as e:
+        print(f"❌ 快照格式錯誤：{e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,12 @@ SM-2 間隔重複演算法
 用於計算單字複習的最佳間隔時間
 """
 
-from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Optional, Tuple
+
+import day_number
+
+# 單題作答時間上限（毫秒）；超過視為離開座位，只記上限值
+MAX_RESPONSE_MS = 60_000
 
 
 class SM2Algorithm:
@@ -25,6 +29,9 @@ class SM2Algorithm:
         self.max_ease_factor = 3.0  # 最大難度因子
         self.initial_ease_factor = 2.5  # 初始難度因子
         self.initial_intervals = [1, 3, 7]  # 前三次學習的固定間隔
+        self.slow_answer_ms = 8000  # 超過此作答時間的「會」視為勉強記得
+        self.slow_ease_penalty = 0.15  # 勉強記得時難度因子的降幅
+        self.slow_interval_factor = 1.2  # 勉強記得時間隔的成長倍數
 
     def calculate_next_review(
         self,
@@ -32,7 +39,7 @@ class SM2Algorithm:
         current_ease_factor: float = 2.5,
         current_interval_days: int = 0,
         review_count: int = 0,
-    ) -> Tuple[float, int, str]:
+    ) -> Tuple[float, int, int]:
         """計算下次複習時間
 
         Args:
@@ -42,7 +49,7 @@ class SM2Algorithm:
             review_count: 複習次數
 
         Returns:
-            (新的難度因子, 間隔天數, 下次複習日期)
+            (新的難度因子, 間隔天數, 下次複習日期（日序數）)
         """
         # 1. 計算新的難度因子
         new_ease_factor = self._calculate_ease_factor(rating, current_ease_factor)
@@ -63,7 +70,8 @@ class SM2Algorithm:
         current_ease_factor: float = 2.5,
         current_interval_days: int = 0,
         review_count: int = 0,
-    ) -> Tuple[float, int, str]:
+        response_ms: Optional[int] = None,
+    ) -> Tuple[float, int, int]:
         """使用二元「會」/「不會」評分計算下次複習時間
 
         基於 FSRS 和 Leitner 系統的簡化 SM-2 演算法
@@ -77,11 +85,25 @@ class SM2Algorithm:
             current_ease_factor: 當前難度因子
             current_interval_days: 當前間隔天數
             review_count: 複習次數
+            response_ms: 想起答案花的時間（毫秒），None 表示未計時；
+                超過 slow_answer_ms 的「會」視為勉強記得（類似 Anki 的 Hard）
 
         Returns:
-            (新的難度因子, 間隔天數, 下次複習日期)
+            (新的難度因子, 間隔天數, 下次複習日期（日序數）)
         """
-        if know:
+        if know and response_ms is not None and response_ms > self.slow_answer_ms:
+            # 「會」但想很久：難度因子下降，間隔只小幅成長
+            new_ease_factor = max(current_ease_factor - self.slow_ease_penalty, self.min_ease_factor)
+
+            if review_count < 3:
+                # 停留在上一個固定間隔，不往下一階前進
+                interval_days = self.initial_intervals[max(review_count - 1, 0)]
+            else:
+                interval_days = max(
+                    int(current_interval_days * self.slow_interval_factor),
+                    current_interval_days + 1,
+                )
+        elif know:
             # 「會」：難度因子小幅上升
             new_ease_factor = min(current_ease_factor + 0.1, self.max_ease_factor)
 
@@ -161,17 +183,16 @@ class SM2Algorithm:
         # 後續複習：使用難度因子
         return int(current_interval * ease_factor)
 
-    def _get_next_review_date(self, interval_days: int) -> str:
+    def _get_next_review_date(self, interval_days: int) -> int:
         """計算下次複習日期
 
         Args:
             interval_days: 間隔天數
 
         Returns:
-            日期字串 (YYYY-MM-DD)
+            日序數（距 1970-01-01 的天數）
         """
-        next_date = datetime.now() + timedelta(days=interval_days)
-        return next_date.strftime("%Y-%m-%d")
+        return day_number.today() + interval_days
 
 
 if __name__ == "__main__":
@@ -186,25 +207,25 @@ if __name__ == "__main__":
     ef, interval, next_review = sm2.calculate_next_review(
         rating=0, current_ease_factor=2.5, current_interval_days=0, review_count=0
     )
-    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {next_review}")
+    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {day_number.to_iso(next_review)}")
 
     # 測試情境 2：新單字，已經會了
     print("\n情境 2：新單字，已經會了 (rating=5)")
     ef, interval, next_review = sm2.calculate_next_review(
         rating=5, current_ease_factor=2.5, current_interval_days=0, review_count=0
     )
-    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {next_review}")
+    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {day_number.to_iso(next_review)}")
 
     # 測試情境 3：複習單字，簡單
     print("\n情境 3：複習單字 (第 3 次)，簡單 (rating=4)")
     ef, interval, next_review = sm2.calculate_next_review(
         rating=4, current_ease_factor=2.5, current_interval_days=6, review_count=2
     )
-    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {next_review}")
+    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {day_number.to_iso(next_review)}")
 
     # 測試情境 4：複習單字，忘記了
     print("\n情境 4：複習單字，忘記了 (rating=1)")
     ef, interval, next_review = sm2.calculate_next_review(
         rating=1, current_ease_factor=2.5, current_interval_days=15, review_count=5
     )
-    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {next_review}")
+    print(f"  難度因子: {ef:.2f}, 間隔: {interval} 天, 下次複習: {day_number.to_iso(next_review)}")
@@ -0,0 +1,336 @@
+"""
+無介面學習伺服器
+以 HTTP/JSON 提供 QuizEngine 的出題、作答與統計功能，
+讓 TUI 以外的客戶端（例如 PWA）共用同一套 SM-2 排程邏輯
+"""
+
+import argparse
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import day_number
+from json_http import HTTPError, JSONServer, Request
+from quiz_engine import QuizEngine
+
+# 寫入佇列的停止標記：排在它之前的作答都會寫完
+_STOP = (None, None)
+
+
+def _card_to_json(word) -> Dict:
+    """單字資料轉 JSON（日期以 YYYY-MM-DD 輸出，與 PWA 格式一致）"""
+    card = dict(word)
+    if "next_review" in card:
+        card["next_review"] = day_number.to_iso(card["next_review"])
+    return card
+
+
+class EnginePool:
+    """QuizEngine 連線池
+
+    每個 QuizEngine 綁定一條專屬執行緒（sqlite3 連線不可跨執行緒使用），
+    非同步請求借用其中一個引擎，在其執行緒上執行阻塞的資料庫呼叫。
+    """
+
+    def __init__(self, db_path: str, size: int = 4):
+        """初始化連線池
+
+        Args:
+            db_path: 資料庫路徑
+            size: 引擎（連線）數量
+        """
+        self.db_path = db_path
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots: List[Tuple[QuizEngine, ThreadPoolExecutor]] = []
+
+    async def open(self):
+        """建立所有引擎"""
+        loop = asyncio.get_running_loop()
+        for i in range(self.size):
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"engine-{i}")
+            engine = await loop.run_in_executor(executor, QuizEngine, self.db_path)
+            self._slots.append((engine, executor))
+            self._idle.put_nowait((engine, executor))
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Tuple[QuizEngine, ThreadPoolExecutor]]:
+        """借用一個引擎，離開區塊時歸還"""
+        slot = await self._idle.get()
+        try:
+            yield slot
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def run(self, fn: Callable[[QuizEngine], Any]) -> Any:
+        """借用引擎並在其執行緒上執行 fn(engine)"""
+        async with self.acquire() as (engine, executor):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, engine)
+
+    def note_writes(self, vocabulary_ids: List[int]):
+        """告知每個引擎這些單字已由其他連線寫入，讓複習佇列增量更新"""
+        for engine, _ in self._slots:
+            engine.note_external_writes(vocabulary_ids)
+
+    async def close(self):
+        """關閉所有引擎與執行緒"""
+        loop = asyncio.get_running_loop()
+        for engine, executor in self._slots:
+            await loop.run_in_executor(executor, engine.close)
+            executor.shutdown(wait=True)
+        self._slots.clear()
+
+
+class WriteCoalescer:
+    """作答寫入合併器
+
+    所有作答進入同一個佇列，由單一寫入引擎批次取出，
+    在一個交易內套用後只 commit 一次，避免每個請求各自 commit 互搶寫入鎖。
+    """
+
+    def __init__(
+        self,
+        pool: EnginePool,
+        max_batch: int = 64,
+        linger: float = 0.002,
+        on_commit: Optional[Callable[[List[int]], None]] = None,
+    ):
+        """初始化寫入合併器
+
+        Args:
+            pool: 只含一個引擎的寫入專用連線池
+            max_batch: 單一交易最多合併的作答數
+            linger: 收到第一筆後等待更多作答的秒數
+            on_commit: 每個批次 commit 後以寫入成功的單字 ID 呼叫
+        """
+        self.pool = pool
+        self.max_batch = max_batch
+        self.linger = linger
+        self.on_commit = on_commit
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+        self._closed = False
+        self.batches = 0  # 已寫入的交易數
+        self.answers = 0  # 已寫入的作答數
+
+    def start(self):
+        """啟動背景寫入工作"""
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, answer: Dict) -> Dict:
+        """排入一筆作答並等待寫入完成
+
+        Args:
+            answer: {"vocabulary_id", "know", "is_new_word"}
+
+        Returns:
+            更新後的進度資訊
+        """
+        if self._closed:
+            raise RuntimeError("write coalescer is closed")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((answer, future))
+        return await future
+
+    async def _run(self):
+        """持續取出佇列中的作答並批次寫入，取到停止標記時寫完手上的批次後結束"""
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            if self.linger:
+                await asyncio.sleep(self.linger)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """以單一交易寫入一批作答，並逐筆完成對應的 future"""
+        answers = [answer for answer, _ in batch]
+        try:
+            outcomes = await self.pool.run(lambda engine: self._apply_batch(engine, answers))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        written = []
+        for (answer, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                if not future.done():
+                    future.set_exception(outcome)
+                continue
+            self.answers += 1
+            written.append(answer["vocabulary_id"])
+            if not future.done():
+                future.set_result(outcome)
+        if written and self.on_commit:
+            self.on_commit(written)
+
+    @staticmethod
+    def _apply_batch(engine: QuizEngine, answers: List[Dict]) -> List:
+        """在寫入引擎的執行緒上以單一交易套用一批作答
+
+        每筆作答各自包在儲存點內，失敗的作答只復原自己的寫入，
+        不影響同一批的其他作答。
+
+        Returns:
+            與 answers 對應的更新結果，失敗的作答為其例外
+        """
+        outcomes = []
+        with engine.db.batch():
+            for answer in answers:
+                try:
+                    with engine.db.savepoint():
+                        outcomes.append(
+                            engine.submit_binary_answer(
+                                vocabulary_id=answer["vocabulary_id"],
+                                know=answer["know"],
+                                is_new_word=answer["is_new_word"],
+                            )
+                        )
+                except Exception as e:
+                    outcomes.append(e)
+        return outcomes
+
+    async def close(self):
+        """停止背景寫入工作
+
+        排入停止標記後等待背景工作結束：已排入的作答（含正在寫入的批次）都會寫完並 commit，
+        之後不再接受新的作答；若背景工作異常結束，仍在佇列中的作答以例外完成。
+        """
+        self._closed = True
+        if self._task:
+            self._queue.put_nowait(_STOP)
+            try:
+                await self._task
+            finally:
+                self._task = None
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not _STOP and not item[1].done():
+                        item[1].set_exception(RuntimeError("write coalescer is closed"))
+
+
+class StudyServer:
+    """學習伺服器：組合讀取連線池、寫入合併器與 HTTP 路由"""
+
+    def __init__(self, db_path: str = "data/vocabulary.db", pool_size: int = 4):
+        """初始化學習伺服器
+
+        Args:
+            db_path: 資料庫路徑
+            pool_size: 讀取用引擎數量
+        """
+        self.readers = EnginePool(db_path, size=pool_size)
+        self.writer = WriteCoalescer(
+            EnginePool(db_path, size=1), on_commit=self.readers.note_writes
+        )
+        self.http = JSONServer()
+        self._register_routes()
+
+    def _register_routes(self):
+        """註冊 API 路由"""
+        http = self.http
+
+        @http.route("GET", "/health")
+        async def health(request: Request):
+            return {"status": "ok"}
+
+        @http.route("GET", "/api/study/cards")
+        async def cards(request: Request):
+            mode = request.query.get("mode", "review")
+            if mode not in ("review", "new", "favorite"):
+                raise HTTPError(400, "INVALID_MODE", "mode must be review, new or favorite")
+            level = request.query_int("level")
+            limit = request.query_int("limit", 20)
+            if not 1 <= limit <= 500:
+                raise HTTPError(400, "INVALID_LIMIT", "limit must be between 1 and 500")
+
+            words = await self.readers.run(
+                lambda engine: engine.get_quiz_words(mode=mode, level=level, limit=limit)
+            )
+            return {"mode": mode, "cards": [_card_to_json(word) for word in words]}
+
+        @http.route("POST", "/api/study/answer")
+        async def answer(request: Request):
+            body = request.json()
+            vocabulary_id = body.get("vocabulary_id") if isinstance(body, dict) else None
+            know = body.get("know") if isinstance(body, dict) else None
+            if not isinstance(vocabulary_id, int) or not isinstance(know, bool):
+                raise HTTPError(
+                    400,
+                    "MISSING_FIELDS",
+                    "vocabulary_id (int) and know (bool) are required",
+                )
+            known = await self.readers.run(lambda engine: engine.db.has_word(vocabulary_id))
+            if not known:
+                raise HTTPError(404, "WORD_NOT_FOUND", f"No word with id {vocabulary_id}")
+            result = await self.writer.submit(
+                {
+                    "vocabulary_id": vocabulary_id,
+                    "know": know,
+                    "is_new_word": bool(body.get("is_new_word", False)),
+                }
+            )
+            return {**result, "next_review": day_number.to_iso(result["next_review"])}
+
+        @http.route("GET", "/api/study/stats")
+        async def stats(request: Request):
+            return await self.readers.run(lambda engine: engine.get_study_session_summary())
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8787):
+        """開啟資料庫連線並開始監聽"""
+        await self.readers.open()
+        await self.writer.pool.open()
+        self.writer.start()
+        await self.http.start(host, port)
+
+    async def close(self):
+        """停止服務並關閉所有連線"""
+        await self.http.close()
+        await self.writer.close()
+        await self.writer.pool.close()
+        await self.readers.close()
+
+
+async def serve(db_path: str, host: str, port: int, pool_size: int):
+    """啟動伺服器並持續執行直到中斷"""
+    server = StudyServer(db_path, pool_size=pool_size)
+    await server.start(host, port)
+    print(f"✓ 學習伺服器啟動：http://{host}:{server.http.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: List[str] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="VocaBoost 無介面學習伺服器")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--host", default="127.0.0.1", help="綁定位址")
+    parser.add_argument("--port", type=int, default=8787, help="連接埠")
+    parser.add_argument("--pool-size", type=int, default=4, help="讀取連線數")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.pool_size))
+    except KeyboardInterrupt:
+        print("\n伺服器已停止")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
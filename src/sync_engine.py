@@ -0,0 +1,364 @@
+"""
+增量同步引擎
+以逐列版本號追蹤學習進度與每日統計的變更，
+只傳送「某版本之後」的差異並以最後寫入者優先（LWW）合併
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+import day_number
+from database import VocabularyDatabase, open_database
+
+# 同步傳輸的欄位（以欄位表頭 + 陣列列傳送，比逐筆物件精簡）
+# 日期欄位在本機以日序數儲存，傳輸時使用與 PWA 相同的 YYYY-MM-DD 字串
+PROGRESS_FIELDS = (
+    "vocabulary_id",
+    "ease_factor",
+    "interval_days",
+    "next_review",
+    "review_count",
+    "correct_count",
+    "is_favorite",
+    "last_reviewed",
+    "updated_at",
+    "response_ms_total",
+    "response_count",
+    "last_response_ms",
+    "lapse_count",
+    "is_suspended",
+)
+# 後來加入的進度欄位：舊版客戶端或伺服器不會傳送（或傳 NULL），合併時保留原值
+ADDED_PROGRESS_FIELDS = (
+    "response_ms_total",
+    "response_count",
+    "last_response_ms",
+    "lapse_count",
+    "is_suspended",
+)
+SESSION_FIELDS = (
+    "date",
+    "new_words",
+    "reviewed_words",
+    "correct_count",
+    "total_count",
+    "updated_at",
+    "study_time_seconds",  # 後來加入，舊版資料沒有此欄位
+)
+
+# 每次拉取的列數上限
+PAGE_SIZE = 1000
+
+
+def merge_fields(record: Dict) -> List[str]:
+    """一筆遠端進度實際要合併的欄位（依 PROGRESS_FIELDS 順序）
+
+    後來加入的欄位缺少或為 NULL 時不合併，避免舊版資料把本機的值清空。
+    """
+    return [
+        field
+        for field in PROGRESS_FIELDS
+        if field not in ADDED_PROGRESS_FIELDS or record.get(field) is not None
+    ]
+
+
+def hash_pin(pin: str) -> str:
+    """PIN 碼的 SHA-256 雜湊（與 PWA 的 hashPin 相同）"""
+    return hashlib.sha256(pin.encode("utf-8")).hexdigest()
+
+
+class SyncEngine:
+    """本機資料庫的增量變更讀取與合併"""
+
+    def __init__(self, db: VocabularyDatabase):
+        """初始化同步引擎
+
+        Args:
+            db: 已連線的資料庫
+        """
+        self.db = db
+
+    def current_version(self) -> int:
+        """目前的本機變更版本號"""
+        return self.get_state("change_version")
+
+    def get_state(self, key: str) -> int:
+        """讀取同步狀態值（不存在時為 0）"""
+        row = self.db.conn.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def set_state(self, key: str, value: int):
+        """寫入同步狀態值"""
+        self.db.conn.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+        self.db._commit()
+
+    def changes_since(self, version: int, limit: int = PAGE_SIZE) -> Dict:
+        """取得指定版本之後的變更
+
+        Args:
+            version: 起始版本（不含）
+            limit: 每張表最多回傳的列數
+
+        Returns:
+            {"fields", "progress", "session_fields", "sessions", "version", "has_more"}
+        """
+        # 兩張表的查詢與版本號在同一個讀取交易內完成，
+        # 否則查詢後才提交的變更會被新版本號跳過
+        own_transaction = not self.db.conn.in_transaction
+        if own_transaction:
+            self.db.conn.execute("BEGIN")
+        try:
+            progress = self.db.conn.execute(
+                f"""
+                SELECT {", ".join(PROGRESS_FIELDS)}, version FROM learning_progress
+                WHERE version > ?
+                ORDER BY version
+                LIMIT ?
+            """,
+                (version, limit),
+            ).fetchall()
+            sessions = self.db.conn.execute(
+                f"""
+                SELECT {", ".join(SESSION_FIELDS)}, version FROM study_sessions
+                WHERE version > ?
+                ORDER BY version
+                LIMIT ?
+            """,
+                (version, limit),
+            ).fetchall()
+
+            has_more = len(progress) == limit or len(sessions) == limit
+            if has_more:
+                # 只回傳兩張表都完整涵蓋的版本範圍，下一頁從該版本繼續
+                last = min(
+                    progress[-1]["version"] if len(progress) == limit else float("inf"),
+                    sessions[-1]["version"] if len(sessions) == limit else float("inf"),
+                )
+                progress = [row for row in progress if row["version"] <= last]
+                sessions = [row for row in sessions if row["version"] <= last]
+                new_version = last
+            else:
+                new_version = self.current_version()
+        finally:
+            if own_transaction:
+                self.db.conn.commit()
+
+        return {
+            "fields": list(PROGRESS_FIELDS),
+            "progress": [self._progress_to_wire(row) for row in progress],
+            "session_fields": list(SESSION_FIELDS),
+            "sessions": [self._session_to_wire(row) for row in sessions],
+            "version": new_version,
+            "has_more": has_more,
+        }
+
+    @staticmethod
+    def _progress_to_wire(row) -> List:
+        values = list(row)[:-1]
+        values[PROGRESS_FIELDS.index("next_review")] = day_number.to_iso(row["next_review"])
+        return values
+
+    @staticmethod
+    def _session_to_wire(row) -> List:
+        values = list(row)[:-1]
+        values[0] = day_number.to_iso(row["date"])
+        return values
+
+    def apply_changes(self, changes: Dict, advance_cursor: Optional[str] = None) -> int:
+        """合併遠端變更到本機
+
+        學習進度以 updated_at 較新者為準；每日統計逐欄取最大值（與 syncMerge.ts 相同）。
+        沒有實際改變的列不會被寫入，因此不會產生新的版本號。
+
+        Args:
+            changes: changes_since 格式的變更
+            advance_cursor: 推送游標的狀態鍵；若游標已追上本機版本，合併後一併前移，
+                避免剛拉下的遠端變更在下次同步時又被推回
+
+        Returns:
+            實際寫入的列數
+        """
+        progress_fields = changes.get("fields", PROGRESS_FIELDS)
+        session_fields = changes.get("session_fields", SESSION_FIELDS)
+        applied = 0
+
+        # batch() 進入時即取得寫入鎖，確保這段期間的新版本號都來自本次合併
+        with self.db.batch():
+            before = self.current_version()
+
+            for values in changes.get("progress", []):
+                record = dict(zip(progress_fields, values))
+                record["next_review"] = day_number.from_iso(record.get("next_review"))
+                applied += self._merge_progress(record)
+            for values in changes.get("sessions", []):
+                record = dict(zip(session_fields, values))
+                record["date"] = day_number.from_iso(record["date"])
+                applied += self._merge_session(record)
+
+            if advance_cursor and self.get_state(advance_cursor) == before:
+                self.set_state(advance_cursor, self.current_version())
+
+        return applied
+
+    def _merge_progress(self, record: Dict) -> int:
+        """以 LWW 合併單筆學習進度（只合併 merge_fields 的欄位，其餘保留本機值或預設值）"""
+        fields = merge_fields(record)
+        cursor = self.db.conn.execute(
+            f"""
+            INSERT INTO learning_progress ({", ".join(fields)})
+            VALUES ({", ".join("?" for _ in fields)})
+            ON CONFLICT(vocabulary_id) DO UPDATE SET
+                {", ".join(f"{f} = excluded.{f}" for f in fields[1:])}
+            WHERE excluded.updated_at > COALESCE(learning_progress.updated_at, 0)
+        """,
+            tuple(record.get(field) for field in fields),
+        )
+        return cursor.rowcount
+
+    def _merge_session(self, record: Dict) -> int:
+        """以逐欄最大值合併單日統計（舊版資料沒有 study_time_seconds 時保留本機的值）"""
+        cursor = self.db.conn.execute(
+            """
+            INSERT INTO study_sessions
+            (date, new_words, reviewed_words, correct_count, total_count, updated_at,
+             study_time_seconds)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, 0))
+            ON CONFLICT(date) DO UPDATE SET
+                new_words = MAX(new_words, excluded.new_words),
+                reviewed_words = MAX(reviewed_words, excluded.reviewed_words),
+                correct_count = MAX(correct_count, excluded.correct_count),
+                total_count = MAX(total_count, excluded.total_count),
+                updated_at = MAX(COALESCE(updated_at, 0), excluded.updated_at),
+                study_time_seconds = MAX(
+                    COALESCE(study_time_seconds, 0), excluded.study_time_seconds
+                )
+            WHERE excluded.new_words > new_words
+               OR excluded.reviewed_words > reviewed_words
+               OR excluded.correct_count > correct_count
+               OR excluded.total_count > total_count
+               OR excluded.study_time_seconds > COALESCE(study_time_seconds, 0)
+        """,
+            tuple(record.get(field) for field in SESSION_FIELDS),
+        )
+        return cursor.rowcount
+
+
+class SyncClient:
+    """透過 HTTP 與同步伺服器交換增量變更"""
+
+    def __init__(
+        self,
+        engine: SyncEngine,
+        base_url: str,
+        username: str,
+        tag: str,
+        pin: str,
+        timeout: float = 10.0,
+    ):
+        """初始化同步客戶端
+
+        Args:
+            engine: 本機同步引擎
+            base_url: 同步伺服器網址（例如 http://127.0.0.1:8788）
+            username: 使用者名稱
+            tag: 帳號識別碼
+            pin: PIN 碼
+            timeout: 請求逾時秒數
+        """
+        self.engine = engine
+        self.base_url = base_url.rstrip("/")
+        self.credentials = {"username": username, "tag": tag, "pinHash": hash_pin(pin)}
+        self.timeout = timeout
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def _post(self, path: str, payload: Dict) -> Dict:
+        """送出 JSON 請求"""
+        body = json.dumps({**self.credentials, **payload}, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        self.bytes_sent += len(body)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read()
+        except urllib.error.HTTPError as e:
+            data = e.read()
+            self.bytes_received += len(data)
+            error = json.loads(data or b"{}")
+            raise RuntimeError(f"{e.code} {error.get('error')}: {error.get('message', '')}")
+        self.bytes_received += len(data)
+        return json.loads(data)
+
+    def sync(self) -> Tuple[int, int]:
+        """推送本機變更並拉取遠端變更
+
+        Returns:
+            (推送的列數, 本機實際合併的列數)
+        """
+        # 1. 推送上次同步之後的本機變更
+        pushed = 0
+        local_cursor = self.engine.get_state("pushed_version")
+        while True:
+            changes = self.engine.changes_since(local_cursor)
+            if changes["progress"] or changes["sessions"]:
+                self._post("/api/sync/push", {"changes": changes})
+                pushed += len(changes["progress"]) + len(changes["sessions"])
+            local_cursor = changes["version"]
+            if not changes["has_more"]:
+                break
+        self.engine.set_state("pushed_version", local_cursor)
+
+        # 2. 拉取遠端變更（剛推送的列也會被拉回，但合併時不會造成實際寫入）
+        applied = 0
+        remote_cursor = self.engine.get_state("remote_version")
+        while True:
+            changes = self._post("/api/sync/changes", {"since": remote_cursor})
+            applied += self.engine.apply_changes(changes, advance_cursor="pushed_version")
+            remote_cursor = changes["version"]
+            if not changes["has_more"]:
+                break
+        self.engine.set_state("remote_version", remote_cursor)
+
+        return pushed, applied
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="與同步伺服器交換增量學習進度")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--server", default="http://127.0.0.1:8788", help="同步伺服器網址")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--tag", required=True)
+    parser.add_argument("--pin", required=True)
+    args = parser.parse_args(argv)
+
+    db = open_database(args.db)
+    client = SyncClient(SyncEngine(db), args.server, args.username, args.tag, args.pin)
+    try:
+        pushed, applied = client.sync()
+    except (RuntimeError, urllib.error.URLError) as e:
+        print(f"❌ 同步失敗：{e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✓ 同步完成：推送 {pushed} 列，合併 {applied} 列")
+    print(f"  傳送 {client.bytes_sent:,} bytes，接收 {client.bytes_received:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+本機同步伺服器
+以 SQLite 模擬 vocaboost-workers 的 /api/sync 端點，不需要 Cloudflare 即可開發與測試；
+除了原有的整包加密資料上傳/下載，另提供逐列增量的 push / changes 端點
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import string
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from json_http import HTTPError, JSONServer, Request
+from sync_engine import PAGE_SIZE, PROGRESS_FIELDS, SESSION_FIELDS, merge_fields
+
+TAG_CHARS = string.ascii_uppercase + string.digits
+
+
+class LocalSyncStore:
+    """同步伺服器的本機儲存（對應 Workers 的 D1 資料表）"""
+
+    def __init__(self, db_path: str = "data/sync_server.db"):
+        """初始化儲存並建立資料表
+
+        Args:
+            db_path: 資料庫檔案路徑
+        """
+        path = Path(db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self._initialize_schema()
+
+    def _initialize_schema(self):
+        """建立資料表（user_sync 與 Workers schema.sql 相同，另加增量版本號）"""
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS user_sync (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                tag TEXT NOT NULL UNIQUE,
+                pin_hash TEXT NOT NULL,
+                encrypted_data TEXT NOT NULL,
+                encryption_meta TEXT NOT NULL,
+                data_version INTEGER NOT NULL DEFAULT 1,
+                change_version INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+            CREATE INDEX IF NOT EXISTS idx_user_sync_username ON user_sync(username);
+
+            CREATE TABLE IF NOT EXISTS sync_progress (
+                account_id INTEGER NOT NULL,
+                {", ".join(f"{field} NUMERIC" for field in PROGRESS_FIELDS)},
+                version INTEGER NOT NULL,
+                PRIMARY KEY (account_id, vocabulary_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_sync_progress_version
+                ON sync_progress(account_id, version);
+
+            CREATE TABLE IF NOT EXISTS sync_sessions (
+                account_id INTEGER NOT NULL,
+                {", ".join(f"{field} NUMERIC" for field in SESSION_FIELDS)},
+                version INTEGER NOT NULL,
+                PRIMARY KEY (account_id, date)
+            );
+            CREATE INDEX IF NOT EXISTS idx_sync_sessions_version
+                ON sync_sessions(account_id, version);
+        """)
+
+        # 舊版建立的資料表補上後來加入的欄位
+        for table, fields in (
+            ("sync_progress", PROGRESS_FIELDS),
+            ("sync_sessions", SESSION_FIELDS),
+        ):
+            columns = {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for field in fields:
+                if field not in columns:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {field} NUMERIC")
+        self.conn.commit()
+
+    def close(self):
+        """關閉資料庫連接"""
+        self.conn.close()
+
+    # ========== 帳號 ==========
+
+    def authenticate(self, body: Dict) -> sqlite3.Row:
+        """驗證 username / tag / pinHash
+
+        Raises:
+            HTTPError: 欄位缺漏、帳號不存在或 PIN 錯誤
+        """
+        username, tag, pin_hash = body.get("username"), body.get("tag"), body.get("pinHash")
+        if not username or not tag or not pin_hash:
+            raise HTTPError(400, "MISSING_FIELDS")
+
+        record = self.conn.execute(
+            "SELECT * FROM user_sync WHERE username = ? AND tag = ?", (username, tag)
+        ).fetchone()
+        if not record:
+            raise HTTPError(404, "USER_NOT_FOUND")
+        if record["pin_hash"] != pin_hash:
+            raise HTTPError(401, "INVALID_PIN")
+        return record
+
+    def register(self, username: str, pin_hash: str, encrypted_data: str, meta: str) -> str:
+        """建立帳號並回傳唯一的 6 碼 tag"""
+        while True:
+            tag = "".join(random.choice(TAG_CHARS) for _ in range(6))
+            try:
+                self.conn.execute(
+                    """
+                    INSERT INTO user_sync (username, tag, pin_hash, encrypted_data, encryption_meta)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (username, tag, pin_hash, encrypted_data, meta),
+                )
+                self.conn.commit()
+                return tag
+            except sqlite3.IntegrityError:
+                continue
+
+    # ========== 增量變更 ==========
+
+    def push(self, account: sqlite3.Row, changes: Dict) -> int:
+        """合併客戶端推送的變更，每筆實際寫入的列取得新的帳號版本號
+
+        Returns:
+            合併後的帳號版本號
+        """
+        version = account["change_version"]
+        progress_fields = changes.get("fields", PROGRESS_FIELDS)
+        session_fields = changes.get("session_fields", SESSION_FIELDS)
+
+        for values in changes.get("progress", []):
+            record = dict(zip(progress_fields, values))
+            fields = merge_fields(record)
+            cursor = self.conn.execute(
+                f"""
+                INSERT INTO sync_progress (account_id, {", ".join(fields)}, version)
+                VALUES (?, {", ".join("?" for _ in fields)}, ?)
+                ON CONFLICT(account_id, vocabulary_id) DO UPDATE SET
+                    {", ".join(f"{f} = excluded.{f}" for f in fields[1:])},
+                    version = excluded.version
+                WHERE excluded.updated_at > COALESCE(sync_progress.updated_at, 0)
+            """,
+                (account["id"], *(record.get(f) for f in fields), version + 1),
+            )
+            version += cursor.rowcount
+
+        for values in changes.get("sessions", []):
+            record = dict(zip(session_fields, values))
+            cursor = self.conn.execute(
+                """
+                INSERT INTO sync_sessions
+                (account_id, date, new_words, reviewed_words, correct_count, total_count,
+                 updated_at, study_time_seconds, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, 0), ?)
+                ON CONFLICT(account_id, date) DO UPDATE SET
+                    new_words = MAX(new_words, excluded.new_words),
+                    reviewed_words = MAX(reviewed_words, excluded.reviewed_words),
+                    correct_count = MAX(correct_count, excluded.correct_count),
+                    total_count = MAX(total_count, excluded.total_count),
+                    updated_at = MAX(COALESCE(updated_at, 0), excluded.updated_at),
+                    study_time_seconds = MAX(
+                        COALESCE(study_time_seconds, 0), excluded.study_time_seconds
+                    ),
+                    version = excluded.version
+                WHERE excluded.new_words > new_words
+                   OR excluded.reviewed_words > reviewed_words
+                   OR excluded.correct_count > correct_count
+                   OR excluded.total_count > total_count
+                   OR excluded.study_time_seconds > COALESCE(study_time_seconds, 0)
+            """,
+                (account["id"], *(record.get(f) for f in SESSION_FIELDS), version + 1),
+            )
+            version += cursor.rowcount
+
+        self.conn.execute(
+            "UPDATE user_sync SET change_version = ?, updated_at = datetime('now') WHERE id = ?",
+            (version, account["id"]),
+        )
+        self.conn.commit()
+        return version
+
+    def changes_since(self, account: sqlite3.Row, since: int, limit: int = PAGE_SIZE) -> Dict:
+        """取得帳號在指定版本之後的變更（格式同 SyncEngine.changes_since）"""
+        rows = {}
+        for name, table, fields in (
+            ("progress", "sync_progress", PROGRESS_FIELDS),
+            ("sessions", "sync_sessions", SESSION_FIELDS),
+        ):
+            rows[name] = self.conn.execute(
+                f"""
+                SELECT {", ".join(fields)}, version FROM {table}
+                WHERE account_id = ? AND version > ?
+                ORDER BY version
+                LIMIT ?
+            """,
+                (account["id"], since, limit),
+            ).fetchall()
+
+        has_more = any(len(r) == limit for r in rows.values())
+        if has_more:
+            last = min(r[-1]["version"] for r in rows.values() if len(r) == limit)
+            rows = {name: [row for row in r if row["version"] <= last] for name, r in rows.items()}
+            version = last
+        else:
+            version = account["change_version"]
+
+        return {
+            "fields": list(PROGRESS_FIELDS),
+            "progress": [list(row)[:-1] for row in rows["progress"]],
+            "session_fields": list(SESSION_FIELDS),
+            "sessions": [list(row)[:-1] for row in rows["sessions"]],
+            "version": version,
+            "has_more": has_more,
+        }
+
+
+def create_app(store: LocalSyncStore) -> JSONServer:
+    """建立同步 API 路由
+
+    端點與 vocaboost-workers/src/routes/sync.ts 相容（本機版不做速率限制與帳號鎖定），
+    並新增 /push 與 /changes 兩個增量端點。
+    """
+    app = JSONServer()
+
+    @app.route("POST", "/api/sync/register")
+    async def register(request: Request):
+        body = request.json()
+        username = body.get("username")
+        if not all(body.get(k) for k in ("username", "pinHash", "encryptedData", "encryptionMeta")):
+            raise HTTPError(
+                400,
+                "MISSING_FIELDS",
+                "Username, pinHash, encryptedData, and encryptionMeta are required",
+            )
+        if not 2 <= len(username) <= 20:
+            raise HTTPError(400, "INVALID_USERNAME", "Username must be between 2 and 20 characters")
+
+        tag = store.register(
+            username, body["pinHash"], body["encryptedData"], json.dumps(body["encryptionMeta"])
+        )
+        return 201, {"success": True, "tag": tag, "fullId": f"{username}#{tag}", "dataVersion": 1}
+
+    @app.route("POST", "/api/sync/login")
+    async def login(request: Request):
+        account = store.authenticate(request.json())
+        return {
+            "success": True,
+            "dataVersion": account["data_version"],
+            "updatedAt": account["updated_at"],
+        }
+
+    @app.route("POST", "/api/sync/upload")
+    async def upload(request: Request):
+        body = request.json()
+        account = store.authenticate(body)
+        if not body.get("encryptedData") or not body.get("encryptionMeta"):
+            raise HTTPError(400, "MISSING_FIELDS")
+
+        expected = body.get("expectedVersion")
+        if expected is not None and account["data_version"] != expected:
+            return 409, {
+                "error": "VERSION_CONFLICT",
+                "serverVersion": account["data_version"],
+                "message": "Data has been modified on another device",
+            }
+
+        new_version = account["data_version"] + 1
+        store.conn.execute(
+            """
+            UPDATE user_sync
+            SET encrypted_data = ?, encryption_meta = ?, data_version = ?,
+                updated_at = datetime('now')
+            WHERE id = ?
+        """,
+            (body["encryptedData"], json.dumps(body["encryptionMeta"]), new_version, account["id"]),
+        )
+        store.conn.commit()
+        return {"success": True, "dataVersion": new_version}
+
+    @app.route("POST", "/api/sync/download")
+    async def download(request: Request):
+        account = store.authenticate(request.json())
+        return {
+            "encryptedData": account["encrypted_data"],
+            "encryptionMeta": json.loads(account["encryption_meta"]),
+            "dataVersion": account["data_version"],
+            "updatedAt": account["updated_at"],
+        }
+
+    @app.route("GET", "/api/sync/check/:tag")
+    async def check(request: Request):
+        tag = request.params["tag"]
+        if len(tag) != 6:
+            raise HTTPError(400, "INVALID_TAG")
+        record = store.conn.execute(
+            "SELECT updated_at FROM user_sync WHERE tag = ?", (tag,)
+        ).fetchone()
+        if record:
+            return {"exists": True, "updatedAt": record["updated_at"]}
+        return {"exists": False}
+
+    @app.route("DELETE", "/api/sync/delete")
+    async def delete(request: Request):
+        account = store.authenticate(request.json())
+        for table in ("sync_progress", "sync_sessions"):
+            store.conn.execute(f"DELETE FROM {table} WHERE account_id = ?", (account["id"],))
+        store.conn.execute("DELETE FROM user_sync WHERE id = ?", (account["id"],))
+        store.conn.commit()
+        return {"success": True, "message": "Sync account deleted"}
+
+    @app.route("POST", "/api/sync/push")
+    async def push(request: Request):
+        body = request.json()
+        account = store.authenticate(body)
+        changes = body.get("changes")
+        if not isinstance(changes, dict):
+            raise HTTPError(400, "MISSING_FIELDS", "changes is required")
+        return {"success": True, "version": store.push(account, changes)}
+
+    @app.route("POST", "/api/sync/changes")
+    async def changes(request: Request):
+        body = request.json()
+        account = store.authenticate(body)
+        since = body.get("since", 0)
+        if not isinstance(since, int) or since < 0:
+            raise HTTPError(400, "INVALID_PARAMETER", "since must be a non-negative integer")
+        return store.changes_since(account, since)
+
+    return app
+
+
+async def serve(db_path: str, host: str, port: int):
+    """啟動伺服器並持續執行直到中斷"""
+    store = LocalSyncStore(db_path)
+    app = create_app(store)
+    await app.start(host, port)
+    print(f"✓ 本機同步伺服器啟動：http://{host}:{app.port}/api/sync")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await app.close()
+        store.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="VocaBoost 本機同步伺服器")
+    parser.add_argument("--db", default="data/sync_server.db", help="伺服器資料庫路徑")
+    parser.add_argument("--host", default="127.0.0.1", help="綁定位址")
+    parser.add_argument("--port", type=int, default=8788, help="連接埠")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n伺服器已停止")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
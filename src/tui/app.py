@@ -52,6 +52,42 @@ class VocabularyLearningApp(App):
         # 預設顯示主選單
         from tui.screens.home import HomeScreen
         self.push_screen(HomeScreen())
+        self._offer_resume()
+
+    def _offer_resume(self) -> None:
+        """有未完成的學習檢查點時詢問是否繼續"""
+        from session_checkpoint import SessionCheckpoint, load_checkpoint
+        from tui.screens.resume import ResumeScreen
+
+        state = load_checkpoint()
+        if state is None:
+            SessionCheckpoint().finish()  # 清除已完成或沒有未寫入作答的檢查點
+            return
+
+        def discard() -> None:
+            # 不繼續流程，但中斷前最後幾題的作答仍要寫入（已寫入的略過）
+            if state.unflushed:
+                from quiz_engine import QuizEngine
+                engine = QuizEngine()
+                state.drop_written(engine.db)
+                for args in state.unflushed:
+                    engine.submit_binary_answer(*args)
+                engine.close()
+            SessionCheckpoint().finish()
+
+        # 題目都答完或是之前某天的流程：不詢問，只補寫未寫入的作答
+        if state.remaining <= 0 or state.stale:
+            discard()
+            return
+
+        def on_answer(resume: bool) -> None:
+            if resume:
+                from tui.screens.study import StudyScreen
+                self.push_screen(StudyScreen(resume=state))
+            else:
+                discard()
+
+        self.push_screen(ResumeScreen(state), on_answer)
 
     def action_show_home(self) -> None:
         """顯示主選單"""
@@ -1,6 +1,6 @@
 """
 收藏難詞畫面
-顯示和管理收藏的難詞
+顯示和管理收藏的難詞；列表以 keyset 分頁，捲動到接近底部時才載入下一頁
 """
 
 import sys
@@ -8,12 +8,34 @@ sys.path.insert(0, '/Users/bs10081/Developer/7000-english-vocabulary-trainer/src
 
 from textual.screen import Screen
 from textual.app import ComposeResult
-from textual.widgets import Static, Label, DataTable
+from textual.message import Message
+from textual.widgets import Static, Label, DataTable, Input
 from textual.containers import Container, Vertical
 from textual.binding import Binding
 
 from quiz_engine import QuizEngine
 
+# 每次載入的列數
+PAGE_SIZE = 50
+
+# 距離已載入的最後一列少於此列數時載入下一頁
+LOAD_AHEAD = 10
+
+# 排序方式
+SORT_ORDERS = {"level": "級別", "word": "字母"}
+
+
+class FavoritesTable(DataTable):
+    """捲動接近已載入列的底部時發出 NearEnd 的表格"""
+
+    class NearEnd(Message):
+        """需要載入下一頁"""
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value >= self.max_scroll_y - LOAD_AHEAD:
+            self.post_message(self.NearEnd())
+
 
 class FavoritesScreen(Screen):
     """收藏難詞畫面"""
@@ -38,6 +60,11 @@ class FavoritesScreen(Screen):
         background: $panel;
     }
 
+    .filter-input {
+        width: 100%;
+        margin: 0 0 1 0;
+    }
+
     .favorites-table {
         width: 100%;
         height: 30;
@@ -54,39 +81,40 @@ class FavoritesScreen(Screen):
         Binding("escape", "app.pop_screen", "返回"),
         Binding("q", "app.pop_screen", "返回"),
         Binding("enter", "start_review", "開始複習"),
+        Binding("slash", "focus_filter", "篩選"),
+        Binding("ctrl+o", "toggle_order", "切換排序"),
     ]
 
     def __init__(self):
         """初始化收藏畫面"""
         super().__init__()
         self.quiz_engine = QuizEngine()
+        self.order = "level"
+        self.keyword = ""
+        self.after = None  # 已載入最後一列的排序鍵
+        self.exhausted = False  # 已載入全部符合的列
 
     def compose(self) -> ComposeResult:
-        """組合 UI 元件"""
-        favorites = self.quiz_engine.get_quiz_words(mode="favorite")
+        """組合 UI 元件（只計算數量，列在畫面載入後逐頁讀取）"""
+        total = self.quiz_engine.db.count_favorite_words()
 
         with Container():
-            yield Label(f"⭐ 收藏難詞 ({len(favorites)} 個)", classes="title")
+            yield Label(f"⭐ 收藏難詞 ({total} 個)", classes="title")
 
             with Vertical(classes="favorites-container"):
-                if favorites:
-                    # 建立表格
-                    table = DataTable(id="favorites_table", classes="favorites-table")
+                if total:
+                    yield Input(
+                        placeholder="篩選：輸入英文開頭或中文翻譯",
+                        id="favorites_filter",
+                        classes="filter-input",
+                    )
+                    table = FavoritesTable(id="favorites_table", classes="favorites-table")
                     table.add_columns("單字", "音標", "詞性", "翻譯", "複習次數")
-
-                    for word in favorites:
-                        review_count = word.get('review_count', 0)
-                        table.add_row(
-                            word['word'],
-                            f"[{word['phonetic']}]",
-                            word['part_of_speech'],
-                            word['translation'][:30] + "..." if len(word['translation']) > 30 else word['translation'],
-                            str(review_count)
-                        )
-
                     yield table
+                    yield Static("", id="favorites_status", classes="hint-text")
                     yield Static(
-                        "\n按 [Enter] 開始複習收藏的難詞\n按 [ESC] 或 [Q] 返回主選單",
+                        "按 [Enter] 開始複習收藏的難詞    按 [/] 篩選    按 [Ctrl+O] 切換排序\n"
+                        "按 [ESC] 或 [Q] 返回主選單",
                         classes="hint-text"
                     )
                 else:
@@ -97,10 +125,100 @@ class FavoritesScreen(Screen):
                         classes="hint-text"
                     )
 
+    def on_mount(self) -> None:
+        """畫面載入時讀取第一頁"""
+        if self.query("#favorites_table"):
+            self.query_one("#favorites_table", DataTable).focus()
+            self._reload()
+
+    def _reload(self) -> None:
+        """依目前的篩選與排序清空表格，重新從第一頁載入"""
+        self.query_one("#favorites_table", DataTable).clear()
+        self.after = None
+        self.exhausted = False
+        self._load_next_page()
+        self._update_status()
+
+    def _load_next_page(self) -> None:
+        """讀取下一頁並附加到表格末端"""
+        if self.exhausted:
+            return
+        words = self.quiz_engine.db.get_favorite_words_page(
+            after=self.after, limit=PAGE_SIZE, order=self.order, keyword=self.keyword or None
+        )
+        table = self.query_one("#favorites_table", DataTable)
+        for word in words:
+            table.add_row(
+                word['word'],
+                f"[{word['phonetic']}]",
+                word['part_of_speech'],
+                word['short_translation'],
+                str(word['review_count'] or 0),
+                key=str(word['id']),
+            )
+
+        if len(words) < PAGE_SIZE:
+            self.exhausted = True
+        if words:
+            last = words[-1]
+            if self.order == "word":
+                self.after = (last['word'], last['id'])
+            else:
+                self.after = (last['level'], last['word'], last['id'])
+
+    def _update_status(self) -> None:
+        """顯示排序方式、篩選條件與已載入列數"""
+        table = self.query_one("#favorites_table", DataTable)
+        text = f"依{SORT_ORDERS[self.order]}排序"
+        if self.keyword:
+            text += f"，篩選「{self.keyword}」"
+        if self.exhausted:
+            text += f"：共 {table.row_count} 個"
+        else:
+            text += f"：已載入 {table.row_count} 個，往下捲動載入更多"
+        self.query_one("#favorites_status", Static).update(text)
+
+    def _load_more(self) -> None:
+        """還有未載入的列時載入下一頁"""
+        if not self.exhausted:
+            self._load_next_page()
+            self._update_status()
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """游標移到接近已載入的最後一列時載入下一頁"""
+        if event.cursor_row >= event.data_table.row_count - LOAD_AHEAD:
+            self._load_more()
+
+    def on_favorites_table_near_end(self, event: FavoritesTable.NearEnd) -> None:
+        """捲動到接近底部時載入下一頁"""
+        self._load_more()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """逐字更新篩選（只重新讀取第一頁）"""
+        keyword = event.value.strip()
+        if keyword != self.keyword:
+            self.keyword = keyword
+            self._reload()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """按 Enter 回到表格"""
+        self.query_one("#favorites_table", DataTable).focus()
+
+    def action_focus_filter(self) -> None:
+        """移到篩選欄位"""
+        if self.query("#favorites_filter"):
+            self.query_one("#favorites_filter", Input).focus()
+
+    def action_toggle_order(self) -> None:
+        """切換依級別 / 依字母排序"""
+        if not self.query("#favorites_table"):
+            return
+        self.order = "word" if self.order == "level" else "level"
+        self._reload()
+
     def action_start_review(self) -> None:
         """開始複習收藏的難詞"""
-        favorites = self.quiz_engine.get_quiz_words(mode="favorite")
-        if favorites:
+        if self.quiz_engine.db.count_favorite_words():
             from tui.screens.study import StudyScreen
             self.app.push_screen(StudyScreen(mode="favorite"))
 
@@ -15,6 +15,9 @@ from textual.widgets import Button, Label, Static
 
 from quiz_engine import QuizEngine
 
+# 作答方式 → 顯示名稱（按 M 依序切換）
+QUIZ_STYLES = {"flashcard": "翻牌", "mc": "選擇題", "typed": "拼字"}
+
 
 class HomeScreen(Screen):
     """主選單畫面"""
@@ -87,6 +90,7 @@ class HomeScreen(Screen):
         Binding("3", "start_favorites", "難詞複習"),
         Binding("4", "show_stats", "學習統計"),
         Binding("5", "search_word", "搜尋單字"),
+        Binding("m", "toggle_quiz_style", "切換作答方式"),
         Binding("q", "quit_app", "離開"),
         Binding("up", "navigate_up", "向上"),
         Binding("down", "navigate_down", "向下"),
@@ -101,6 +105,7 @@ class HomeScreen(Screen):
         self.quiz_engine = QuizEngine()
         self.focused_index = 0  # 聚焦的按鈕索引 (0-5)
         self.selected_level = 1  # 選擇的學習級別 (1-6)
+        self.quiz_style = "flashcard"  # 作答方式 ("flashcard" 翻牌, "mc" 選擇題, "typed" 拼字)
         self.button_ids = [
             "btn_review",
             "btn_new",
@@ -114,7 +119,8 @@ class HomeScreen(Screen):
         """組合 UI 元件"""
         # 取得統計資料
         stats = self.quiz_engine.get_study_session_summary()
-        due_words = self.quiz_engine.get_quiz_words(mode="review", limit=500)
+        plan_words = self.quiz_engine.get_quiz_words(mode="plan")
+        plan_new = sum(1 for word in plan_words if word["kind"] == "new")
         favorite_count = len(self.quiz_engine.get_quiz_words(mode="favorite"))
 
         # 取得當前選擇 Level 的新單字數量
@@ -132,7 +138,7 @@ class HomeScreen(Screen):
                 )
 
                 yield Button(
-                    f"[1] 📖 開始今日學習        待複習: {len(due_words)} 個",
+                    f"[1] 📖 開始今日學習        複習: {len(plan_words) - plan_new} 個 / 新: {plan_new} 個",
                     id="btn_review",
                     classes="menu-button",
                 )
@@ -149,6 +155,10 @@ class HomeScreen(Screen):
                 yield Button("[4] 📊 學習統計", id="btn_stats", classes="menu-button")
                 yield Button("[5] 🔍 搜尋單字", id="btn_search", classes="menu-button")
 
+                yield Static(
+                    self._quiz_style_text(), id="quiz_style_text", classes="info-text"
+                )
+
                 yield Static(
                     f"\n總進度: {stats['total_learned']}/{stats['total_words']} "
                     f"({round(stats['total_learned'] * 100 / stats['total_words'], 1)}%)",
@@ -166,8 +176,18 @@ class HomeScreen(Screen):
         Returns:
             新單字數量
         """
-        new_words = self.quiz_engine.get_quiz_words(mode="new", level=level, limit=1000)
-        return len(new_words)
+        return self.quiz_engine.db.count_new_words(level)
+
+    def _quiz_style_text(self) -> str:
+        """作答方式說明文字"""
+        style = QUIZ_STYLES[self.quiz_style]
+        return f"作答方式: {style}  [M 切換]"
+
+    def action_toggle_quiz_style(self) -> None:
+        """依序切換翻牌 / 選擇題 / 拼字作答（按 M）"""
+        styles = list(QUIZ_STYLES)
+        self.quiz_style = styles[(styles.index(self.quiz_style) + 1) % len(styles)]
+        self.query_one("#quiz_style_text", Static).update(self._quiz_style_text())
 
     def on_mount(self) -> None:
         """畫面載入時設置初始聚焦"""
@@ -254,7 +274,7 @@ class HomeScreen(Screen):
         """開始複習"""
         from tui.screens.study import StudyScreen
 
-        self.app.push_screen(StudyScreen(mode="review"))
+        self.app.push_screen(StudyScreen(mode="review", quiz_style=self.quiz_style))
 
     def action_start_new(self) -> None:
         """學習新單字"""
@@ -272,13 +292,13 @@ class HomeScreen(Screen):
         from tui.screens.study import StudyScreen
 
         # 使用用戶選擇的 Level
-        self.app.push_screen(StudyScreen(mode="new", level=self.selected_level))
+        self.app.push_screen(StudyScreen(mode="new", level=self.selected_level, quiz_style=self.quiz_style))
 
     def action_start_favorites(self) -> None:
         """複習收藏的難詞"""
         from tui.screens.study import StudyScreen
 
-        self.app.push_screen(StudyScreen(mode="favorite"))
+        self.app.push_screen(StudyScreen(mode="favorite", quiz_style=self.quiz_style))
 
     def action_show_stats(self) -> None:
         """顯示統計"""
@@ -288,8 +308,9 @@ class HomeScreen(Screen):
 
     def action_search_word(self) -> None:
         """搜尋單字"""
-        # TODO: 實作搜尋功能
-        self.app.notify("搜尋功能尚未實作", severity="information")
+        from tui.screens.search import SearchScreen
+
+        self.app.push_screen(SearchScreen())
 
     def action_quit_app(self) -> None:
         """離開應用程式"""
@@ -0,0 +1,79 @@
+"""
+繼續學習提示畫面
+啟動時發現未完成的學習檢查點，詢問是否從中斷處繼續
+"""
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Label, Static
+
+from session_checkpoint import SessionState
+
+MODE_NAMES = {"new": "學習新單字", "favorite": "收藏難詞複習"}
+
+
+class ResumeScreen(ModalScreen[bool]):
+    """詢問是否繼續上次中斷的學習（回傳 True 表示繼續）"""
+
+    CSS = """
+    ResumeScreen {
+        align: center middle;
+    }
+
+    .resume-container {
+        width: 60;
+        height: auto;
+        border: solid $primary;
+        padding: 2;
+        background: $panel;
+    }
+
+    .title {
+        text-align: center;
+        text-style: bold;
+        color: $accent;
+        margin: 0 0 1 0;
+    }
+
+    .hint-text {
+        text-align: center;
+        color: $text-muted;
+        margin: 1 0 0 0;
+    }
+    """
+
+    BINDINGS = [
+        Binding("y", "resume", "繼續"),
+        Binding("enter", "resume", "繼續"),
+        Binding("n", "discard", "放棄"),
+        Binding("escape", "discard", "放棄"),
+    ]
+
+    def __init__(self, state: SessionState):
+        """
+        Args:
+            state: 由檢查點重建的流程狀態
+        """
+        super().__init__()
+        self.state = state
+
+    def compose(self) -> ComposeResult:
+        """組合 UI 元件"""
+        mode = MODE_NAMES.get(self.state.mode, "今日學習")
+        with Vertical(classes="resume-container"):
+            yield Label("⏸ 上次的學習還沒完成", classes="title")
+            yield Static(
+                f"{mode}：第 {self.state.current_index + 1}/{len(self.state.words)} 題，"
+                f"還剩 {self.state.remaining} 題"
+            )
+            yield Static("按 [Y] 或 [Enter] 繼續    按 [N] 或 [ESC] 放棄", classes="hint-text")
+
+    def action_resume(self) -> None:
+        """從中斷處繼續"""
+        self.dismiss(True)
+
+    def action_discard(self) -> None:
+        """放棄上次的進度"""
+        self.dismiss(False)
@@ -0,0 +1,172 @@
+"""
+搜尋單字畫面
+以前綴索引逐字自動完成，找不到時列出一字之差的單字；
+發音模式以發音鍵找出聽起來相近的單字
+"""
+
+from textual import work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Vertical
+from textual.screen import Screen
+from textual.widgets import DataTable, Input, Label, Static
+
+from quiz_engine import QuizEngine
+from word_index import WordIndex
+
+# 每次顯示的結果數量
+RESULT_LIMIT = 20
+
+
+class SearchScreen(Screen):
+    """搜尋單字畫面"""
+
+    CSS = """
+    SearchScreen {
+        align: center middle;
+    }
+
+    .title {
+        text-align: center;
+        text-style: bold;
+        color: $accent;
+        margin: 1 0;
+    }
+
+    .search-container {
+        width: 90;
+        height: auto;
+        border: solid $primary;
+        padding: 2;
+        background: $panel;
+    }
+
+    .search-input {
+        width: 100%;
+        margin: 0 0 1 0;
+    }
+
+    .results-table {
+        width: 100%;
+        height: 24;
+    }
+
+    .hint-text {
+        text-align: center;
+        color: $text-muted;
+        margin: 1 0;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "返回"),
+        Binding("ctrl+p", "toggle_sound_mode", "前綴 / 發音搜尋"),
+    ]
+
+    def __init__(self):
+        """初始化搜尋畫面"""
+        super().__init__()
+        self.quiz_engine = QuizEngine()
+        self.word_index: WordIndex = None
+        self.sound_mode = False  # True 時依發音鍵搜尋
+
+    def compose(self) -> ComposeResult:
+        """組合 UI 元件"""
+        with Container():
+            yield Label("🔍 搜尋單字", classes="title")
+
+            with Vertical(classes="search-container"):
+                yield Input(
+                    placeholder="輸入英文前綴，或輸入中文後按 Enter",
+                    id="search_input",
+                    classes="search-input",
+                )
+                yield Static("索引載入中…", id="search_hint", classes="hint-text")
+                table = DataTable(id="results_table", classes="results-table")
+                table.add_columns("單字", "翻譯")
+                yield table
+                yield Static("按 [Ctrl+P] 切換發音搜尋    按 [ESC] 返回主選單", classes="hint-text")
+
+    def on_mount(self) -> None:
+        """畫面載入時在背景載入索引"""
+        self.query_one("#search_input", Input).focus()
+        self._load_index()
+
+    @work(thread=True, exclusive=True)
+    def _load_index(self) -> None:
+        """背景執行緒：載入前綴索引"""
+        index = self.quiz_engine.get_word_index()
+        self.app.call_from_thread(self._on_index_ready, index)
+
+    def _on_index_ready(self, index: WordIndex) -> None:
+        """索引載入完成，以目前輸入更新結果"""
+        self.word_index = index
+        self._update_results(self.query_one("#search_input", Input).value)
+
+    def action_toggle_sound_mode(self) -> None:
+        """切換前綴搜尋 / 發音搜尋"""
+        self.sound_mode = not self.sound_mode
+        self.app.notify("發音搜尋" if self.sound_mode else "前綴搜尋", severity="information")
+        if self.word_index is not None:
+            self._update_results(self.query_one("#search_input", Input).value)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """逐字更新自動完成結果（只查記憶體中的索引）"""
+        if self.word_index is not None:
+            self._update_results(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """按 Enter：中文或其他非前綴查詢改用資料庫搜尋翻譯"""
+        keyword = event.value.strip()
+        if not keyword or keyword.isascii():
+            return
+        words = self.quiz_engine.db.search_word(keyword)[:RESULT_LIMIT]
+        self._show_rows([(w["word"], w["translation"]) for w in words])
+        self.query_one("#search_hint").update(f"翻譯包含「{keyword}」：{len(words)} 個")
+
+    def _update_results(self, text: str) -> None:
+        """以前綴自動完成；沒有結果時改列一字之差、再改列發音相近的單字"""
+        hint = self.query_one("#search_hint")
+        prefix = text.strip()
+        if not prefix:
+            self._show_rows([])
+            hint.update(f"共 {len(self.word_index)} 筆索引，輸入前綴開始搜尋")
+            return
+        if not prefix.isascii():
+            hint.update("按 Enter 搜尋翻譯")
+            return
+
+        if self.sound_mode:
+            self._show_sound_alike(prefix, f"聽起來像「{prefix}」的單字：")
+            return
+
+        ids = self.word_index.complete(prefix, limit=RESULT_LIMIT)
+        if ids:
+            hint.update(f"以「{prefix}」開頭（常用字優先）")
+        else:
+            ids = self.word_index.fuzzy(prefix, limit=RESULT_LIMIT)
+            if not ids:
+                self._show_sound_alike(prefix, f"找不到「{prefix}」，發音相近的單字：")
+                return
+            hint.update(f"沒有以「{prefix}」開頭的單字，你是不是要找：")
+        self._show_rows([self.word_index.entry(i) for i in ids])
+
+    def _show_sound_alike(self, text: str, title: str) -> None:
+        """列出發音相近的單字"""
+        words = self.quiz_engine.db.search_sound_alike(text, limit=RESULT_LIMIT)
+        self.query_one("#search_hint").update(title if words else f"找不到「{text}」")
+        self._show_rows([(w["word"], w["translation"]) for w in words])
+
+    def _show_rows(self, rows) -> None:
+        """重新填入結果表格"""
+        table = self.query_one("#results_table", DataTable)
+        table.clear()
+        for word, translation in rows:
+            table.add_row(
+                word,
+                translation[:50] + "..." if len(translation) > 50 else translation,
+            )
+
+    def on_unmount(self):
+        """畫面卸載時關閉資料庫"""
+        self.quiz_engine.close()
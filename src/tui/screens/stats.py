@@ -12,7 +12,9 @@ from textual.widgets import Static, Label
 from textual.containers import Container, Vertical
 from textual.binding import Binding
 
+from database import LEECH_THRESHOLD
 from quiz_engine import QuizEngine
+from tui.widgets.charts import AccuracySparkline, StudyHeatmap, monthly_values, weekly_values
 
 
 class StatsScreen(Screen):
@@ -66,6 +68,9 @@ class StatsScreen(Screen):
     def compose(self) -> ComposeResult:
         """組合 UI 元件"""
         stats = self.quiz_engine.db.get_learning_statistics()
+        weekly = self.quiz_engine.db.get_weekly_rollups()
+        monthly = self.quiz_engine.db.get_monthly_rollups()
+        response_times = self.quiz_engine.db.get_response_time_stats()
 
         with Container():
             yield Label("📊 學習統計", classes="title")
@@ -120,6 +125,25 @@ class StatsScreen(Screen):
                         classes="stat-row"
                     )
 
+                if stats['today']['total_count'] > 0 and stats['today']['study_time_seconds']:
+                    seconds = stats['today']['study_time_seconds'] / stats['today']['total_count']
+                    yield Static(
+                        f"  ⏱ 今日平均每張: {seconds:.1f} 秒（共 {stats['today']['study_time_seconds'] // 60} 分鐘）",
+                        classes="stat-row"
+                    )
+
+                if response_times['average_ms'] is not None:
+                    yield Static(
+                        f"  ⏱ 整體平均每張: {response_times['average_ms'] / 1000:.1f} 秒"
+                        f"（{response_times['timed_cards']} 個單字有記錄）",
+                        classes="stat-row"
+                    )
+                    slowest = "、".join(
+                        f"{word['word']} {word['average_ms'] / 1000:.1f}s"
+                        for word in response_times['slowest']
+                    )
+                    yield Static(f"  🐢 最花時間: {slowest}", classes="stat-row")
+
                 yield Static(
                     f"  ⭐ 收藏難詞: {stats['favorite_words']} 個",
                     classes="stat-row"
@@ -128,6 +152,21 @@ class StatsScreen(Screen):
                     f"  📝 待複習: {stats['due_words']} 個",
                     classes="stat-row"
                 )
+                if stats['leech_words']:
+                    yield Static(
+                        f"  🩹 難以記住: {stats['leech_words']} 個（忘記 {LEECH_THRESHOLD} 次以上）",
+                        classes="stat-row"
+                    )
+
+                # 學習熱度與正確率走勢（讀取週、月彙總）
+                yield Static("\n近一年學習熱度：", classes="level-stats")
+                yield StudyHeatmap(weekly, classes="stat-row")
+                yield AccuracySparkline(
+                    "  每週正確率（近 26 週）: ", weekly_values(weekly, 26), classes="stat-row"
+                )
+                yield AccuracySparkline(
+                    "  每月正確率（近 12 月）: ", monthly_values(monthly, 12), classes="stat-row"
+                )
 
                 yield Static("\n按 [ESC] 或 [Q] 返回主選單", classes="stat-row")
 
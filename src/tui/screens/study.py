@@ -1,6 +1,6 @@
 """
 學習/測驗畫面
-處理單字學習、測驗、評分（翻牌模式）
+處理單字學習、測驗、評分（翻牌、選擇題、拼字輸入模式）
 """
 
 import sys
@@ -19,17 +19,25 @@ def debug_log(msg):
         pass
 
 
+from time import perf_counter_ns
+
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical
 from textual.screen import Screen
-from textual.widgets import Button, Label, Static
+from textual.widgets import Button, Input, Label, Static
 
-from quiz_engine import QuizEngine
+from answer_matcher import AnswerMatcher, get_matcher
+from database import LEECH_THRESHOLD
+from question_bank import QuestionBank
+from session_checkpoint import SessionCheckpoint, SessionState
+from quiz_engine import DEFAULT_UNDO_WINDOW, QuizEngine
+from word_index import WordIndex
 
 
 class StudyScreen(Screen):
-    """學習/測驗畫面（翻牌模式）"""
+    """學習/測驗畫面（翻牌、選擇題、拼字輸入模式）"""
 
     CSS = """
     StudyScreen {
@@ -149,6 +157,31 @@ class StudyScreen(Screen):
         background: $success;
     }
 
+    .mc-options {
+        width: 100%;
+        height: auto;
+        margin: 1 0;
+    }
+
+    .mc-button {
+        width: 100%;
+        height: 3;
+        margin: 0 0 1 0;
+    }
+
+    .mc-correct {
+        background: $success;
+    }
+
+    .mc-wrong {
+        background: $error;
+    }
+
+    .answer-input {
+        width: 100%;
+        margin: 1 0;
+    }
+
     .feedback-text {
         width: 100%;
         text-align: center;
@@ -163,36 +196,76 @@ class StudyScreen(Screen):
         Binding("up", "go_previous", "上一題"),
         Binding("left", "select_dont_know", "不會"),
         Binding("right", "select_know", "會"),
+        Binding("1", "select_option(0)", "選項 1", show=False),
+        Binding("2", "select_option(1)", "選項 2", show=False),
+        Binding("3", "select_option(2)", "選項 3", show=False),
+        Binding("4", "select_option(3)", "選項 4", show=False),
     ]
 
-    def __init__(self, mode: str = "review", level: int = None):
+    def __init__(
+        self,
+        mode: str = "review",
+        level: int = None,
+        quiz_style: str = "flashcard",
+        resume: SessionState = None,
+    ):
         """初始化學習畫面
 
         Args:
             mode: 模式 ("review", "new", "favorite")
             level: 級別 (僅對 new 模式有效)
+            quiz_style: 作答方式 ("flashcard" 翻牌, "mc" 選擇題, "typed" 看中文拼英文)
+            resume: 由檢查點重建的流程狀態（提供時忽略其他參數，從中斷處繼續）
         """
         super().__init__()
+        if resume is not None:
+            mode, level, quiz_style = resume.mode, resume.level, resume.quiz_style
         self.mode = mode
         self.level = level
+        self.quiz_style = quiz_style
+        self.resume_state = resume
+        self.checkpoint = SessionCheckpoint()
         debug_log(f"__init__() - mode={mode}, level={level}")
-        self.quiz_engine = QuizEngine()
+        # 最近幾題的作答先留在記憶體，返回上一題時可直接撤回
+        self.quiz_engine = QuizEngine(undo_window=DEFAULT_UNDO_WINDOW)
         self.words = []
         self.current_index = 0
         self.current_word = None
         self.show_answer = False  # 是否顯示答案面
-        self.wrong_words = []  # 答錯的單字列表
+        self.wrong_words = []  # 答錯的單字列表（依答錯順序）
+        self.wrong_ids = set()  # 答錯的單字 ID（判斷是否已在列表中）
         self.focused_button = 0  # 聚焦的按鈕索引 (0=不會, 1=會)
         self.history = []  # 歷史記錄用於返回上一題
         self._mounted = False  # 防止重複 mount
         self._is_active = True  # 螢幕是否活躍
         self._processing = False  # 是否正在處理答案
+        self._next_timer = None  # 作答後切換到下一題的計時器
         self._db_closed = False  # 資料庫是否已關閉
+        self.question_bank: QuestionBank = None  # 選擇題題庫（背景產生）
+        self.current_question = None  # 目前的選擇題（翻牌模式為 None）
+        self.answer_matcher: AnswerMatcher = None  # 拼字模式目前單字的比對器
+        self.word_index: WordIndex = None  # 拼字模式的前綴索引（背景載入）
+        self.shown_ns = 0  # 目前題目出現的時間（perf_counter_ns）
+        self.recalled_ns = 0  # 翻開答案的時間（0 表示尚未翻開）
 
     def compose(self) -> ComposeResult:
         """組合 UI 元件"""
+        # 從檢查點繼續時直接還原題目與進度，不重新查詢出題佇列
+        if self.resume_state is not None:
+            state = self.resume_state
+            self.words = state.words
+            self.current_index = state.current_index
+            self.wrong_words = state.wrong_words
+            self.wrong_ids = state.wrong_ids
+            self.history = state.history
+
         # 取得單字
-        if self.mode == "new":
+        if self.words:
+            mode_text = {
+                "new": f"學習新單字 (Level {self.level})",
+                "favorite": "收藏難詞複習",
+            }.get(self.mode, "今日學習")
+        elif self.mode == "new":
             debug_log(f"compose() - mode={self.mode}, level={self.level}")
             self.words = self.quiz_engine.get_quiz_words(
                 mode="new", level=self.level, limit=50
@@ -209,8 +282,8 @@ class StudyScreen(Screen):
             self.words = self.quiz_engine.get_quiz_words(mode="favorite")
             mode_text = "收藏難詞複習"
         else:
-            self.words = self.quiz_engine.get_quiz_words(mode="review", limit=50)
-            mode_text = "今日複習"
+            self.words = self.quiz_engine.get_quiz_words(mode="plan", limit=50)
+            mode_text = "今日學習"
 
         with Container(classes="main-container"):
             yield Label(f"📖 {mode_text}", classes="title")
@@ -234,6 +307,18 @@ class StudyScreen(Screen):
                     # 提示文字
                     yield Static("", id="hint_text", classes="hint-text")
 
+                # 選擇題選項（僅選擇題模式）
+                with Vertical(id="mc_options", classes="mc-options"):
+                    for i in range(4):
+                        yield Button("", id=f"btn_option_{i}", classes="mc-button")
+
+                # 拼字輸入（僅拼字模式）
+                yield Input(
+                    placeholder="輸入英文單字，Enter 送出",
+                    id="answer_input",
+                    classes="answer-input",
+                )
+
                 # 回饋訊息
                 yield Static("", id="feedback_text", classes="feedback-text")
 
@@ -270,7 +355,7 @@ class StudyScreen(Screen):
             elif self.mode == "favorite":
                 self.words = self.quiz_engine.get_quiz_words(mode="favorite")
             elif self.mode == "review":
-                self.words = self.quiz_engine.get_quiz_words(mode="review", limit=50)
+                self.words = self.quiz_engine.get_quiz_words(mode="plan", limit=50)
 
         self.app.notify(
             f"DEBUG: on_mount() 檢查到 {len(self.words)} 個單字", severity="information"
@@ -283,9 +368,53 @@ class StudyScreen(Screen):
             self.set_timer(0.5, self._safe_pop_screen)
             return
 
+        # 每次作答後附加到檢查點，中斷後可從這裡繼續
+        if self.resume_state is not None:
+            self.checkpoint.resume()
+            # 重新提交中斷前還沒寫入資料庫的作答（仍可撤回）；
+            # 寫入後、記錄到檢查點前就中斷的作答已在資料庫中，不再重複提交
+            written = self.resume_state.drop_written(self.quiz_engine.db)
+            if written:
+                self.checkpoint.flushed(written)
+            for args in self.resume_state.unflushed:
+                self._submit(*args)
+        else:
+            self.checkpoint.start(self.mode, self.level, self.quiz_style, self.words)
+
+        self.query_one("#mc_options").display = False
+        self.query_one("#answer_input").display = False
+        if self.quiz_style == "mc":
+            # 題庫在背景產生，完成後才開始出題
+            self.query_one("#binary_buttons").display = False
+            self.query_one("#hint_text").update("題目準備中…")
+            self._load_question_bank()
+            return
+        if self.quiz_style == "typed":
+            self._load_word_index()
+
         debug_log("on_mount() - 開始顯示單字")
         self.show_next_word()
 
+    @work(thread=True, exclusive=True)
+    def _load_question_bank(self) -> None:
+        """背景執行緒：一次產生本次所有單字的選擇題"""
+        bank = self.quiz_engine.build_question_bank(self.words)
+        self.app.call_from_thread(self._on_question_bank_ready, bank)
+
+    @work(thread=True, exclusive=True, group="word_index")
+    def _load_word_index(self) -> None:
+        """背景執行緒：載入前綴索引（拼字時逐字提示用）"""
+        index = self.quiz_engine.get_word_index()
+        self.app.call_from_thread(setattr, self, "word_index", index)
+
+    def _on_question_bank_ready(self, bank: QuestionBank) -> None:
+        """題庫產生完成，開始出題"""
+        if not self._is_active:
+            return
+        debug_log(f"_on_question_bank_ready() - {len(bank)} 題")
+        self.question_bank = bank
+        self.show_next_word()
+
     def show_next_word(self) -> None:
         """顯示下一個單字（問題面）"""
         if self.current_index >= len(self.words):
@@ -294,44 +423,34 @@ class StudyScreen(Screen):
                 self.app.notify(
                     f"有 {len(self.wrong_words)} 個單字需要重測", severity="information"
                 )
-                self.words = self.wrong_words.copy()
+                # 進入重測前寫入所有作答，上一輪的題目不能再返回
+                self.quiz_engine.flush_pending()
+                self.words = self.wrong_words
                 self.wrong_words = []
+                self.wrong_ids = set()
+                self.history = []
                 self.current_index = 0
+                self.checkpoint.new_round(self.words)
             else:
                 # 學習完成
+                self.quiz_engine.flush_pending()
+                self.checkpoint.finish()
                 self.show_completion_screen()
                 return
 
         self.current_word = self.words[self.current_index]
         self.show_answer = False
-
-        # 更新進度
-        progress_text = f"進度: {self.current_index + 1}/{len(self.words)}"
-        self.query_one("#progress_bar").update(progress_text)
-
-        # 顯示問題面：單字、音標、詞性
-        self.query_one("#word_text").update(self.current_word["word"])
-        self.query_one("#phonetic_text").update(f"[{self.current_word['phonetic']}]")
-        self.query_one("#pos_text").update(self.current_word["part_of_speech"])
-
-        # 隱藏答案面
-        self.query_one("#translation_text").update("")
-        self.query_one("#translation_text").display = False
-
-        # 顯示提示
-        self.query_one("#hint_text").update("[按空格顯示答案]")
-        self.query_one("#hint_text").display = True
-
-        # 隱藏按鈕和回饋
-        self.query_one("#binary_buttons").display = False
-        self.query_one("#feedback_text").update("")
+        self._display_question()
 
     def action_reveal_answer(self) -> None:
         """顯示答案面（按空格鍵）"""
         if self.show_answer or not self.current_word:
             return
+        if self.current_question or self.answer_matcher:
+            return
 
         self.show_answer = True
+        self.recalled_ns = perf_counter_ns()
 
         # 顯示答案面：翻譯
         translation = self.current_word["translation"]
@@ -376,14 +495,42 @@ class StudyScreen(Screen):
         # 直接提交答案
         self.handle_binary_answer(know=True)
 
+    def action_select_option(self, index: int) -> None:
+        """選擇題作答（按 1-4）"""
+        if not self.current_question or self.show_answer or self._processing:
+            return
+
+        self.show_answer = True
+        correct_index = self.current_question["correct_index"]
+        self.query_one(f"#btn_option_{correct_index}", Button).add_class("mc-correct")
+        if index != correct_index:
+            self.query_one(f"#btn_option_{index}", Button).add_class("mc-wrong")
+
+        self.handle_binary_answer(know=index == correct_index)
+
     def action_go_previous(self) -> None:
-        """返回上一題（按 ↑）"""
+        """返回上一題（按 ↑），撤回該題的作答"""
         if not self.history:
             self.app.notify("已經是第一題了", severity="information")
             return
 
+        # 只有還留在記憶體中的作答可以撤回，已寫入資料庫的不能重答
+        if self.quiz_engine.undo_last() is None:
+            self.app.notify("較早的作答已儲存，無法再返回", severity="information")
+            return
+
+        # 作答回饋顯示中就返回時，取消切換到下一題
+        if self._next_timer is not None:
+            self._next_timer.stop()
+            self._next_timer = None
+        self._processing = False
+
         # 從歷史記錄恢復
         prev_state = self.history.pop()
+        if prev_state["wrong_added"]:
+            self.wrong_ids.discard(prev_state["word"]["id"])
+            self.wrong_words.pop()
+        self.checkpoint.back()
         self.current_index = prev_state["index"]
         self.current_word = prev_state["word"]
         self.show_answer = False
@@ -402,39 +549,93 @@ class StudyScreen(Screen):
 
         self._processing = True  # 防止重複提交
 
-        # 保存到歷史記錄（用於返回上一題）
-        self.history.append(
-            {"index": self.current_index, "word": self.current_word.copy()}
-        )
+        # 作答時間：翻牌模式算到翻開答案為止，選擇題與拼字算到作答為止
+        response_ms = ((self.recalled_ns or perf_counter_ns()) - self.shown_ns) // 1_000_000
 
         # 更新學習進度（使用二元評分）
-        is_new_word = self.mode == "new"
-        result = self.quiz_engine.submit_binary_answer(
-            vocabulary_id=self.current_word["id"],
-            know=know,
-            is_new_word=is_new_word,
-        )
+        is_new_word = self.mode == "new" or self.current_word.get("kind") == "new"
+        result = self._submit(self.current_word["id"], know, is_new_word, response_ms)
+        wrong_added = False
 
         # 顯示回饋
         if know:
-            feedback = f"✅ 太棒了！下次複習：{result['interval_days']} 天後"
+            feedback = (
+                f"✅ 太棒了！下次複習：{result['interval_days']} 天後"
+                f"（{result['response_ms'] / 1000:.1f} 秒）"
+            )
             self.query_one("#feedback_text").update(feedback)
         else:
             feedback = "❌ 沒關係，明天再複習！"
+            if self.current_question:
+                feedback = f"❌ 正確答案：{self.current_question['correct_answer']}"
+            if result["became_leech"]:
+                action = "已加入收藏" if self.quiz_engine.db.leech_action == "favorite" else "已暫停複習"
+                feedback += f"\n🩹 這個單字已忘記 {LEECH_THRESHOLD} 次，{action}"
             self.query_one("#feedback_text").update(feedback)
-            # 加入錯題列表
-            if self.current_word not in self.wrong_words:
+            # 加入錯題列表（成為 leech 的單字不再重測）
+            if not result["became_leech"] and self.current_word["id"] not in self.wrong_ids:
+                self.wrong_ids.add(self.current_word["id"])
                 self.wrong_words.append(self.current_word)
+                wrong_added = True
+
+        # 保存到歷史記錄（用於返回上一題）
+        # 單字資料是不可變的 Record，直接保存即可
+        self.history.append(
+            {"index": self.current_index, "word": self.current_word, "wrong_added": wrong_added}
+        )
+        self.checkpoint.answer(
+            self.current_index,
+            self.current_word["id"],
+            self.current_word["id"] in self.wrong_ids,
+            know,
+            is_new_word,
+            result["response_ms"],
+            result["review_count"],
+        )
 
         # 短暫延遲後進入下一題（使用安全方法）
-        self.set_timer(1.0, self._safe_next_word)
+        self._next_timer = self.set_timer(1.0, self._safe_next_word)
+
+    def _submit(self, vocabulary_id: int, know: bool, is_new_word: bool, response_ms) -> dict:
+        """提交作答；較舊的作答因此寫入資料庫時記錄到檢查點
+
+        Returns:
+            submit_binary_answer 的結果
+        """
+        before = self.quiz_engine.pending_count
+        result = self.quiz_engine.submit_binary_answer(
+            vocabulary_id=vocabulary_id,
+            know=know,
+            is_new_word=is_new_word,
+            response_ms=response_ms,
+        )
+        flushed = before + 1 - self.quiz_engine.pending_count
+        if flushed:
+            self.checkpoint.flushed(flushed)
+        return result
 
     def _display_question(self) -> None:
-        """顯示問題面（用於返回上一題）"""
+        """顯示問題面（並開始計時）"""
+        self.shown_ns = perf_counter_ns()
+        self.recalled_ns = 0
+
         # 更新進度
         progress_text = f"進度: {self.current_index + 1}/{len(self.words)}"
         self.query_one("#progress_bar").update(progress_text)
 
+        if self.quiz_style == "typed":
+            self._display_typed()
+            return
+
+        # 選擇題模式：題目已在題庫中，不需查詢資料庫
+        self.current_question = None
+        if self.question_bank is not None:
+            self.current_question = self.question_bank.question(self.current_word["id"])
+        if self.current_question:
+            self._display_multiple_choice()
+            return
+        self.query_one("#mc_options").display = False
+
         # 顯示問題面
         self.query_one("#word_text").update(self.current_word["word"])
         self.query_one("#phonetic_text").update(f"[{self.current_word['phonetic']}]")
@@ -452,6 +653,88 @@ class StudyScreen(Screen):
         self.query_one("#binary_buttons").display = False
         self.query_one("#feedback_text").update("")
 
+    def _display_multiple_choice(self) -> None:
+        """顯示選擇題"""
+        question = self.current_question
+        if question["type"] == "mc_en2zh":
+            self.query_one("#word_text").update(self.current_word["word"])
+            self.query_one("#phonetic_text").update(f"[{self.current_word['phonetic']}]")
+            self.query_one("#pos_text").update(self.current_word["part_of_speech"])
+        else:
+            self.query_one("#word_text").update(question["question"])
+            self.query_one("#phonetic_text").update("")
+            self.query_one("#pos_text").update("")
+
+        self.query_one("#translation_text").update("")
+        self.query_one("#translation_text").display = False
+
+        for i, option in enumerate(question["options"]):
+            button = self.query_one(f"#btn_option_{i}", Button)
+            button.label = f"{i + 1}. {option}"
+            button.remove_class("mc-correct")
+            button.remove_class("mc-wrong")
+        self.query_one("#mc_options").display = True
+
+        self.query_one("#hint_text").update("按 1-4 選擇答案    ↑ 上一題")
+        self.query_one("#hint_text").display = True
+        self.query_one("#binary_buttons").display = False
+        self.query_one("#feedback_text").update("")
+
+    def _display_typed(self) -> None:
+        """顯示拼字題：看中文翻譯輸入英文單字"""
+        self.answer_matcher = get_matcher(self.current_word["word"], "zh2en")
+
+        self.query_one("#word_text").update(self.current_word["translation"])
+        self.query_one("#phonetic_text").update("")
+        self.query_one("#pos_text").update(self.current_word["part_of_speech"])
+        self.query_one("#translation_text").update("")
+        self.query_one("#translation_text").display = False
+
+        answer_input = self.query_one("#answer_input", Input)
+        answer_input.value = ""
+        answer_input.disabled = False
+        answer_input.display = True
+        answer_input.focus()
+
+        self.query_one("#hint_text").update("輸入英文單字後按 Enter    ↑ 上一題")
+        self.query_one("#hint_text").display = True
+        self.query_one("#mc_options").display = False
+        self.query_one("#binary_buttons").display = False
+        self.query_one("#feedback_text").update("")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """逐字比對，拼對時即時提示"""
+        if not self.answer_matcher or self.show_answer:
+            return
+        typed = event.value.strip()
+        if self.answer_matcher.distance(typed) == 0:
+            self.query_one("#feedback_text").update("✓ 正確，按 Enter 送出")
+        elif typed and self.word_index is not None and not self.word_index.has_prefix(typed):
+            self.query_one("#feedback_text").update(f"✗ 沒有單字以「{typed}」開頭")
+        else:
+            self.query_one("#feedback_text").update("")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """送出拼字答案"""
+        if not self.answer_matcher or self.show_answer or self._processing:
+            return
+        if not event.value.strip():
+            return
+
+        self.show_answer = True
+        event.input.disabled = True
+        distance = self.answer_matcher.distance(event.value)
+        self.handle_binary_answer(know=distance is not None)
+
+        word = self.current_word["word"]
+        translation = self.current_word["translation"]
+        self.query_one("#translation_text").update(f"🍎 {word}  {translation}")
+        self.query_one("#translation_text").display = True
+        if distance is None:
+            self.query_one("#feedback_text").update(f"❌ 正確拼法：{word}")
+        elif distance > 0:
+            self.query_one("#feedback_text").update(f"✅ 拼字接近，正確拼法：{word}")
+
     def next_word(self) -> None:
         """進入下一個單字"""
         self.current_index += 1
@@ -459,16 +742,21 @@ class StudyScreen(Screen):
 
     def _safe_next_word(self) -> None:
         """安全地進入下一題（檢查螢幕狀態）"""
+        self._next_timer = None
         if self._is_active:
             self._processing = False
             self.next_word()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """處理按鈕點擊"""
+        button_id = event.button.id
+        if button_id and button_id.startswith("btn_option_"):
+            self.action_select_option(int(button_id.rsplit("_", 1)[1]))
+            return
+
         if not self.show_answer:
             return
 
-        button_id = event.button.id
         if button_id == "btn_dont_know":
             self.handle_binary_answer(know=False)
         elif button_id == "btn_know":
@@ -486,11 +774,16 @@ class StudyScreen(Screen):
         self.query_one("#hint_text").update(
             f"今日新學：{summary['today_new']} 個\n"
             f"今日複習：{summary['today_reviewed']} 個\n"
-            f"今日正確率：{summary['today_accuracy']}%\n\n"
+            f"今日正確率：{summary['today_accuracy']}%\n"
+            f"平均每張：{summary['today_seconds_per_card']} 秒\n\n"
             f"按 ESC 返回主選單"
         )
         self.query_one("#feedback_text").update("")
         self.query_one("#binary_buttons").display = False
+        self.query_one("#mc_options").display = False
+        self.query_one("#answer_input").display = False
+        self.current_question = None
+        self.answer_matcher = None
 
     def _safe_pop_screen(self) -> None:
         """安全地關閉螢幕"""
@@ -501,14 +794,22 @@ class StudyScreen(Screen):
     def action_go_back(self) -> None:
         """返回主選單"""
         self._is_active = False
-        if not self._db_closed:
-            self.quiz_engine.close()
-            self._db_closed = True
+        self._close_session()
         self.app.pop_screen()
 
     def on_unmount(self):
         """畫面卸載時關閉資料庫"""
         self._is_active = False  # 標記為非活躍
-        if not self._db_closed:
-            self.quiz_engine.close()
-            self._db_closed = True
+        self._close_session()
+
+    def _close_session(self) -> None:
+        """寫入尚未寫入的作答並記錄到檢查點，再關閉檢查點與資料庫"""
+        if self._db_closed:
+            return
+        pending = self.quiz_engine.pending_count
+        self.quiz_engine.flush_pending()
+        if pending:
+            self.checkpoint.flushed(pending)
+        self.checkpoint.close()
+        self.quiz_engine.close()
+        self._db_closed = True
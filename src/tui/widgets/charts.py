@@ -0,0 +1,149 @@
+"""
+學習統計圖表元件
+以週、月彙總列繪製一年的學習熱度圖與正確率走勢，
+每週、每月各一個字元，讀取彙總列後一次組成整段文字
+"""
+
+from datetime import date
+from typing import List, Optional, Sequence
+
+from textual.widgets import Static
+
+import day_number
+
+# 熱度由低到高（空白表示該週沒有學習）
+HEAT_LEVELS = " ░▒▓█"
+
+# 走勢由低到高
+SPARK_LEVELS = "▁▂▃▄▅▆▇█"
+
+
+def week_start(day: int) -> int:
+    """日序數所在週的星期一（與 study_weekly.week_start 相同）"""
+    return day - (day + 3) % 7
+
+
+def weekly_values(rollups: Sequence, weeks: int, today: Optional[int] = None) -> List:
+    """把彙總列對齊到最近 weeks 週（含本週），沒有記錄的週為 None
+
+    Args:
+        rollups: get_weekly_rollups 的結果（依 week_start 排序）
+        weeks: 週數
+        today: 今天的日序數（預設為今天）
+
+    Returns:
+        長度為 weeks 的列表，由舊到新
+    """
+    first = week_start(day_number.today() if today is None else today) - (weeks - 1) * 7
+    values: List = [None] * weeks
+    for row in rollups:
+        i = (row["week_start"] - first) // 7
+        if 0 <= i < weeks:
+            values[i] = row
+    return values
+
+
+def monthly_values(rollups: Sequence, months: int, today: Optional[date] = None) -> List:
+    """把彙總列對齊到最近 months 個月（含本月），沒有記錄的月份為 None
+
+    Args:
+        rollups: get_monthly_rollups 的結果
+        months: 月數
+        today: 今天（預設為今天）
+
+    Returns:
+        長度為 months 的列表，由舊到新
+    """
+    today = today or date.today()
+    by_month = {row["month"]: row for row in rollups}
+    current = today.year * 12 + today.month - 1
+    return [
+        by_month.get(f"{index // 12:04d}-{index % 12 + 1:02d}")
+        for index in range(current - months + 1, current + 1)
+    ]
+
+
+def heat_char(value: int, peak: int) -> str:
+    """依與最大值的比例選擇熱度字元"""
+    if value <= 0 or peak <= 0:
+        return HEAT_LEVELS[0]
+    steps = len(HEAT_LEVELS) - 1
+    return HEAT_LEVELS[min(steps, 1 + (value * steps - 1) // peak)]
+
+
+def sparkline(values: Sequence[Optional[float]], low: float = 0, high: float = 100) -> str:
+    """以方塊字元繪製走勢，None 為空白
+
+    Args:
+        values: 數值（由舊到新）
+        low: 對應最低方塊的值
+        high: 對應最高方塊的值
+    """
+    steps = len(SPARK_LEVELS) - 1
+    chars = []
+    for value in values:
+        if value is None:
+            chars.append(" ")
+        else:
+            ratio = (min(max(value, low), high) - low) / (high - low)
+            chars.append(SPARK_LEVELS[round(ratio * steps)])
+    return "".join(chars)
+
+
+def accuracy(row) -> Optional[float]:
+    """彙總列的正確率（百分比），沒有作答時為 None"""
+    if row is None or not row["total_count"]:
+        return None
+    return row["correct_count"] * 100 / row["total_count"]
+
+
+def render_heatmap(rollups: Sequence, weeks: int = 53, today: Optional[int] = None) -> str:
+    """一年的學習熱度圖：第一行為月份，第二行每週一格（學習單字數越多越深）"""
+    values = weekly_values(rollups, weeks, today)
+    counts = [(row["new_words"] + row["reviewed_words"]) if row else 0 for row in values]
+    peak = max(counts, default=0)
+
+    first = week_start(day_number.today() if today is None else today) - (weeks - 1) * 7
+    labels = [" "] * weeks
+    previous_month = None
+    for i in range(weeks):
+        month = day_number.to_date(first + i * 7 + 6).month  # 以週日所在月份為準
+        if month != previous_month and previous_month is not None:
+            text = str(month)
+            if i + len(text) <= weeks and all(c == " " for c in labels[max(0, i - 1):i + len(text)]):
+                labels[i:i + len(text)] = text
+        previous_month = month
+
+    studied_weeks = sum(1 for row in values if row)
+    return (
+        "".join(labels) + "\n"
+        + "".join(heat_char(count, peak) for count in counts) + "\n"
+        + f"少 {HEAT_LEVELS[1:]} 多    {studied_weeks}/{weeks} 週有學習，單週最多 {peak} 個"
+    )
+
+
+class StudyHeatmap(Static):
+    """一年的學習熱度圖（讀取週彙總列）"""
+
+    def __init__(self, rollups: Sequence, weeks: int = 53, **kwargs):
+        """
+        Args:
+            rollups: get_weekly_rollups 的結果
+            weeks: 顯示的週數
+        """
+        super().__init__(render_heatmap(rollups, weeks), markup=False, **kwargs)
+
+
+class AccuracySparkline(Static):
+    """正確率走勢（讀取週或月彙總列）"""
+
+    def __init__(self, label: str, rows: Sequence, **kwargs):
+        """
+        Args:
+            label: 前置說明文字
+            rows: 依時間排序的彙總列，沒有記錄的時段為 None
+        """
+        values = [accuracy(row) for row in rows]
+        known = [v for v in values if v is not None]
+        latest = f" {known[-1]:.0f}%" if known else " 尚無資料"
+        super().__init__(f"{label}{sparkline(values)}{latest}", markup=False, **kwargs)
@@ -0,0 +1,305 @@
+"""
+單字前綴索引
+以排序陣列 + 二分搜尋提供前綴列舉、依級別或頻率排序的自動完成，
+以及刪除鄰域（deletion neighbourhood）的一字之差模糊查詢；
+可存成檔案，啟動時直接載入而不必查詢資料庫
+"""
+
+import argparse
+import heapq
+import json
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from answer_matcher import bounded_levenshtein
+from database import UNRANKED, VocabularyDatabase, open_database
+from frequency_rank import headword
+
+DEFAULT_INDEX_PATH = "data/word_index.json"
+FORMAT_VERSION = 1
+
+# 大於任何單字字元，用來取得前綴範圍的上界
+_PREFIX_END = "\U0010ffff"
+
+
+def _deletions(key: str) -> List[str]:
+    """刪除一個字元可得到的所有字串"""
+    return [key[:i] + key[i + 1:] for i in range(len(key))]
+
+
+class WordIndex:
+    """排序陣列形式的單字索引
+
+    每個字頭變體一筆（"Miss/miss" 只收一次 "miss"，"arm (1)"、"arm (2)" 各一筆），
+    keys 依字母排序，ids、levels、ranks 與 keys 對齊。
+    """
+
+    def __init__(
+        self,
+        entries: List[Tuple[str, int, int, int]],
+        words: Dict[int, Tuple[str, str]],
+        signature: Optional[List] = None,
+    ):
+        """
+        Args:
+            entries: (key, vocabulary_id, level, frequency_rank)
+            words: 單字 ID → (word, translation)
+            signature: 建立索引時的資料庫簽章（判斷檔案是否過期）
+        """
+        entries = sorted(entries)
+        self.keys: List[str] = [e[0] for e in entries]
+        self.ids = array("i", (e[1] for e in entries))
+        self.levels = bytearray(e[2] for e in entries)
+        self.ranks = array("i", (e[3] for e in entries))
+        self.words = words
+        self.signature = signature
+        self._deletes: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_database(cls, db: VocabularyDatabase) -> "WordIndex":
+        """從資料庫（或掛載的單字庫）建立索引"""
+        entries = []
+        words = {}
+        for row in db.conn.execute(
+            f"""
+            SELECT id, word, translation, level, COALESCE(frequency_rank, {UNRANKED}) AS frequency_rank
+            FROM vocabulary
+        """
+        ):
+            words[row["id"]] = (row["word"], row["translation"])
+            for key in {v.strip() for v in headword(row["word"]).split("/") if v.strip()}:
+                entries.append((key, row["id"], row["level"], row["frequency_rank"]))
+        return cls(entries, words, signature=database_signature(db))
+
+    # ========== 查詢 ==========
+
+    def prefix_range(self, prefix: str) -> range:
+        """以前綴開頭的項目在排序陣列中的範圍"""
+        prefix = prefix.strip().lower()
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _PREFIX_END, lo)
+        return range(lo, hi)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """是否有任何單字以此前綴開頭"""
+        return len(self.prefix_range(prefix)) > 0
+
+    def contains(self, word: str) -> bool:
+        """單字是否存在（不分大小寫）"""
+        key = word.strip().lower()
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        """依字母順序列舉以前綴開頭的單字 ID（同一單字只出現一次）"""
+        result: List[int] = []
+        seen = set()
+        for i in self.prefix_range(prefix):
+            vocabulary_id = self.ids[i]
+            if vocabulary_id not in seen:
+                seen.add(vocabulary_id)
+                result.append(vocabulary_id)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def complete(
+        self,
+        prefix: str,
+        limit: int = 10,
+        level: Optional[int] = None,
+        order: str = "frequency",
+    ) -> List[int]:
+        """前綴自動完成的前 K 名
+
+        Args:
+            prefix: 已輸入的前綴
+            limit: 回傳數量
+            level: 只列出此級別（None 表示全部）
+            order: "frequency"（常用字優先）、"level"（低級別優先）或 "alpha"
+
+        Returns:
+            單字 ID 列表
+        """
+        candidates = {}
+        for i in self.prefix_range(prefix):
+            if level is not None and self.levels[i] != level:
+                continue
+            vocabulary_id = self.ids[i]
+            if order == "level":
+                key = (self.levels[i], self.ranks[i])
+            elif order == "alpha":
+                key = (self.keys[i], vocabulary_id)
+            else:
+                key = (self.ranks[i], vocabulary_id)
+            if vocabulary_id not in candidates or key < candidates[vocabulary_id]:
+                candidates[vocabulary_id] = key
+        return [
+            vocabulary_id
+            for vocabulary_id, _ in heapq.nsmallest(limit, candidates.items(), key=lambda item: item[1])
+        ]
+
+    def fuzzy(self, word: str, limit: int = 10) -> List[int]:
+        """一字之差（插入、刪除、替換一個字母）的單字，常用字優先
+
+        以刪除鄰域查表取得候選：兩字串編輯距離 1 以內時，
+        必有一方刪去至多一個字元後與另一方（或其刪除變體）相同。
+        """
+        key = word.strip().lower()
+        if not key:
+            return []
+        deletes = self._deletion_map()
+
+        candidates = set()
+        for variant in [key] + _deletions(key):
+            candidates.update(deletes.get(variant, ()))
+
+        matches = {}
+        for i in candidates:
+            if bounded_levenshtein(key, self.keys[i], 1) is not None:
+                vocabulary_id = self.ids[i]
+                rank = (self.keys[i] != key, self.ranks[i], vocabulary_id)
+                if vocabulary_id not in matches or rank < matches[vocabulary_id]:
+                    matches[vocabulary_id] = rank
+        return [
+            vocabulary_id
+            for vocabulary_id, _ in heapq.nsmallest(limit, matches.items(), key=lambda item: item[1])
+        ]
+
+    def _deletion_map(self) -> Dict[str, List[int]]:
+        """字串（原字與刪除一字的變體）→ 項目位置；第一次模糊查詢時才建立"""
+        if self._deletes is None:
+            deletes: Dict[str, List[int]] = {}
+            for i, key in enumerate(self.keys):
+                for variant in {key, *_deletions(key)}:
+                    deletes.setdefault(variant, []).append(i)
+            self._deletes = deletes
+        return self._deletes
+
+    def entry(self, vocabulary_id: int) -> Tuple[str, str]:
+        """(word, translation)"""
+        return self.words[vocabulary_id]
+
+    # ========== 存檔 ==========
+
+    def save(self, path: str = DEFAULT_INDEX_PATH):
+        """存成 JSON 檔（先寫暫存檔再改名取代）"""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": FORMAT_VERSION,
+            "signature": self.signature,
+            "keys": self.keys,
+            "ids": self.ids.tolist(),
+            "levels": list(self.levels),
+            "ranks": self.ranks.tolist(),
+            "words": {str(i): list(text) for i, text in self.words.items()},
+        }
+        temp_path = target.with_name(f".{target.name}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, target)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> Optional["WordIndex"]:
+        """讀取索引檔；檔案不存在或格式不符時回傳 None"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != FORMAT_VERSION:
+            return None
+
+        index = cls.__new__(cls)
+        index.keys = data["keys"]
+        index.ids = array("i", data["ids"])
+        index.levels = bytearray(data["levels"])
+        index.ranks = array("i", data["ranks"])
+        index.words = {int(i): tuple(text) for i, text in data["words"].items()}
+        index.signature = data["signature"]
+        index._deletes = None
+        return index
+
+
+def database_signature(db: VocabularyDatabase) -> List:
+    """單字表的簡易簽章（單字數、最大 ID、頻率排名總和），任何增刪或重新排名都會改變"""
+    row = db.conn.execute(
+        "SELECT COUNT(*), MAX(id), TOTAL(frequency_rank), TOTAL(level) FROM vocabulary"
+    ).fetchone()
+    return [row[0], row[1], row[2], row[3]]
+
+
+def load_word_index(db: VocabularyDatabase, path: str = DEFAULT_INDEX_PATH) -> WordIndex:
+    """載入索引檔；不存在或已過期時重新建立並存檔
+
+    Args:
+        db: 已連接的資料庫
+        path: 索引檔路徑
+
+    Returns:
+        WordIndex
+    """
+    index = WordIndex.load(path)
+    if index is not None and index.signature == database_signature(db):
+        return index
+
+    index = WordIndex.from_database(db)
+    try:
+        index.save(path)
+    except OSError:
+        pass  # 無法寫入時仍可使用記憶體中的索引
+    return index
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="單字前綴索引")
+    parser.add_argument("--db", default="data/vocabulary.db", help="資料庫路徑")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="索引檔路徑")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="重新建立索引檔")
+    complete = sub.add_parser("complete", help="前綴自動完成")
+    complete.add_argument("prefix")
+    complete.add_argument("--level", type=int, help="只列出指定級別")
+    complete.add_argument("--limit", type=int, default=10, help="回傳數量")
+    fuzzy = sub.add_parser("fuzzy", help="一字之差的單字")
+    fuzzy.add_argument("word")
+    fuzzy.add_argument("--limit", type=int, default=10, help="回傳數量")
+    sound = sub.add_parser("sound", help="發音相近的單字")
+    sound.add_argument("text")
+    sound.add_argument("--limit", type=int, default=10, help="回傳數量")
+    args = parser.parse_args(argv)
+
+    db = open_database(args.db)
+    try:
+        if args.command == "build":
+            index = WordIndex.from_database(db)
+            index.save(args.index)
+            print(f"✓ 已建立 {len(index)} 筆索引：{args.index}")
+            return
+        if args.command == "sound":
+            for word in db.search_sound_alike(args.text, limit=args.limit):
+                print(f"  {word['word']:<24} {word['phonetic_key']:<8} {word['translation']}")
+            return
+        index = load_word_index(db, args.index)
+    finally:
+        db.close()
+
+    if args.command == "complete":
+        ids = index.complete(args.prefix, limit=args.limit, level=args.level)
+    else:
+        ids = index.fuzzy(args.word, limit=args.limit)
+    for vocabulary_id in ids:
+        word, translation = index.entry(vocabulary_id)
+        print(f"  {word:<24} {translation}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+答案比對測試
+正規化、帶狀編輯距離、拼字容錯門檻與中文關鍵詞比對
+"""
+
+import pytest
+
+from answer_matcher import (
+    AnswerMatcher,
+    bounded_levenshtein,
+    direction_of,
+    get_matcher,
+    max_typos,
+    normalize,
+)
+
+
+def test_normalize():
+    assert normalize("  ＡＰＰＬＥ   Pie ") == "apple pie"
+
+
+@pytest.mark.parametrize(
+    "a, b, limit, expected",
+    [
+        ("kitten", "kitten", 2, 0),
+        ("kitten", "sitten", 2, 1),
+        ("kitten", "sitting", 3, 3),
+        ("kitten", "sitting", 2, None),
+        ("abc", "abcdef", 2, None),  # 長度差超過 limit 直接放棄
+        ("", "ab", 2, 2),
+    ],
+)
+def test_bounded_levenshtein(a, b, limit, expected):
+    assert bounded_levenshtein(a, b, limit) == expected
+    assert bounded_levenshtein(b, a, limit) == expected
+
+
+def test_typo_tolerance_grows_with_length():
+    assert [max_typos(w) for w in ("cat", "apple", "beautiful")] == [0, 1, 2]
+
+    assert not get_matcher("cat", "zh2en").check("cab")
+    apple = get_matcher("apple", "zh2en")
+    assert apple.distance("Apple") == 0
+    assert apple.distance("aple") == 1
+    assert apple.distance("aplle") == 1
+    assert apple.distance("aplpe") is None  # 換位算兩次編輯
+    beautiful = get_matcher("beautiful", "zh2en")
+    assert beautiful.distance("beutifull") == 2
+    assert beautiful.distance("butifull") is None
+    assert not apple.check("   ")
+
+
+def test_homograph_suffix_and_variants():
+    matcher = AnswerMatcher("arm (2)", "zh2en")
+    assert matcher.variants == {"arm"}
+    assert matcher.check("ARM")
+    miss = AnswerMatcher("Miss/miss", "zh2en")
+    assert miss.variants == {"miss"} and miss.check("mis")
+
+
+def test_translation_keywords():
+    matcher = get_matcher("美麗的；漂亮, 好看（外表）", "en2zh")
+    assert matcher.check("美麗的")
+    assert matcher.check("很漂亮")
+    # 全形標點正規化，括號在比對時移除
+    assert matcher.check("好看(外表)")
+    assert not matcher.check("好看")
+    assert not matcher.check("醜")
+
+
+def test_direction_and_cache():
+    assert direction_of("typed_zh2en") == direction_of("mc_zh2en") == "zh2en"
+    assert direction_of("typed_en2zh") == "en2zh"
+    assert get_matcher("dog", "zh2en") is get_matcher("dog", "zh2en")
@@ -0,0 +1,77 @@
+"""
+備份與還原測試
+線上備份、雜湊驗證、還原與輪替
+"""
+
+import gzip
+
+import pytest
+
+import day_number
+from backup import (
+    BackupError,
+    create_backup,
+    list_backups,
+    main,
+    restore_backup,
+    rotate_backups,
+    verify_backup,
+)
+from database import open_database
+
+
+def progress_ids(db_path):
+    db = open_database(db_path, catalogue_path=None)
+    try:
+        return [row[0] for row in db.conn.execute("SELECT vocabulary_id FROM learning_progress")]
+    finally:
+        db.close()
+
+
+def test_backup_verify_and_restore(db_path, db, tmp_path):
+    db.update_progress(1, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+    backup_dir = str(tmp_path / "backups")
+
+    info = create_backup(db_path, backup_dir)
+    assert [str(path) for path in list_backups(backup_dir)] == [info["archive"]]
+    assert verify_backup(info["archive"])["sha256"] == info["sha256"]
+
+    # 備份後的變更在還原後消失
+    db.update_progress(2, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+    assert progress_ids(db_path) == [1, 2]
+    restored = restore_backup(info["archive"], db_path)
+    assert restored["size"] == info["size"]
+    assert progress_ids(db_path) == [1]
+
+
+def test_verify_detects_corruption(db_path, tmp_path):
+    info = create_backup(db_path, str(tmp_path / "backups"))
+    with gzip.open(info["archive"], "ab") as f:
+        f.write(b"tampered")
+    with pytest.raises(BackupError, match="checksum"):
+        verify_backup(info["archive"])
+    with pytest.raises(BackupError):
+        restore_backup(info["archive"], db_path)
+
+
+def test_rotation_keeps_the_newest_backups(db_path, tmp_path):
+    backup_dir = str(tmp_path / "backups")
+    archives = [create_backup(db_path, backup_dir, keep=2)["archive"] for _ in range(3)]
+
+    assert [str(path) for path in list_backups(backup_dir)] == archives[:0:-1]
+    assert len(list((tmp_path / "backups").glob("*.json"))) == 2
+
+    # keep=0 會刪掉剛建立的備份，直接拒絕
+    with pytest.raises(BackupError):
+        rotate_backups(backup_dir, "vocabulary", 0)
+    with pytest.raises(BackupError):
+        create_backup(db_path, backup_dir, keep=0)
+    assert len(list_backups(backup_dir)) == 2
+
+
+def test_command_line_rejects_non_positive_keep(db_path, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["--db", db_path, "--dir", str(tmp_path), "create", "--keep", "0"])
+    assert exc.value.code == 2
+    assert "positive integer" in capsys.readouterr().err
+    assert list_backups(str(tmp_path)) == []
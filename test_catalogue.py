@@ -0,0 +1,84 @@
+"""
+唯讀單字庫測試
+拆分後掛載單字庫的讀寫路徑、唯讀保護、遺失單字庫，以及未排名時拒絕拆分
+"""
+
+import pytest
+
+import day_number
+from catalogue import CatalogueError, split_database
+from database import MissingVocabularyError, ReadOnlyVocabularyError, open_database
+from frequency_rank import apply_frequency_ranks
+from quiz_engine import QuizEngine
+
+
+@pytest.fixture
+def catalogue_path(tmp_path):
+    return str(tmp_path / "catalogue.db")
+
+
+def test_split_keeps_progress_and_reads_through_catalogue(db_path, catalogue_path):
+    db = open_database(db_path, catalogue_path=None)
+    db.update_progress(2, ease_factor=2.5, interval_days=3, next_review=day_number.today())
+    db.toggle_favorite(5)
+    db.close()
+
+    info = split_database(db_path, catalogue_path)
+    assert info["words"] == 8
+
+    db = open_database(db_path, catalogue_path=catalogue_path)
+    try:
+        assert db.catalogue_attached
+        assert not db._has_local_vocabulary()
+        assert [word["id"] for word in db.get_new_words_page(limit=10)] == [1, 3, 4, 6, 7, 8]
+        assert db.count_new_words(level=2) == 2
+        assert [word["word"] for word in db.get_words_for_review()] == ["book"]
+        assert db.get_progress(5)["is_favorite"] == 1
+    finally:
+        db.close()
+
+
+def test_writes_after_split(db_path, catalogue_path, tmp_path):
+    split_database(db_path, catalogue_path)
+
+    engine = QuizEngine(db_path, catalogue_path=catalogue_path)
+    try:
+        engine.submit_binary_answer(3, know=True, is_new_word=True)
+    finally:
+        engine.close()
+
+    db = open_database(db_path, catalogue_path=catalogue_path)
+    try:
+        # 觸發器改由 TEMP 觸發器提供，學過的單字離開未學集合
+        assert 3 not in [word["id"] for word in db.get_new_words_page(limit=10)]
+        assert db.count_new_words() == 7
+        assert db.get_progress(3)["review_count"] == 1
+
+        with pytest.raises(ReadOnlyVocabularyError):
+            db.insert_vocabulary("zoo", "zu", "n", "動物園", 1)
+        frequency = tmp_path / "frequency.txt"
+        frequency.write_text("dog\n", encoding="utf-8")
+        with pytest.raises(ReadOnlyVocabularyError):
+            apply_frequency_ranks(db, frequency)
+    finally:
+        db.close()
+
+
+def test_missing_catalogue_is_an_error(db_path, catalogue_path, tmp_path):
+    split_database(db_path, catalogue_path)
+    with pytest.raises(MissingVocabularyError):
+        open_database(db_path, catalogue_path=str(tmp_path / "missing.db"))
+    with pytest.raises(MissingVocabularyError):
+        open_database(db_path, catalogue_path=None)
+
+
+def test_split_refuses_unranked_words(db, db_path, catalogue_path):
+    db.conn.execute("UPDATE vocabulary SET frequency_rank = NULL WHERE id = 8")
+    db.conn.commit()
+
+    with pytest.raises(CatalogueError, match="1 words have no frequency_rank"):
+        split_database(db_path, catalogue_path)
+    # 拒絕時資料庫保持不變
+    assert db._has_local_vocabulary()
+
+    assert split_database(db_path, catalogue_path, force=True)["words"] == 8
@@ -0,0 +1,112 @@
+"""
+命令列工具測試
+各子命令只載入需要的模組（出題相關的模組不應被查詢或批次作答載入），以及結束碼與輸出
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from catalogue import split_database
+from quiz_engine import QuizEngine
+
+SRC = str(Path(__file__).parent / "src")
+
+# 只有建立今日計畫或互動學習才需要的模組
+HEAVY_MODULES = {"quiz_engine", "question_bank", "word_index", "review_queue", "answer_matcher"}
+
+RUNNER = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import cli
+try:
+    cli.main(sys.argv[3:])
+finally:
+    with open(sys.argv[2], "w") as f:
+        json.dump(sorted(sys.modules), f)
+"""
+
+
+def run_cli(db_path, tmp_path, *args, stdin=""):
+    """在子行程執行 cli.main，回傳 (結果, 載入的模組)"""
+    modules_path = tmp_path / "modules.json"
+    result = subprocess.run(
+        [sys.executable, "-c", RUNNER, SRC, str(modules_path), "--db", db_path, *args],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+    )
+    return result, set(json.loads(modules_path.read_text()))
+
+
+@pytest.mark.parametrize(
+    "args, stdin",
+    [
+        (["due"], ""),
+        (["stats", "--json"], ""),
+        (["export"], ""),
+        (["backup", "--dir", "backups"], ""),
+        (["study", "--batch"], "1 y 900\napple n\n"),
+        (["study", "--limit", "3"], ""),
+    ],
+)
+def test_subcommands_skip_quiz_modules(db_path, tmp_path, args, stdin):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        engine.get_daily_plan()  # 計畫已存在時列出計畫不需要 QuizEngine
+    finally:
+        engine.close()
+
+    result, modules = run_cli(db_path, tmp_path, *args, stdin=stdin)
+    assert result.returncode == 0, result.stderr
+    assert modules & HEAVY_MODULES == set()
+
+
+def test_missing_database_exits_without_creating_it(tmp_path):
+    db_path = str(tmp_path / "missing.db")
+    result, _ = run_cli(db_path, tmp_path, "due")
+    assert result.returncode == 1
+    assert "找不到資料庫" in result.stderr
+    assert not Path(db_path).exists()
+
+
+def test_missing_vocabulary_exits_with_error(db_path, tmp_path):
+    split_database(db_path, str(tmp_path / "catalogue.db"))
+    # 預設的 --catalogue（data/catalogue.db）不存在
+    result, _ = run_cli(db_path, tmp_path, "stats")
+    assert result.returncode == 1
+    assert result.stderr.startswith("❌") and "no vocabulary table" in result.stderr
+
+    result, _ = run_cli(db_path, tmp_path, "--catalogue", "catalogue.db", "due")
+    assert (result.returncode, result.stdout) == (0, "0\n")
+
+
+def test_backup_rejects_keep_below_one(db_path, tmp_path):
+    result, _ = run_cli(db_path, tmp_path, "backup", "--keep", "0")
+    assert result.returncode == 2
+    assert "must be a positive integer" in result.stderr
+    assert not (tmp_path / "data" / "backups").exists()
+
+
+def test_batch_answers_and_output(db, db_path, tmp_path):
+    stdin = "# 註解\n1 y 900\napple\tn\nzebra y\nbook maybe\n\ncat 1 1500\n"
+    result, _ = run_cli(db_path, tmp_path, "study", "--batch", stdin=stdin)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "✓ 已記錄 3 題作答（會 2 題），略過 2 行\n"
+    assert "第 4 行找不到單字，略過：zebra" in result.stderr
+    assert "第 5 行格式錯誤" in result.stderr
+
+    assert db.get_progress(1)["review_count"] == 2
+    assert db.get_progress(3)["last_response_ms"] == 1500
+
+    result, _ = run_cli(db_path, tmp_path, "stats", "--json")
+    today = json.loads(result.stdout)["today"]
+    assert (today["new_words"], today["reviewed_words"], today["total_count"]) == (2, 1, 3)
+    assert today["study_time_seconds"] == 2
+
+    result, _ = run_cli(db_path, tmp_path, "due")
+    assert result.stdout == "0\n"
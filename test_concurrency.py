@@ -0,0 +1,95 @@
+"""
+多行程並行存取測試
+WAL 模式、鎖衝突時的退避重試，以及多個寫入行程同時作答不遺失
+"""
+
+import multiprocessing
+import sqlite3
+import threading
+
+import pytest
+
+from database import WRITE_RETRIES, open_database
+from quiz_engine import QuizEngine
+
+ANSWERS_PER_WRITER = 20
+
+
+def test_connections_use_wal(db):
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # 讀取不會被寫入交易阻擋
+    writer = open_database(db.db_path, catalogue_path=None)
+    try:
+        with writer.batch():
+            writer.toggle_favorite(1)
+            assert db.count_new_words() == 8
+    finally:
+        writer.close()
+
+
+def hold_write_lock(db_path, seconds):
+    """在另一個連線持有寫入鎖 seconds 秒"""
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.execute("BEGIN IMMEDIATE")
+    released = threading.Event()
+
+    def release():
+        released.wait(seconds)
+        conn.rollback()
+        conn.close()
+
+    thread = threading.Thread(target=release)
+    thread.start()
+    return thread
+
+
+def test_busy_writes_retry_with_backoff(db_path):
+    db = open_database(db_path, catalogue_path=None, busy_timeout=0.01)
+    try:
+        thread = hold_write_lock(db_path, 0.15)
+        db.toggle_favorite(1)
+        thread.join()
+        assert db.busy_retries > 0
+        assert db.last_lock_wait >= 0.1
+        assert db.get_progress(1)["is_favorite"] == 1
+    finally:
+        db.close()
+
+
+def test_busy_writes_give_up_after_retries(db_path, monkeypatch):
+    monkeypatch.setattr("database.RETRY_BASE_DELAY", 0.001)
+    db = open_database(db_path, catalogue_path=None, busy_timeout=0.001)
+    try:
+        thread = hold_write_lock(db_path, 1.0)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            db.toggle_favorite(1)
+        assert db.busy_retries == WRITE_RETRIES
+    finally:
+        db.close()
+        thread.join()
+
+
+def answer_words(db_path, first_id):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        for i in range(ANSWERS_PER_WRITER):
+            engine.submit_binary_answer(first_id + i % 2, know=i % 3 != 0, is_new_word=False)
+    finally:
+        engine.close()
+
+
+def test_concurrent_writer_processes_lose_no_answers(db_path, db):
+    processes = [
+        multiprocessing.Process(target=answer_words, args=(db_path, first_id))
+        for first_id in (1, 3, 5, 7)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    session = db.conn.execute("SELECT total_count FROM study_sessions").fetchone()
+    assert session[0] == len(processes) * ANSWERS_PER_WRITER
+    review_counts = db.conn.execute("SELECT SUM(review_count) FROM learning_progress").fetchone()
+    assert review_counts[0] == len(processes) * ANSWERS_PER_WRITER
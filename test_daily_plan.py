@@ -0,0 +1,57 @@
+"""
+每日學習計畫測試
+計畫建立一次後持久保存、新單字平均穿插、作答後標記完成、兄弟詞條每天只排一個
+"""
+
+import day_number
+from quiz_engine import QuizEngine
+
+
+def make_due(db, *vocabulary_ids):
+    for vocabulary_id in vocabulary_ids:
+        db.update_progress(
+            vocabulary_id, ease_factor=2.5, interval_days=3, next_review=day_number.today()
+        )
+
+
+def test_plan_interleaves_reviews_with_new_words(db, db_path):
+    make_due(db, 1, 2)
+    engine = QuizEngine(db_path, catalogue_path=None, new_per_day=3)
+    try:
+        plan = engine.get_daily_plan()
+    finally:
+        engine.close()
+
+    assert [word["kind"] for word in plan] == ["new", "review", "new", "review", "new"]
+    assert sorted(word["id"] for word in plan if word["kind"] == "review") == [1, 2]
+    assert [word["id"] for word in plan if word["kind"] == "new"] == [3, 4, 5]
+
+
+def test_plan_is_built_once_and_survives_restart(db, db_path):
+    make_due(db, 1)
+    engine = QuizEngine(db_path, catalogue_path=None, new_per_day=2)
+    try:
+        first = [word["id"] for word in engine.get_daily_plan()]
+        engine.submit_binary_answer(first[0], True, is_new_word=first[0] != 1)
+        # 新到期的單字不會改變今天已建立的計畫
+        make_due(db, 2)
+        assert [word["id"] for word in engine.get_daily_plan()] == first[1:]
+    finally:
+        engine.close()
+
+    restarted = QuizEngine(db_path, catalogue_path=None, new_per_day=2)
+    try:
+        assert [word["id"] for word in restarted.get_daily_plan(limit=1)] == first[1:2]
+        assert [word["id"] for word in restarted.get_daily_plan()] == first[1:]
+    finally:
+        restarted.close()
+
+
+def test_siblings_are_planned_one_per_day(db_path):
+    engine = QuizEngine(db_path, catalogue_path=None, new_per_day=7)
+    try:
+        plan = engine.get_daily_plan()
+    finally:
+        engine.close()
+    # arm (1) 與 arm (2) 只排一個，另一個留到之後
+    assert [word["id"] for word in plan] == [1, 2, 3, 4, 5, 7, 8]
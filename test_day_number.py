@@ -0,0 +1,56 @@
+"""
+日序數日期測試
+轉換函式，以及以整數日期計算的排程、連續天數與到期預測
+"""
+
+from datetime import date, timedelta
+
+import day_number
+from srs_algorithm import SM2Algorithm
+
+
+def test_conversions_round_trip():
+    assert day_number.from_iso("1970-01-01") == 0
+    assert day_number.from_iso("2024-03-01") - day_number.from_iso("2024-02-28") == 2
+    assert day_number.to_iso(day_number.from_iso("2024-02-29")) == "2024-02-29"
+    assert day_number.to_date(day_number.from_date(date(2031, 7, 4))) == date(2031, 7, 4)
+    assert day_number.today() == day_number.from_date(date.today())
+    # 舊資料的時間部分與已轉換的整數
+    assert day_number.from_iso("2024-01-05 08:30:00") == day_number.from_iso("2024-01-05")
+    assert day_number.from_iso(19000) == 19000
+    assert day_number.from_iso(None) is None and day_number.to_iso(None) is None
+
+
+def test_scheduling_returns_day_numbers():
+    _, interval, next_review = SM2Algorithm().calculate_binary(know=True)
+    assert isinstance(next_review, int)
+    assert next_review == day_number.today() + interval
+
+
+def test_streak_counts_consecutive_days(db):
+    today = day_number.today()
+    for day in (today, today - 1, today - 2, today - 4):
+        db.conn.execute(
+            "INSERT INTO study_sessions (date, new_words, total_count) VALUES (?, 1, 1)", (day,)
+        )
+    db.conn.commit()
+    assert db.get_learning_statistics()["streak_days"] == 3
+
+    db.conn.execute("DELETE FROM study_sessions WHERE date = ?", (today,))
+    db.conn.commit()
+    # 今天還沒學習時從今天起算，連續紀錄為 0
+    assert db.get_learning_statistics()["streak_days"] == 0
+
+
+def test_forecast_and_next_review_date(db):
+    today = day_number.today()
+    for vocabulary_id, next_review in ((1, today - 3), (2, today), (3, today + 2), (4, today + 40)):
+        db.update_progress(vocabulary_id, ease_factor=2.5, interval_days=1, next_review=next_review)
+
+    forecast = db.get_review_forecast(days=7)
+    assert len(forecast) == 7
+    assert forecast[0] == 2  # 逾期的計入今天
+    assert forecast[2] == 1
+    assert sum(forecast.values()) == 3
+    assert db.get_next_review_date(3) == date.today() + timedelta(days=2)
+    assert db.get_next_review_date(5) is None
@@ -0,0 +1,59 @@
+"""
+收藏列表分頁測試
+兩種排序的 keyset 分頁、關鍵字篩選，以及取消收藏後的列表與數量
+"""
+
+FAVORITES = (1, 3, 5, 7, 8)
+
+
+def read_all(db, order="level", keyword=None, limit=2):
+    """以 after 游標逐頁讀取"""
+    ids, after = [], None
+    while True:
+        page = db.get_favorite_words_page(after=after, limit=limit, order=order, keyword=keyword)
+        ids.extend(word["id"] for word in page)
+        if len(page) < limit:
+            return ids
+        last = page[-1]
+        if order == "word":
+            after = (last["word"], last["id"])
+        else:
+            after = (last["level"], last["word"], last["id"])
+
+
+def add_favorites(db):
+    for vocabulary_id in FAVORITES:
+        db.toggle_favorite(vocabulary_id)
+
+
+def test_pages_in_both_orders(db):
+    add_favorites(db)
+    assert read_all(db) == [1, 3, 5, 7, 8]
+    assert read_all(db, limit=1) == read_all(db, limit=10)
+    assert read_all(db, order="word") == [1, 5, 7, 3, 8]
+    assert read_all(db) == [word["id"] for word in db.get_favorite_words()]
+    assert db.count_favorite_words() == len(FAVORITES)
+
+
+def test_keyword_filter(db):
+    add_favorites(db)
+    assert read_all(db, keyword="a") == [1, 5]
+    assert read_all(db, order="word", keyword="C") == [3, 8]
+    assert read_all(db, keyword="勇") == [8]
+    # LIKE 萬用字元只當一般字元比對
+    assert read_all(db, keyword="%") == []
+    assert read_all(db, keyword="_pple") == []
+
+
+def test_unfavorite_and_short_translation(db):
+    add_favorites(db)
+    assert read_all(db) == [1, 3, 5, 7, 8]
+    assert db.toggle_favorite(3) is False
+    assert read_all(db) == [1, 5, 7, 8]
+    assert db.count_favorite_words() == 4
+
+    db.conn.execute("UPDATE vocabulary SET translation = ? WHERE id = 1", ("蘋果" * 20,))
+    db.conn.commit()
+    page = db.get_favorite_words_page(limit=1)
+    assert page[0]["short_translation"] == "蘋果" * 15 + "..."
+    assert page[0]["review_count"] == 0
@@ -0,0 +1,48 @@
+"""
+頻率排名測試
+頻率表讀取、排名計算，以及排名決定新單字的出題順序
+"""
+
+from frequency_rank import apply_frequency_ranks, compute_ranks, headword, load_frequency_list
+
+
+def write_list(tmp_path, *words):
+    path = tmp_path / "frequency.txt"
+    path.write_text("# 常用字頻率表\n" + "\n".join(words) + "\n", encoding="utf-8")
+    return path
+
+
+def new_word_ids(db):
+    return [word["id"] for word in db.get_new_words_page(limit=10)]
+
+
+def test_load_frequency_list(tmp_path):
+    path = write_list(tmp_path, "the", "Dog", "", "dog", "cat")
+    assert load_frequency_list(path) == {"the": 1, "dog": 2, "cat": 3}
+
+
+def test_compute_ranks():
+    assert headword("Arm (2)") == "arm"
+    frequency = {"the": 1, "miss": 2, "arm": 3, "cat": 4}
+    rows = [
+        (1, "zebra"), (2, "cat"), (3, "arm (2)"), (4, "Miss/miss"), (5, "arm (1)"), (6, "apple")
+    ]
+    # 頻率表中的單字依名次，同形異義字依 id 相鄰，其餘依字母順序排在後面
+    assert compute_ranks(rows, frequency) == [(1, 4), (2, 3), (3, 5), (4, 2), (5, 6), (6, 1)]
+
+
+def test_ranks_order_new_words(db, tmp_path):
+    # 匯入順序即預設排名
+    assert new_word_ids(db) == [1, 2, 3, 4, 5, 6, 7, 8]
+
+    path = write_list(tmp_path, "dog", "courage", "cat", "beautiful")
+    assert apply_frequency_ranks(db, path) == {"total": 8, "matched": 4}
+    # 級別仍優先，同級別內依頻率排名
+    assert new_word_ids(db) == [4, 3, 1, 2, 7, 5, 6, 8]
+
+    # 新增的單字沒有指定排名時排在最後
+    vocabulary_id = db.insert_vocabulary("zoo", "zu", "n", "動物園", 1)
+    assert db.conn.execute(
+        "SELECT frequency_rank FROM vocabulary WHERE id = ?", (vocabulary_id,)
+    ).fetchone()[0] == 9
+    assert new_word_ids(db)[:5] == [4, 3, 1, 2, vocabulary_id]
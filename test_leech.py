@@ -0,0 +1,74 @@
+"""
+難記單字（leech）測試
+遺忘次數的計算與達到 LEECH_THRESHOLD 時的處理
+"""
+
+import day_number
+from database import LEECH_THRESHOLD, open_database
+
+
+def learn(db, vocabulary_id):
+    """答對到間隔超過一天（之後答錯才算遺忘）"""
+    return db.update_progress(
+        vocabulary_id, ease_factor=2.5, interval_days=6, next_review=day_number.today()
+    )
+
+
+def forget(db, vocabulary_id):
+    return db.update_progress(
+        vocabulary_id,
+        ease_factor=2.3,
+        interval_days=1,
+        next_review=day_number.today(),
+        is_correct=False,
+    )
+
+
+def test_only_forgetting_a_learned_word_is_a_lapse(db):
+    forget(db, 1)  # 第一次就答錯
+    forget(db, 1)  # 連續答錯（間隔只有一天）
+    assert db.get_progress(1)["lapse_count"] == 0
+
+    learn(db, 1)
+    forget(db, 1)
+    assert db.get_progress(1)["lapse_count"] == 1
+
+
+def test_leech_is_suspended_at_threshold(db):
+    learn(db, 1)
+    for _ in range(LEECH_THRESHOLD - 1):
+        assert not forget(db, 1)
+        learn(db, 1)
+    assert db.get_leech_words() == []
+    assert db.count_due_words() == 1
+
+    assert forget(db, 1)
+    progress = db.get_progress(1)
+    assert progress["lapse_count"] == LEECH_THRESHOLD
+    assert progress["is_suspended"] == 1
+    assert [word["id"] for word in db.get_leech_words()] == [1]
+    # 暫停的單字不再到期
+    assert db.count_due_words() == 0
+    assert db.get_words_for_review() == []
+
+    # 超過門檻後不會重複處理
+    db.set_suspended(1, False)
+    learn(db, 1)
+    assert not forget(db, 1)
+    assert db.get_progress(1)["is_suspended"] == 0
+    assert db.count_due_words() == 1
+
+
+def test_leech_action_favorite(db_path):
+    db = open_database(db_path, catalogue_path=None, leech_action="favorite")
+    try:
+        learn(db, 2)
+        for _ in range(LEECH_THRESHOLD):
+            forget(db, 2)
+            learn(db, 2)
+        progress = db.get_progress(2)
+        assert progress["lapse_count"] == LEECH_THRESHOLD
+        assert progress["is_favorite"] == 1
+        assert progress["is_suspended"] == 0
+    finally:
+        db.close()
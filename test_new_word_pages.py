@@ -0,0 +1,54 @@
+"""
+新單字 keyset 分頁測試
+逐頁讀完所有未學單字、級別篩選，以及觸發器維護的未學集合
+"""
+
+import day_number
+from conftest import WORDS
+
+
+def read_all(db, level=None, limit=3):
+    """以 after 游標逐頁讀取"""
+    ids, after = [], None
+    while True:
+        page = db.get_new_words_page(level, after=after, limit=limit)
+        ids.extend(word["id"] for word in page)
+        if len(page) < limit:
+            return ids
+        last = page[-1]
+        after = (last["level"], last["sort_key"], last["id"])
+
+
+def test_pages_cover_every_unlearned_word_in_order(db):
+    assert read_all(db) == list(range(1, len(WORDS) + 1))
+    assert read_all(db, limit=1) == read_all(db, limit=len(WORDS))
+    assert read_all(db, level=2, limit=2) == [5, 6, 7]
+    assert db.count_new_words() == len(WORDS)
+    assert db.count_new_words(level=2) == 3
+
+
+def test_learned_words_leave_the_set(db):
+    db.update_progress(2, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+    db.update_progress(6, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+    assert read_all(db) == [1, 3, 4, 5, 7, 8]
+    assert db.count_new_words(level=2) == 2
+
+    # 刪除學習進度（重設）後回到未學集合，順序不變
+    db.conn.execute("DELETE FROM learning_progress WHERE vocabulary_id = 2")
+    db.conn.commit()
+    assert read_all(db) == [1, 2, 3, 4, 5, 7, 8]
+
+
+def test_set_matches_the_anti_join(db):
+    db.toggle_favorite(3)  # 收藏也會建立學習進度
+    db.update_progress(8, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+    expected = [
+        row[0]
+        for row in db.conn.execute("""
+            SELECT v.id FROM vocabulary v
+            LEFT JOIN learning_progress lp ON v.id = lp.vocabulary_id
+            WHERE lp.id IS NULL
+            ORDER BY v.level, v.frequency_rank
+        """)
+    ]
+    assert read_all(db) == expected == [1, 2, 4, 5, 6, 7]
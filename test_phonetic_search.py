@@ -0,0 +1,53 @@
+"""
+發音相近搜尋測試
+發音鍵的合併規則，以及依聽到的拼法找單字
+"""
+
+import pytest
+
+from phonetic_key import phonetic_key
+
+
+@pytest.mark.parametrize(
+    "word, key",
+    [
+        ("phone", "FN"),
+        ("fone", "FN"),
+        ("knight", "NT"),
+        ("night", "NT"),
+        ("xylophone", "SLFN"),
+        ("whale", "WL"),
+        ("wrist", "RST"),
+        ("thing", "0NK"),
+        ("judge", "JJ"),
+        ("arm (2)", "ARM"),
+        ("Miss/miss", "MS"),
+        ("123", ""),
+    ],
+)
+def test_phonetic_key(word, key):
+    assert phonetic_key(word) == key
+
+
+def test_keys_are_stored_with_the_words(db):
+    keys = dict(db.conn.execute("SELECT word, phonetic_key FROM vocabulary"))
+    assert keys["courage"] == "KRJ" and keys["beautiful"] == "BTFL"
+    db.insert_vocabulary("fancy", "ˈfænsi", "adj", "花俏的", 3)
+    assert db.search_sound_alike("phancy")[0]["word"] == "fancy"
+
+
+@pytest.mark.parametrize(
+    "heard, word",
+    [("kat", "cat"), ("bootiful", "beautiful"), ("kurij", "courage"), ("dawg", "dog")],
+)
+def test_search_sound_alike(db, heard, word):
+    results = db.search_sound_alike(heard)
+    assert results[0]["word"] == word
+    assert results[0]["phonetic_key"] == phonetic_key(heard)
+
+
+def test_search_sound_alike_limits(db):
+    # 發音鍵相同的排在前面，再來是長度相差一碼以內的近似鍵（APL）
+    assert [row["id"] for row in db.search_sound_alike("arm")] == [5, 6, 1]
+    assert len(db.search_sound_alike("arm", limit=1)) == 1
+    assert db.search_sound_alike("!!") == []
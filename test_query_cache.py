@@ -0,0 +1,57 @@
+"""
+查詢快取測試
+cached_read 的命中、回傳複本，以及寫入後的失效
+"""
+
+from database import open_database
+
+
+def test_repeated_reads_hit_the_cache(db):
+    db.get_statistics()
+    hits = db.cache_hits
+    db.get_statistics()
+    assert db.cache_hits == hits + 1
+
+
+def test_results_are_copies(db):
+    stats = db.get_learning_statistics()
+    stats["today"]["new_words"] = 999
+    stats["by_level"].clear()
+    stats["total_words"] = -1
+    again = db.get_learning_statistics()
+    assert again["today"]["new_words"] == 0
+    assert again["by_level"]
+    assert again["total_words"] == 8
+
+    summary = db.get_statistics()
+    summary["by_level"][1] = -1
+    assert db.get_statistics()["by_level"][1] == 4
+
+    words = db.get_words_by_level(1)
+    words.clear()
+    assert len(db.get_words_by_level(1)) == 4
+
+
+def test_write_methods_invalidate(db):
+    assert db.count_favorite_words() == 0
+    db.toggle_favorite(1)
+    assert db.count_favorite_words() == 1
+    assert db.get_progress(1)["is_favorite"] == 1
+
+
+def test_raw_sql_on_same_connection_invalidates(db):
+    assert db.get_progress(2) is None
+    db.conn.execute("INSERT INTO learning_progress (vocabulary_id) VALUES (2)")
+    db.conn.commit()
+    assert db.get_progress(2) is not None
+
+
+def test_other_connection_writes_invalidate(db, db_path):
+    assert db.count_new_words() == 8
+    other = open_database(db_path, catalogue_path=None)
+    try:
+        other.update_progress(3, ease_factor=2.5, interval_days=1, next_review=0)
+    finally:
+        other.close()
+    assert db.count_new_words() == 7
+    assert db.count_due_words() == 1
@@ -0,0 +1,60 @@
+"""
+選擇題題庫測試
+批次產生的題目格式、干擾選項不重複、相鄰級別補充，以及單字不足時不出題
+"""
+
+from conftest import WORDS
+from question_bank import OPTION_COUNT, QuestionBank, build_question_bank
+
+
+def cards(*vocabulary_ids):
+    return [{"id": i, "level": WORDS[i - 1][4]} for i in vocabulary_ids]
+
+
+def test_questions_have_distinct_options(db):
+    bank = build_question_bank(db, cards(*range(1, 9)), mode="mc_en2zh", seed=7)
+    assert len(bank) == 8
+
+    for vocabulary_id in range(1, 9):
+        word, phonetic, part_of_speech, translation, _ = WORDS[vocabulary_id - 1]
+        question = bank.question(vocabulary_id)
+        assert question["type"] == "mc_en2zh"
+        assert question["question"] == f"{word}\n[{phonetic}]\n{part_of_speech}"
+        assert len(question["option_ids"]) == OPTION_COUNT
+        assert len(set(question["options"])) == OPTION_COUNT
+        assert question["option_ids"][question["correct_index"]] == vocabulary_id
+        assert question["correct_answer"] == translation
+
+
+def test_zh2en_and_nearby_levels(db):
+    bank = build_question_bank(db, cards(8), mode="mc_zh2en", seed=1)
+    question = bank.question(8)
+    assert question["question"] == "勇氣"
+    assert question["correct_answer"] == "courage"
+    # 第 3 級只有一個單字，干擾選項來自相鄰的第 2 級
+    assert set(question["option_ids"]) - {8} <= {5, 6, 7}
+    assert bank.question(1) is None and 1 not in bank
+
+
+def test_same_seed_builds_the_same_bank(db):
+    first = build_question_bank(db, cards(1, 2, 5), seed=3)
+    second = build_question_bank(db, cards(1, 2, 5), seed=3)
+    assert [first.question(i) for i in (1, 2, 5)] == [second.question(i) for i in (1, 2, 5)]
+
+
+def test_too_few_words_skip_the_card(db):
+    db.conn.execute("DELETE FROM vocabulary WHERE id > 2")
+    db.conn.commit()
+    bank = build_question_bank(db, cards(1, 2), seed=0)
+    assert len(bank) == 0 and bank.question(1) is None
+
+
+def test_add_overwrites_a_question():
+    bank = QuestionBank()
+    bank._words = {i: (f"w{i}", "", "n", f"t{i}") for i in range(1, 6)}
+    bank.add(1, [1, 2, 3, 4], 0, 0)
+    bank.add(1, [5, 1, 3, 4], 1, 1)
+    assert len(bank) == 1
+    question = bank.question(1)
+    assert question["options"] == ["w5", "w1", "w3", "w4"]
+    assert question["correct_answer"] == "w1"
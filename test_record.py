@@ -0,0 +1,51 @@
+"""
+查詢結果列測試
+Record 的各種存取方式、與 dict 的相容性，以及同一組欄位共用子類別
+"""
+
+import pytest
+
+from database import Record, make_record
+
+
+def test_access_by_name_attribute_and_index(db):
+    row = db.conn.execute("SELECT id, word, level AS count FROM vocabulary WHERE id = 3").fetchone()
+    assert isinstance(row, Record)
+    assert row["word"] == row.word == row[1] == "cat"
+    assert row.id == 3
+    # 與 tuple 方法同名的欄位只能以名稱存取
+    assert row["count"] == 1 and callable(row.count)
+    assert row.get("word") == "cat" and row.get("missing", 0) == 0
+    with pytest.raises(KeyError):
+        row["missing"]
+    assert len(row) == 3 and tuple(row) == (3, "cat", 1)
+
+
+def test_dict_compatibility(db):
+    row = db.conn.execute("SELECT id, word FROM vocabulary WHERE id = 1").fetchone()
+    assert dict(row) == {"id": 1, "word": "apple"}
+    assert {**row, "extra": True} == {"id": 1, "word": "apple", "extra": True}
+    assert list(row.keys()) == ["id", "word"]
+    assert list(row.items()) == [("id", 1), ("word", "apple")]
+    assert row._asdict() == dict(row)
+    assert repr(row) == "Record(id=1, word='apple')"
+
+
+def test_replace_and_make_record():
+    row = make_record(["id", "word"], [5, "arm (1)"])
+    replaced = row._replace(word="arm")
+    assert replaced.word == "arm" and row.word == "arm (1)"
+    assert type(replaced) is type(row)
+    # 同一組欄位共用同一個子類別
+    assert type(make_record(("id", "word"), (6, "arm (2)"))) is type(row)
+    assert type(make_record(["word", "id"], ["x", 1])) is not type(row)
+
+
+def test_rows_share_a_class_and_stay_immutable(db):
+    rows = db.conn.execute("SELECT id, word FROM vocabulary").fetchall()
+    assert len({type(row) for row in rows}) == 1
+    with pytest.raises(TypeError):
+        rows[0]["word"] = "pear"
+    with pytest.raises(AttributeError):
+        rows[0].word = "pear"
+    assert db.get_progress(1) is None
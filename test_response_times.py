@@ -0,0 +1,67 @@
+"""
+作答時間測試
+想很久才答「會」的難度懲罰、作答時間的記錄與上限，以及作答時間統計
+"""
+
+import pytest
+
+from quiz_engine import QuizEngine
+from srs_algorithm import MAX_RESPONSE_MS, SM2Algorithm
+
+
+@pytest.mark.parametrize(
+    "review_count, interval, fast, slow",
+    [
+        (0, 0, (2.6, 1), (2.35, 1)),
+        (2, 3, (2.6, 7), (2.35, 3)),  # 停留在上一個固定間隔
+        (5, 10, (2.6, 26), (2.35, 12)),
+        (5, 2, (2.6, 5), (2.35, 3)),  # 至少多一天
+    ],
+)
+def test_slow_answers_grow_the_interval_less(review_count, interval, fast, slow):
+    sm2 = SM2Algorithm()
+    ef, days, _ = sm2.calculate_binary(True, 2.5, interval, review_count, response_ms=3000)
+    assert (ef, days) == pytest.approx(fast)
+    ef, days, _ = sm2.calculate_binary(True, 2.5, interval, review_count, response_ms=9000)
+    assert (ef, days) == pytest.approx(slow)
+
+
+def test_threshold_and_untimed_answers():
+    sm2 = SM2Algorithm()
+    normal = sm2.calculate_binary(True, 2.5, 10, 5)
+    assert sm2.calculate_binary(True, 2.5, 10, 5, response_ms=sm2.slow_answer_ms) == normal
+    # 難度因子不低於下限；「不會」不論快慢都重置
+    assert sm2.calculate_binary(True, 1.35, 10, 5, response_ms=20000)[0] == sm2.min_ease_factor
+    assert sm2.calculate_binary(False, 2.5, 10, 5, response_ms=20000)[:2] == (2.3, 1)
+
+
+def test_response_times_are_recorded(db, db_path):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        engine.submit_binary_answer(1, True, is_new_word=True, response_ms=1500)
+        engine.submit_binary_answer(1, True, response_ms=2700)
+        engine.submit_binary_answer(2, False, is_new_word=True)
+        result = engine.submit_binary_answer(3, True, is_new_word=True, response_ms=10 * 60_000)
+        assert result["response_ms"] == MAX_RESPONSE_MS
+    finally:
+        engine.close()
+
+    apple = db.get_progress(1)
+    assert (apple["response_ms_total"], apple["response_count"], apple["last_response_ms"]) == (
+        4200,
+        2,
+        2700,
+    )
+    assert db.get_progress(2)["response_count"] == 0
+    assert db.get_progress(2)["last_response_ms"] is None
+    seconds = db.conn.execute("SELECT study_time_seconds FROM study_sessions").fetchone()[0]
+    assert seconds == (4200 + MAX_RESPONSE_MS) // 1000
+
+    stats = db.get_response_time_stats(slowest=1)
+    assert stats["timed_cards"] == 2
+    assert stats["average_ms"] == (4200 + MAX_RESPONSE_MS) // 3
+    assert [(w["word"], w["average_ms"]) for w in stats["slowest"]] == [("cat", MAX_RESPONSE_MS)]
+
+
+def test_stats_without_timed_answers(db):
+    assert db.get_response_time_stats() == {"average_ms": None, "timed_cards": 0, "slowest": []}
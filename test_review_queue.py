@@ -0,0 +1,74 @@
+"""
+複習優先佇列測試
+記憶保留率的估計、堆積順序、增量更新與兄弟詞條去重
+"""
+
+import pytest
+
+from review_queue import TARGET_RETENTION, ReviewQueue, recall_probability
+
+TODAY = 20000
+
+
+def card(vocabulary_id, overdue=0, interval=4, ease_factor=2.5, lemma_key=None):
+    """逾期 overdue 天的單字"""
+    return {
+        "id": vocabulary_id,
+        "ease_factor": ease_factor,
+        "interval_days": interval,
+        "next_review": TODAY - overdue,
+        "lemma_key": lemma_key,
+    }
+
+
+def test_recall_probability():
+    # 剛好到期時約為目標保留率
+    assert recall_probability(2.5, 10, 10) == pytest.approx(TARGET_RETENTION)
+    assert recall_probability(2.5, 10, 20) < recall_probability(2.5, 10, 12)
+    assert recall_probability(1.3, 10, 12) < recall_probability(2.5, 10, 12)
+    assert recall_probability(2.5, 0, 0) == 1.0
+
+
+def test_top_orders_by_lowest_retention():
+    queue = ReviewQueue(TODAY)
+    queue.build(
+        [card(1, overdue=0), card(2, overdue=9), card(3, overdue=3), card(4, ease_factor=1.3)]
+    )
+    # 難度因子低的單字即使剛到期，保留率也低於逾期三天的單字
+    assert [c["id"] for c in queue.top(4)] == [2, 4, 3, 1]
+    assert [c["id"] for c in queue.top(2)] == [2, 4]
+    # top 不移出佇列
+    assert len(queue) == 4
+
+
+def test_update_and_remove_are_lazy():
+    queue = ReviewQueue(TODAY)
+    queue.build([card(1, overdue=1), card(2, overdue=5), card(3, overdue=3)])
+
+    queue.update(card(1, overdue=20))  # 重新排序
+    queue.update({**card(2), "next_review": TODAY + 3})  # 已不到期
+    queue.remove(3)
+    queue.update(card(5, overdue=2))  # 新加入
+
+    assert 2 not in queue and 3 not in queue
+    assert [c["id"] for c in queue.top(10)] == [1, 5]
+    assert queue.get(1)["next_review"] == TODAY - 20
+    assert queue.pop()["id"] == 1
+    assert queue.pop()["id"] == 5
+    assert queue.pop() is None and len(queue) == 0
+
+
+def test_top_distinct_keeps_one_sibling():
+    queue = ReviewQueue(TODAY)
+    queue.build(
+        [
+            card(1, overdue=1, lemma_key="arm"),
+            card(2, overdue=6, lemma_key="arm"),
+            card(3, overdue=3, lemma_key="cat"),
+            card(4, overdue=2),  # 沒有詞條鍵時以 ID 區分
+        ]
+    )
+    assert [c["id"] for c in queue.top_distinct(10)] == [2, 3, 4]
+    assert [c["id"] for c in queue.top_distinct(2)] == [2, 3]
+    # 其餘兄弟詞條留在佇列中
+    assert 1 in queue and len(queue) == 4
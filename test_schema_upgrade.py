@@ -0,0 +1,114 @@
+"""
+資料庫結構升級測試
+從最初版本（沒有 user_version、日期為文字）的資料庫升級到最新結構
+"""
+
+import sqlite3
+
+import day_number
+from database import SCHEMA_VERSION, open_database
+from lemma_key import lemma_key
+
+# 最初版本的資料表（PRAGMA user_version = 0）
+ORIGINAL_SCHEMA = """
+    CREATE TABLE vocabulary (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT NOT NULL,
+        phonetic TEXT,
+        part_of_speech TEXT,
+        translation TEXT NOT NULL,
+        level INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(word, part_of_speech, level)
+    );
+    CREATE TABLE learning_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vocabulary_id INTEGER NOT NULL,
+        familiarity INTEGER DEFAULT 0,
+        last_reviewed TIMESTAMP,
+        review_count INTEGER DEFAULT 0,
+        correct_count INTEGER DEFAULT 0,
+        ease_factor REAL DEFAULT 2.5,
+        interval_days INTEGER DEFAULT 0,
+        next_review DATE,
+        is_favorite BOOLEAN DEFAULT 0,
+        FOREIGN KEY (vocabulary_id) REFERENCES vocabulary(id),
+        UNIQUE(vocabulary_id)
+    );
+    CREATE TABLE study_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL UNIQUE,
+        new_words INTEGER DEFAULT 0,
+        reviewed_words INTEGER DEFAULT 0,
+        correct_count INTEGER DEFAULT 0,
+        total_count INTEGER DEFAULT 0,
+        study_time_seconds INTEGER DEFAULT 0
+    );
+    CREATE INDEX idx_level ON vocabulary(level);
+    CREATE INDEX idx_word ON vocabulary(word);
+    CREATE INDEX idx_next_review ON learning_progress(next_review);
+    CREATE INDEX idx_favorite ON learning_progress(is_favorite);
+
+    INSERT INTO vocabulary (word, phonetic, part_of_speech, translation, level) VALUES
+        ('cat', 'kæt', 'n', '貓', 1),
+        ('arm (1)', 'ɑrm', 'n', '手臂', 2),
+        ('apple', 'ˈæpl', 'n', '蘋果', 1);
+    INSERT INTO learning_progress
+        (vocabulary_id, review_count, correct_count, ease_factor, interval_days, next_review)
+        VALUES (1, 3, 2, 2.4, 6, '2024-01-05');
+    INSERT INTO study_sessions (date, new_words, reviewed_words, correct_count, total_count)
+        VALUES ('2024-01-04', 1, 3, 2, 3);
+"""
+
+
+def create_original_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(ORIGINAL_SCHEMA)
+    conn.close()
+
+
+def test_upgrade_from_original_schema(tmp_path):
+    path = str(tmp_path / "old.db")
+    create_original_database(path)
+
+    db = open_database(path, catalogue_path=None)
+    try:
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+        # 文字日期轉為日序數
+        progress = db.get_progress(1)
+        assert progress["next_review"] == day_number.from_iso("2024-01-05")
+        assert progress["review_count"] == 3
+        assert progress["lapse_count"] == 0
+        assert progress["response_count"] == 0
+        session = db.conn.execute("SELECT date FROM study_sessions").fetchone()
+        assert session["date"] == day_number.from_iso("2024-01-04")
+
+        # 單字的衍生欄位與未學習集合
+        words = db.conn.execute(
+            "SELECT word, frequency_rank, lemma_key, phonetic_key FROM vocabulary ORDER BY id"
+        ).fetchall()
+        assert all(word["frequency_rank"] is not None for word in words)
+        assert all(word["phonetic_key"] for word in words)
+        assert [word["lemma_key"] for word in words] == [lemma_key(w["word"]) for w in words]
+        unlearned = db.conn.execute(
+            "SELECT vocabulary_id FROM unlearned_words ORDER BY vocabulary_id"
+        ).fetchall()
+        assert [row[0] for row in unlearned] == [2, 3]
+
+        # 升級後可正常查詢與寫入，變更取得版本號
+        assert db.count_due_words() == 1
+        before = db.conn.execute("SELECT version FROM learning_progress").fetchone()[0]
+        db.update_progress(1, ease_factor=2.5, interval_days=1, next_review=day_number.today())
+        after = db.conn.execute("SELECT version FROM learning_progress").fetchone()[0]
+        assert after > before
+    finally:
+        db.close()
+
+    # 再次開啟不重複升級
+    db = open_database(path, catalogue_path=None)
+    try:
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert db.get_progress(1)["review_count"] == 4
+    finally:
+        db.close()
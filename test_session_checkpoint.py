@@ -0,0 +1,144 @@
+"""
+學習進度檢查點測試
+重播作答、返回、寫入標記與重測事件後重建的流程狀態，以及已寫入作答的判斷
+"""
+
+import json
+
+import pytest
+
+from quiz_engine import QuizEngine
+from session_checkpoint import SessionCheckpoint, load_checkpoint
+
+
+@pytest.fixture
+def words(db):
+    return db.get_words_by_level(1)
+
+
+@pytest.fixture
+def checkpoint(tmp_path, words):
+    checkpoint = SessionCheckpoint(str(tmp_path / "session.jsonl"))
+    checkpoint.start("new", 1, "flip", words)
+    yield checkpoint
+    checkpoint.close()
+
+
+def test_replay_restores_position_wrong_words_and_unflushed(checkpoint, words):
+    ids = [word["id"] for word in words]
+    checkpoint.answer(0, ids[0], wrong=False, know=True, is_new_word=True, response_ms=800)
+    checkpoint.answer(1, ids[1], wrong=True, know=False, is_new_word=True, response_ms=None)
+    checkpoint.flushed(1)
+    checkpoint.answer(2, ids[2], wrong=True, know=False, is_new_word=True, response_ms=1500)
+    checkpoint.back()
+    checkpoint.answer(2, ids[2], wrong=False, know=True, is_new_word=True, response_ms=1200)
+    checkpoint.close()
+
+    state = load_checkpoint(str(checkpoint.path))
+    assert (state.mode, state.level, state.quiz_style) == ("new", 1, "flip")
+    assert [word["id"] for word in state.words] == ids
+    assert state.words[0]["word"] == words[0]["word"]
+    assert state.current_index == 3
+    assert [word["id"] for word in state.wrong_words] == [ids[1]]
+    assert state.unflushed == [[ids[1], False, True, None], [ids[2], True, True, 1200]]
+    assert state.remaining == len(ids) - 3 + 1
+
+
+def test_torn_last_line_is_ignored(checkpoint, words):
+    checkpoint.answer(
+        0, words[0]["id"], wrong=False, know=True, is_new_word=True, response_ms=None
+    )
+    checkpoint.close()
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"a":[1,')
+
+    state = load_checkpoint(str(checkpoint.path))
+    assert state.current_index == 1
+    assert len(state.unflushed) == 1
+
+
+def test_new_round_replays_wrong_words(checkpoint, words):
+    for index, word in enumerate(words):
+        checkpoint.answer(
+            index, word["id"], wrong=index == 0, know=index != 0, is_new_word=True, response_ms=None
+        )
+    checkpoint.flushed(len(words))
+    checkpoint.new_round([words[0]])
+    checkpoint.close()
+
+    state = load_checkpoint(str(checkpoint.path))
+    assert [word["id"] for word in state.words] == [words[0]["id"]]
+    assert state.current_index == 0
+    assert state.wrong_words == [] and state.unflushed == []
+    assert state.remaining == 1
+
+
+def test_completed_or_stale_sessions_are_not_offered(checkpoint, words):
+    for index, word in enumerate(words):
+        checkpoint.answer(
+            index, word["id"], wrong=False, know=True, is_new_word=True, response_ms=None
+        )
+    checkpoint.close()
+    # 題目都答完但還有未寫入的作答，仍需繼續以重新提交
+    assert load_checkpoint(str(checkpoint.path)) is not None
+
+    checkpoint.resume()
+    checkpoint.flushed(len(words))
+    checkpoint.close()
+    assert load_checkpoint(str(checkpoint.path)) is None
+
+    lines = checkpoint.path.read_text(encoding="utf-8").splitlines()
+    header = json.loads(lines[0])
+    header["day"] -= 1
+    checkpoint.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+    assert load_checkpoint(str(checkpoint.path)) is None
+
+    checkpoint.finish()
+    assert not checkpoint.path.exists()
+    assert load_checkpoint(str(checkpoint.path)) is None
+
+
+def test_stale_session_still_returns_unflushed_answers(checkpoint, words):
+    checkpoint.answer(0, words[0]["id"], wrong=False, know=True, is_new_word=True, response_ms=600)
+    checkpoint.close()
+    lines = checkpoint.path.read_text(encoding="utf-8").splitlines()
+    header = json.loads(lines[0])
+    header["day"] -= 1
+    lines[0] = json.dumps(header)
+    checkpoint.path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    # 不再提供繼續，但未寫入的作答仍要補寫
+    state = load_checkpoint(str(checkpoint.path))
+    assert state.stale
+    assert state.unflushed == [[words[0]["id"], True, True, 600]]
+
+
+def test_drop_written_skips_answers_committed_before_the_flush_record(
+    checkpoint, words, db, db_path
+):
+    ids = [words[0]["id"], words[1]["id"], words[0]["id"]]
+    engine = QuizEngine(db_path, catalogue_path=None, undo_window=1)
+    try:
+        for index, vocabulary_id in enumerate(ids):
+            result = engine.submit_binary_answer(vocabulary_id, True, is_new_word=index < 2)
+            checkpoint.answer(
+                index,
+                vocabulary_id,
+                wrong=False,
+                know=True,
+                is_new_word=index < 2,
+                response_ms=None,
+                review_count=result["review_count"],
+            )
+        # 前兩筆已寫入資料庫，但在記錄 "f" 之前中斷
+        assert engine.pending_count == 1
+    finally:
+        engine.db.close()
+    checkpoint.close()
+
+    state = load_checkpoint(str(checkpoint.path))
+    assert len(state.unflushed) == 3
+    # 同一個單字的第二次作答需要 review_count 2，尚未寫入
+    assert state.drop_written(db) == 2
+    assert state.unflushed == [[words[0]["id"], True, False, None]]
+    assert state.drop_written(db) == 0
@@ -0,0 +1,69 @@
+"""
+兄弟詞條測試
+詞條鍵的正規化、同一詞條鍵的單字每次只出一個，作答後兄弟詞條延到隔天
+"""
+
+import day_number
+from lemma_key import lemma_key
+from quiz_engine import QuizEngine
+
+
+def make_due(db, vocabulary_id, overdue, interval=3):
+    db.update_progress(
+        vocabulary_id,
+        ease_factor=2.5,
+        interval_days=interval,
+        next_review=day_number.today() - overdue,
+    )
+
+
+def review_ids(engine):
+    return sorted(word["id"] for word in engine.get_quiz_words("review"))
+
+
+def test_lemma_key():
+    assert lemma_key("arm (1)") == lemma_key("Arm (2)") == "arm"
+    assert lemma_key("Miss/miss") == "miss"
+    assert lemma_key(" Apple ") == "apple"
+
+
+def test_siblings_share_a_key(db):
+    keys = dict(db.conn.execute("SELECT id, lemma_key FROM vocabulary"))
+    assert keys[5] == keys[6] == "arm"
+    assert db.get_sibling_ids(5) == [6]
+    assert db.get_sibling_ids(1) == []
+    db.insert_vocabulary("Arm (3)", "ɑrm", "n", "部門", 4)
+    assert sorted(db.get_sibling_ids(5)) == [6, 9]
+
+
+def test_new_words_skip_siblings(db_path):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        words = engine.get_quiz_words("new", limit=8)
+        assert [word["id"] for word in words] == [1, 2, 3, 4, 5, 7, 8]
+        words = engine.get_quiz_words("new", level=2, limit=3)
+        assert [word["id"] for word in words] == [5, 7]
+    finally:
+        engine.close()
+
+
+def test_answered_siblings_are_buried_until_tomorrow(db, db_path, monkeypatch):
+    make_due(db, 1, overdue=1)
+    make_due(db, 5, overdue=1)
+    make_due(db, 6, overdue=5)
+
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        # 保留率較低的 arm (2) 代表這組兄弟詞條
+        assert review_ids(engine) == [1, 6]
+        engine.submit_binary_answer(6, know=True)
+        # arm (1) 仍到期，但今天不再出現
+        assert db.get_progress(5)["next_review"] <= day_number.today()
+        assert review_ids(engine) == [1]
+
+        tomorrow = day_number.today() + 1
+        monkeypatch.setattr(day_number, "today", lambda: tomorrow)
+        ids = review_ids(engine)
+        assert 1 in ids and 5 in ids
+    finally:
+        engine.close()
@@ -0,0 +1,127 @@
+"""
+學習進度快照測試
+每個進度欄位的匯出/匯入往返，以及舊版（v1）快照的讀取
+"""
+
+import io
+
+import pytest
+
+import day_number
+from snapshot import (
+    FIELDS,
+    FIELDS_V1,
+    SnapshotError,
+    SnapshotReader,
+    SnapshotWriter,
+    export_progress,
+    import_progress,
+)
+
+# 以 v1 寫入器產生的快照：vocabulary_id 2（完整資料）與 5（可為 NULL 的欄位皆為 NULL）
+V1_SNAPSHOT = bytes.fromhex(
+    "5642535001000000020000001c000000144d0000886c96650000000040f397d38c01000078da63626660"
+    "606460666062d8b08371c5614636200f0401231602ea0000000000000000000000000000000000000000"
+    "0000000000000000"
+)
+
+
+def progress_rows(db):
+    return [
+        tuple(row)
+        for row in db.conn.execute(
+            f"SELECT {', '.join(FIELDS)} FROM learning_progress ORDER BY vocabulary_id"
+        )
+    ]
+
+
+def fill_progress(db):
+    """每個快照欄位都填入非預設值（含 NULL；updated_at 由觸發器維護，不會是 NULL）"""
+    today = day_number.today()
+    for vocabulary_id in (1, 2, 3, 5, 8):
+        db.update_progress(
+            vocabulary_id, ease_factor=2.5, interval_days=1, next_review=today, response_ms=900
+        )
+    db.conn.execute("""
+        UPDATE learning_progress SET
+            familiarity = vocabulary_id,
+            correct_count = 2,
+            ease_factor = ROUND(1.3 + vocabulary_id / 10.0, 4),
+            interval_days = vocabulary_id * 3,
+            next_review = next_review + vocabulary_id,
+            is_favorite = vocabulary_id % 2,
+            response_ms_total = 1000 * vocabulary_id,
+            response_count = vocabulary_id,
+            last_response_ms = CASE WHEN vocabulary_id = 3 THEN NULL ELSE 250 * vocabulary_id END,
+            lapse_count = vocabulary_id - 1,
+            is_suspended = vocabulary_id = 8
+    """)
+    db.conn.execute("""
+        UPDATE learning_progress SET last_reviewed = NULL, next_review = NULL
+        WHERE vocabulary_id = 5
+    """)
+    db.conn.commit()
+
+
+@pytest.mark.parametrize("block_rows", [2, 4096])
+def test_round_trip_keeps_every_column(db, block_rows):
+    fill_progress(db)
+    before = progress_rows(db)
+    assert len(before) == 5
+
+    buffer = io.BytesIO()
+    writer = SnapshotWriter(buffer, block_rows=block_rows)
+    for row in db.conn.execute(
+        f"SELECT {', '.join(FIELDS)} FROM learning_progress ORDER BY vocabulary_id"
+    ):
+        writer.write(row)
+    writer.close()
+
+    buffer.seek(0)
+    assert import_progress(db, buffer, replace=True) == 5
+    assert progress_rows(db) == before
+
+
+def test_export_import_after_clearing(db):
+    fill_progress(db)
+    before = progress_rows(db)
+    buffer = io.BytesIO()
+    assert export_progress(db, buffer) == 5
+
+    db.conn.execute("DELETE FROM learning_progress")
+    db.conn.commit()
+    buffer.seek(0)
+    import_progress(db, buffer)
+    assert progress_rows(db) == before
+
+
+def test_reads_version_1_snapshot(db):
+    reader = SnapshotReader(io.BytesIO(V1_SNAPSHOT))
+    assert reader.version == 1
+    assert reader.fields == FIELDS_V1
+    rows = list(reader)
+    assert [row["vocabulary_id"] for row in rows] == [2, 5]
+    assert rows[0]["next_review"] == day_number.from_iso("2024-01-10")
+    assert rows[0]["last_reviewed"] == "2024-01-04 08:30:00"
+    assert rows[0]["ease_factor"] == 2.36
+    assert rows[1]["next_review"] is None and rows[1]["updated_at"] is None
+
+    # v1 沒有的欄位：已存在的列保留原值，新增的列使用預設值
+    db.update_progress(2, ease_factor=2.5, interval_days=1, next_review=0, response_ms=700)
+    db.conn.execute("UPDATE learning_progress SET lapse_count = 4, is_suspended = 1")
+    db.conn.commit()
+    assert import_progress(db, io.BytesIO(V1_SNAPSHOT)) == 2
+
+    existing, added = db.get_progress(2), db.get_progress(5)
+    assert existing["review_count"] == 3
+    assert existing["lapse_count"] == 4 and existing["is_suspended"] == 1
+    assert existing["response_ms_total"] == 700
+    assert added["lapse_count"] == 0 and added["response_count"] == 0
+    assert added["last_response_ms"] is None
+
+
+def test_rejects_unknown_version():
+    data = bytearray(V1_SNAPSHOT)
+    data[4] = 9
+    with pytest.raises(SnapshotError):
+        SnapshotReader(io.BytesIO(bytes(data)))
@@ -0,0 +1,76 @@
+"""
+學習統計彙總測試
+觸發器以差值維護的每週、每月彙總，以及圖表讀取的近期範圍
+"""
+
+from datetime import date
+
+import day_number
+
+SUNDAY = day_number.from_date(date(2026, 3, 29))
+MONDAY = day_number.from_date(date(2026, 3, 30))
+THURSDAY = day_number.from_date(date(2026, 4, 2))
+
+
+def add_session(db, day, new_words, reviewed_words, correct, total):
+    db.conn.execute(
+        """
+        INSERT INTO study_sessions (date, new_words, reviewed_words, correct_count, total_count)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        (day, new_words, reviewed_words, correct, total),
+    )
+    db.conn.commit()
+
+
+def weekly(db):
+    return {
+        row["week_start"]: tuple(row)[1:]
+        for row in db.conn.execute("SELECT * FROM study_weekly WHERE days_studied > 0")
+    }
+
+
+def monthly(db):
+    return {
+        row["month"]: tuple(row)[1:]
+        for row in db.conn.execute("SELECT * FROM study_monthly WHERE days_studied > 0")
+    }
+
+
+def test_sessions_roll_up_by_week_and_month(db):
+    add_session(db, SUNDAY, 2, 3, 4, 5)
+    add_session(db, MONDAY, 1, 1, 1, 2)
+    add_session(db, THURSDAY, 5, 0, 3, 5)
+
+    # 週一開始新的一週；四月二日與三月三十日同一週、不同月份
+    assert weekly(db) == {SUNDAY - 6: (1, 2, 3, 4, 5), MONDAY: (2, 6, 1, 4, 7)}
+    assert monthly(db) == {"2026-03": (2, 3, 4, 5, 7), "2026-04": (1, 5, 0, 3, 5)}
+
+
+def test_updates_and_deletes_adjust_the_rollups(db):
+    add_session(db, SUNDAY, 2, 3, 4, 5)
+    add_session(db, THURSDAY, 5, 0, 3, 5)
+
+    db.conn.execute("UPDATE study_sessions SET correct_count = 5 WHERE date = ?", (THURSDAY,))
+    db.conn.execute("UPDATE study_sessions SET date = ? WHERE date = ?", (MONDAY, SUNDAY))
+    db.conn.commit()
+    assert weekly(db) == {MONDAY: (2, 7, 3, 9, 10)}
+    assert monthly(db) == {"2026-03": (1, 2, 3, 4, 5), "2026-04": (1, 5, 0, 5, 5)}
+
+    db.conn.execute("DELETE FROM study_sessions WHERE date = ?", (THURSDAY,))
+    db.conn.commit()
+    assert weekly(db) == {MONDAY: (1, 2, 3, 4, 5)}
+    assert monthly(db) == {"2026-03": (1, 2, 3, 4, 5)}
+
+
+def test_record_study_session_feeds_recent_rollups(db):
+    db.record_study_session(new_words=2, correct=3, total=4)
+    db.record_study_session(reviewed_words=1, correct=1, total=1)
+    add_session(db, day_number.today() - 400, 9, 9, 9, 9)  # 超過一年，不在圖表範圍
+
+    (week,) = db.get_weekly_rollups()
+    assert week["week_start"] <= day_number.today() < week["week_start"] + 7
+    assert (week["days_studied"], week["new_words"], week["correct_count"]) == (1, 2, 4)
+    (month,) = db.get_monthly_rollups()
+    assert month["month"] == date.today().strftime("%Y-%m")
+    assert month["total_count"] == 5
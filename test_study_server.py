@@ -0,0 +1,183 @@
+"""
+學習伺服器測試
+寫入合併器的批次與順序、關閉時寫完佇列、讀取引擎的佇列增量更新，以及 HTTP 路由
+"""
+
+import asyncio
+import json
+
+import day_number
+from study_server import EnginePool, StudyServer, WriteCoalescer
+
+
+def make_due(db, *vocabulary_ids):
+    """讓單字今天到期"""
+    for vocabulary_id in vocabulary_ids:
+        db.update_progress(
+            vocabulary_id, ease_factor=2.5, interval_days=3, next_review=day_number.today()
+        )
+
+
+async def open_coalescer(db_path, readers=None, **options):
+    coalescer = WriteCoalescer(
+        EnginePool(db_path, size=1),
+        on_commit=readers.note_writes if readers else None,
+        **options,
+    )
+    await coalescer.pool.open()
+    coalescer.start()
+    return coalescer
+
+
+async def close_coalescer(coalescer):
+    await coalescer.close()
+    await coalescer.pool.close()
+
+
+def test_concurrent_answers_share_one_transaction_in_order(db_path):
+    async def scenario():
+        coalescer = await open_coalescer(db_path)
+        try:
+            answers = [{"vocabulary_id": 1, "know": True, "is_new_word": i == 0} for i in range(5)]
+            answers.append({"vocabulary_id": 2, "know": False, "is_new_word": True})
+            results = await asyncio.gather(*(coalescer.submit(answer) for answer in answers))
+            return coalescer.batches, coalescer.answers, results
+        finally:
+            await close_coalescer(coalescer)
+
+    batches, answered, results = asyncio.run(scenario())
+    assert (batches, answered) == (1, 6)
+    # 同一個單字的作答依提交順序套用
+    assert [result["review_count"] for result in results[:5]] == [1, 2, 3, 4, 5]
+    assert [result["interval_days"] for result in results[:3]] == [1, 3, 7]
+    assert results[5]["is_correct"] is False
+
+
+def test_batches_respect_max_batch(db_path):
+    async def scenario():
+        coalescer = await open_coalescer(db_path, max_batch=3)
+        try:
+            await asyncio.gather(
+                *(
+                    coalescer.submit({"vocabulary_id": i, "know": True, "is_new_word": True})
+                    for i in range(1, 8)
+                )
+            )
+            return coalescer.batches, coalescer.answers
+        finally:
+            await close_coalescer(coalescer)
+
+    assert asyncio.run(scenario()) == (3, 7)
+
+
+def test_close_writes_queued_answers_and_rejects_new_ones(db_path, db):
+    async def scenario():
+        coalescer = await open_coalescer(db_path)
+        pending = [
+            asyncio.ensure_future(
+                coalescer.submit({"vocabulary_id": i, "know": True, "is_new_word": True})
+            )
+            for i in range(1, 9)
+        ]
+        await asyncio.sleep(0)  # 讓作答排入佇列
+        await coalescer.close()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        try:
+            await coalescer.submit({"vocabulary_id": 1, "know": True, "is_new_word": False})
+            rejected = None
+        except RuntimeError as e:
+            rejected = e
+        await coalescer.pool.close()
+        return results, rejected
+
+    results, rejected = asyncio.run(scenario())
+    assert not any(isinstance(result, Exception) for result in results)
+    assert rejected is not None
+    assert db.conn.execute("SELECT COUNT(*) FROM learning_progress").fetchone()[0] == 8
+
+
+def review_ids(engine):
+    return sorted(card["id"] for card in engine.get_quiz_words(mode="review"))
+
+
+def test_readers_apply_written_words_without_rebuilding(db_path, db):
+    make_due(db, 1, 2, 3)
+
+    async def scenario():
+        readers = EnginePool(db_path, size=1)
+        await readers.open()
+        coalescer = await open_coalescer(db_path, readers=readers)
+        try:
+            before = await readers.run(review_ids)
+
+            rebuilds = []
+
+            def count_rebuilds(engine):
+                original = engine.db.get_words_for_review
+                engine.db.get_words_for_review = lambda **kw: rebuilds.append(1) or original(**kw)
+
+            await readers.run(count_rebuilds)
+            await coalescer.submit({"vocabulary_id": 2, "know": True, "is_new_word": False})
+            after = await readers.run(review_ids)
+            return before, after, len(rebuilds)
+        finally:
+            await close_coalescer(coalescer)
+            await readers.close()
+
+    before, after, rebuilds = asyncio.run(scenario())
+    assert before == [1, 2, 3]
+    assert after == [1, 3]
+    assert rebuilds == 0
+
+
+async def http_request(port, method, path, payload=None):
+    """送出一個 Connection: close 的請求，回傳 (狀態碼, JSON)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def test_http_routes(db_path, db):
+    make_due(db, 4)
+
+    async def scenario():
+        server = StudyServer(db_path, pool_size=2)
+        await server.start(port=0)
+        port = server.http.port
+        try:
+            return [
+                await http_request(port, "GET", "/health"),
+                await http_request(port, "GET", "/api/study/cards?mode=review&limit=5"),
+                await http_request(port, "GET", "/api/study/cards?mode=bogus"),
+                await http_request(port, "POST", "/api/study/answer", {"vocabulary_id": 4}),
+                await http_request(
+                    port, "POST", "/api/study/answer", {"vocabulary_id": 999, "know": True}
+                ),
+                await http_request(
+                    port, "POST", "/api/study/answer", {"vocabulary_id": 4, "know": True}
+                ),
+                await http_request(port, "GET", "/api/study/stats"),
+            ]
+        finally:
+            await server.close()
+
+    health, cards, bad_mode, missing, unknown, answered, stats = asyncio.run(scenario())
+    assert health == (200, {"status": "ok"})
+    assert cards[0] == 200
+    assert [card["id"] for card in cards[1]["cards"]] == [4]
+    assert cards[1]["cards"][0]["next_review"] == day_number.to_iso(day_number.today())
+    assert bad_mode[0] == 400 and bad_mode[1]["error"] == "INVALID_MODE"
+    assert missing[0] == 400 and missing[1]["error"] == "MISSING_FIELDS"
+    assert unknown[0] == 404 and unknown[1]["error"] == "WORD_NOT_FOUND"
+    assert answered[0] == 200
+    assert answered[1]["next_review"] > day_number.to_iso(day_number.today())
+    assert stats[0] == 200
@@ -0,0 +1,188 @@
+"""
+增量同步測試
+changes_since 的分頁與游標、apply_changes 的 LWW 合併、每日統計的逐欄最大值合併
+"""
+
+import shutil
+import sqlite3
+
+import pytest
+
+import day_number
+from database import open_database
+from sync_engine import PROGRESS_FIELDS, SESSION_FIELDS, SyncEngine
+from sync_server import LocalSyncStore
+
+
+@pytest.fixture
+def other(db_path, tmp_path):
+    """與 db 內容相同的第二個裝置"""
+    path = tmp_path / "other.db"
+    shutil.copy(db_path, path)
+    database = open_database(str(path), catalogue_path=None)
+    yield database
+    database.close()
+
+
+def answer(db, vocabulary_id, is_correct=True, response_ms=None):
+    """寫入一次作答"""
+    db.update_progress(
+        vocabulary_id,
+        ease_factor=2.5,
+        interval_days=1,
+        next_review=day_number.today() + 1,
+        is_correct=is_correct,
+        response_ms=response_ms,
+    )
+
+
+def progress_ids(changes):
+    return [row[0] for row in changes["progress"]]
+
+
+def test_changes_since_returns_rows_after_version(db):
+    engine = SyncEngine(db)
+    for vocabulary_id in (1, 2, 3):
+        answer(db, vocabulary_id)
+
+    changes = engine.changes_since(0)
+    assert sorted(progress_ids(changes)) == [1, 2, 3]
+    assert changes["fields"] == list(PROGRESS_FIELDS)
+    assert changes["version"] == engine.current_version()
+    assert not changes["has_more"]
+
+    answer(db, 4)
+    later = engine.changes_since(changes["version"])
+    assert progress_ids(later) == [4]
+    assert engine.changes_since(later["version"])["progress"] == []
+
+
+def test_changes_since_pages_cover_every_change(db):
+    engine = SyncEngine(db)
+    for vocabulary_id in range(1, 8):
+        answer(db, vocabulary_id)
+    db.record_study_session(new_words=7, total=7, correct=7)
+
+    seen, version, pages = [], 0, 0
+    while True:
+        changes = engine.changes_since(version, limit=3)
+        seen.extend(progress_ids(changes))
+        assert changes["version"] >= version
+        version = changes["version"]
+        pages += 1
+        if not changes["has_more"]:
+            break
+
+    assert pages > 1
+    assert sorted(seen) == list(range(1, 8))
+    assert version == engine.current_version()
+    assert not db.conn.in_transaction
+
+
+def test_apply_changes_last_writer_wins(db, other):
+    answer(db, 1, response_ms=1500)
+    changes = SyncEngine(db).changes_since(0)
+    assert SyncEngine(other).apply_changes(changes) == 1
+    assert other.get_progress(1)["response_ms_total"] == 1500
+
+    fields = changes["fields"]
+    row = list(changes["progress"][0])
+    updated_at = fields.index("updated_at")
+    review_count = fields.index("review_count")
+
+    # 較舊的變更不覆寫
+    stale = row.copy()
+    stale[updated_at] -= 1000
+    stale[review_count] = 99
+    assert SyncEngine(other).apply_changes({"fields": fields, "progress": [stale]}) == 0
+    assert other.get_progress(1)["review_count"] == 1
+
+    # 較新的變更覆寫
+    newer = row.copy()
+    newer[updated_at] += 1000
+    newer[review_count] = 5
+    assert SyncEngine(other).apply_changes({"fields": fields, "progress": [newer]}) == 1
+    assert other.get_progress(1)["review_count"] == 5
+
+
+def test_old_records_keep_added_fields(db, other):
+    answer(db, 1, response_ms=1200)
+    db.conn.execute("UPDATE learning_progress SET lapse_count = 3, is_suspended = 1")
+    db.conn.commit()
+    SyncEngine(other).apply_changes(SyncEngine(db).changes_since(0))
+
+    # 舊版客戶端只傳送原本的欄位
+    changes = SyncEngine(db).changes_since(0)
+    old_fields = [f for f in changes["fields"] if f in PROGRESS_FIELDS[:9]]
+    row = dict(zip(changes["fields"], changes["progress"][0]))
+    row["updated_at"] += 1000
+    row["review_count"] = 7
+    SyncEngine(other).apply_changes(
+        {"fields": old_fields, "progress": [[row[f] for f in old_fields]]}
+    )
+
+    progress = other.get_progress(1)
+    assert progress["review_count"] == 7
+    assert progress["response_ms_total"] == 1200
+    assert progress["lapse_count"] == 3
+    assert progress["is_suspended"] == 1
+
+
+def session(db):
+    """(new_words, total_count, study_time_seconds)"""
+    return tuple(
+        db.conn.execute(
+            "SELECT new_words, total_count, study_time_seconds FROM study_sessions"
+        ).fetchone()
+    )
+
+
+def test_sessions_merge_study_time(db, other):
+    db.record_study_session(new_words=2, correct=2, total=2, study_seconds=40)
+    other.record_study_session(new_words=1, correct=1, total=1, study_seconds=90)
+
+    changes = SyncEngine(db).changes_since(0)
+    assert changes["session_fields"] == list(SESSION_FIELDS)
+    assert SyncEngine(other).apply_changes(changes) == 1
+    assert session(other) == (2, 2, 90)
+
+    # 只有學習時間較長時仍需合併
+    SyncEngine(db).apply_changes(SyncEngine(other).changes_since(0))
+    assert session(db) == (2, 2, 90)
+
+    # 舊版客戶端沒有 study_time_seconds：保留本機的值
+    old_fields = list(SESSION_FIELDS[:-1])
+    row = dict(zip(changes["session_fields"], changes["sessions"][0]))
+    row["total_count"] = 5
+    SyncEngine(other).apply_changes(
+        {"session_fields": old_fields, "sessions": [[row[f] for f in old_fields]]}
+    )
+    assert session(other) == (2, 5, 90)
+
+
+def test_server_adds_missing_session_columns(db, tmp_path):
+    path = tmp_path / "server.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE sync_sessions (
+            account_id INTEGER NOT NULL, date NUMERIC, new_words NUMERIC, reviewed_words NUMERIC,
+            correct_count NUMERIC, total_count NUMERIC, updated_at NUMERIC,
+            version INTEGER NOT NULL, PRIMARY KEY (account_id, date)
+        )
+    """)
+    conn.close()
+
+    store = LocalSyncStore(str(path))
+    try:
+        store.register("alice", "hash", "{}", "{}")
+        account = store.conn.execute("SELECT * FROM user_sync").fetchone()
+        db.record_study_session(reviewed_words=3, correct=2, total=3, study_seconds=75)
+        store.push(account, SyncEngine(db).changes_since(0))
+
+        account = store.conn.execute("SELECT * FROM user_sync").fetchone()
+        changes = store.changes_since(account, 0)
+        assert changes["session_fields"] == list(SESSION_FIELDS)
+        row = dict(zip(changes["session_fields"], changes["sessions"][0]))
+        assert row["study_time_seconds"] == 75 and row["total_count"] == 3
+    finally:
+        store.close()
@@ -0,0 +1,162 @@
+"""
+作答撤回視窗測試
+submit_binary_answer 延後寫入、undo_last 撤回與 flush_pending 寫入
+"""
+
+import shutil
+import sqlite3
+
+import pytest
+
+from database import open_database
+from quiz_engine import QuizEngine
+
+PROGRESS_COLUMNS = (
+    "vocabulary_id, ease_factor, interval_days, next_review, review_count, correct_count, "
+    "response_ms_total, response_count, last_response_ms, lapse_count, is_suspended"
+)
+SESSION_COLUMNS = "date, new_words, reviewed_words, correct_count, total_count, study_time_seconds"
+
+# (vocabulary_id, know, response_ms)；同一個單字在視窗內答兩次
+ANSWERS = [(1, True, 900), (2, False, 2500), (1, True, 700), (3, True, None), (4, False, 1800)]
+
+
+def written(db_path):
+    """資料庫中的學習進度與每日統計"""
+    db = open_database(db_path, catalogue_path=None)
+    try:
+        progress = [
+            tuple(row)
+            for row in db.conn.execute(
+                f"SELECT {PROGRESS_COLUMNS} FROM learning_progress ORDER BY vocabulary_id"
+            )
+        ]
+        sessions = [
+            tuple(row) for row in db.conn.execute(f"SELECT {SESSION_COLUMNS} FROM study_sessions")
+        ]
+    finally:
+        db.close()
+    return progress, sessions
+
+
+def submit_all(engine):
+    seen = set()
+    for vocabulary_id, know, response_ms in ANSWERS:
+        engine.submit_binary_answer(
+            vocabulary_id, know, is_new_word=vocabulary_id not in seen, response_ms=response_ms
+        )
+        seen.add(vocabulary_id)
+
+
+def written_ids(engine):
+    rows = engine.db.conn.execute("SELECT vocabulary_id FROM learning_progress ORDER BY 1")
+    return [row[0] for row in rows]
+
+
+def test_immediate_mode_writes_every_answer(db_path):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        engine.submit_binary_answer(1, True)
+        assert engine.pending_count == 0
+        assert written_ids(engine) == [1]
+    finally:
+        engine.close()
+
+
+def test_answers_are_written_after_the_window_fills(db_path):
+    engine = QuizEngine(db_path, catalogue_path=None, undo_window=2)
+    try:
+        for vocabulary_id in (1, 2, 3):
+            engine.submit_binary_answer(vocabulary_id, True, is_new_word=True)
+        assert engine.pending_count == 3
+        assert written_ids(engine) == []
+
+        # 累積到兩倍視窗時寫入較舊的作答，保留最近 undo_window 筆
+        engine.submit_binary_answer(4, True, is_new_word=True)
+        assert engine.pending_count == 2
+        assert written_ids(engine) == [1, 2]
+    finally:
+        engine.close()
+
+
+def test_undo_last_discards_unwritten_answers(db_path):
+    engine = QuizEngine(db_path, catalogue_path=None, undo_window=3)
+    try:
+        engine.submit_binary_answer(1, True, is_new_word=True)
+        engine.submit_binary_answer(2, False, is_new_word=True)
+        assert engine.undo_last() == 2
+        assert engine.undo_last() == 1
+        assert engine.undo_last() is None
+
+        engine.submit_binary_answer(3, True, is_new_word=True)
+        engine.flush_pending()
+        assert engine.pending_count == 0
+        assert written_ids(engine) == [3]
+    finally:
+        engine.close()
+
+
+def test_deferred_answers_match_immediate_writes(db_path, tmp_path):
+    other_path = str(tmp_path / "immediate.db")
+    shutil.copy(db_path, other_path)
+
+    deferred = QuizEngine(db_path, catalogue_path=None, undo_window=3)
+    try:
+        submit_all(deferred)
+    finally:
+        deferred.close()  # 關閉前寫入剩餘作答
+
+    immediate = QuizEngine(other_path, catalogue_path=None)
+    try:
+        submit_all(immediate)
+    finally:
+        immediate.close()
+
+    progress, sessions = written(db_path)
+    assert [row[0] for row in progress] == [1, 2, 3, 4]
+    # 同一個單字的第二次作答以尚未寫入的第一次作答為準
+    assert progress[0][4] == 2
+    assert (progress, sessions) == written(other_path)
+
+
+def fail_once(monkeypatch, db):
+    """讓下一次 record_study_session 失敗（模擬交易中途的錯誤）"""
+    original = db.record_study_session
+
+    def record_study_session(*args, **kwargs):
+        monkeypatch.setattr(db, "record_study_session", original)
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db, "record_study_session", record_study_session)
+
+
+def test_failed_write_keeps_answers_pending(db_path, monkeypatch):
+    engine = QuizEngine(db_path, catalogue_path=None, undo_window=1)
+    try:
+        engine.submit_binary_answer(1, True, is_new_word=True)
+        fail_once(monkeypatch, engine.db)
+        with pytest.raises(sqlite3.OperationalError):
+            engine.submit_binary_answer(2, True, is_new_word=True)
+        # 整批 rollback，作答仍在記憶體中等待下次寫入
+        assert engine.pending_count == 2
+        assert written_ids(engine) == []
+
+        engine.flush_pending()
+        assert engine.pending_count == 0
+        assert written_ids(engine) == [1, 2]
+    finally:
+        engine.close()
+
+
+def test_failed_immediate_write_is_not_retried(db_path, monkeypatch):
+    engine = QuizEngine(db_path, catalogue_path=None)
+    try:
+        fail_once(monkeypatch, engine.db)
+        with pytest.raises(sqlite3.OperationalError):
+            engine.submit_binary_answer(1, True, is_new_word=True)
+        # 例外已交給呼叫端，不會跟著下一題一起寫入
+        assert engine.pending_count == 0
+        engine.submit_binary_answer(2, True, is_new_word=True)
+        assert written_ids(engine) == [2]
+    finally:
+        engine.close()
@@ -0,0 +1,56 @@
+"""
+單字前綴索引測試
+前綴列舉、自動完成排序、一字之差模糊查詢，以及索引檔的存取與過期重建
+"""
+
+from word_index import WordIndex, load_word_index
+
+
+def test_prefix_queries(db):
+    index = WordIndex.from_database(db)
+    assert len(index) == 8
+    assert index.prefix("A") == [1, 5, 6]
+    assert index.prefix("a", limit=2) == [1, 5]
+    assert index.has_prefix("cou") and not index.has_prefix("x")
+    assert index.contains(" Dog ") and not index.contains("do")
+    assert index.entry(6) == ("arm (2)", "武裝")
+
+
+def test_complete_orders():
+    index = WordIndex(
+        [("bag", 1, 2, 30), ("bad", 2, 1, 40), ("ban", 3, 1, 10), ("cab", 4, 1, 1)],
+        {},
+    )
+    assert index.complete("ba") == [3, 1, 2]
+    assert index.complete("ba", order="level") == [3, 2, 1]
+    assert index.complete("ba", order="alpha") == [2, 1, 3]
+    assert index.complete("ba", level=1, limit=1) == [3]
+    assert index.complete("z") == []
+
+
+def test_fuzzy_matches_one_edit(db):
+    index = WordIndex.from_database(db)
+    assert index.fuzzy("cot") == [3]
+    assert index.fuzzy("bok") == [2]
+    assert index.fuzzy("apples") == [1]
+    # 完全相同的排在前面，同形異義字都列出
+    assert index.fuzzy("arm") == [5, 6]
+    assert index.fuzzy("dgo") == []  # 換位需要兩次編輯
+    assert index.fuzzy(" ") == []
+
+
+def test_index_file_is_rebuilt_when_stale(db, tmp_path):
+    path = str(tmp_path / "word_index.json")
+    index = load_word_index(db, path)
+    loaded = WordIndex.load(path)
+    assert loaded.keys == index.keys
+    assert loaded.ids == index.ids and loaded.words == index.words
+    assert load_word_index(db, path).signature == index.signature
+
+    db.insert_vocabulary("cattle", "ˈkætl", "n", "牛", 3)
+    rebuilt = load_word_index(db, path)
+    assert rebuilt.prefix("cat") == [3, 9]
+    assert WordIndex.load(path).signature == rebuilt.signature
+
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    assert WordIndex.load(str(tmp_path / "broken.json")) is None
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+VocaBoost 命令列工具進入點
+不載入 TUI，例如：
+  python vocaboost.py due
+  python vocaboost.py stats --json
+  python vocaboost.py study --batch < answers.txt
+"""
+
+import sys
+from pathlib import Path
+
+# 將 src 目錄加入 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from cli import main
+
+
+if __name__ == "__main__":
+    main()